@@ -22,6 +22,28 @@ MESSAGE_BOX_BORDER_COLOR = (150, 150, 150)
 ASSETS_DIR = "assets/"
 DATABASE_NAME = "chess_database.db"
 
+# Database
+# SQLite settings applied to every connection (see DBManager._apply_pragmas()). "fast": write-ahead log,
+# so readers (e.g. the stats screen) do not block a tournament writing results, and fsync only at
+# checkpoints; a power loss may drop the last commits but never corrupts the database. "safe": SQLite's defaults.
+DATABASE_PRAGMA_PROFILES = {
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -65536, # Negative: KiB, so 64 MiB of page cache
+        "mmap_size": 268435456, # 256 MiB of the file memory-mapped
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000, # Milliseconds to wait for another connection's lock
+    },
+    "safe": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+    },
+}
+DATABASE_PRAGMA_PROFILE = "fast"
+DATABASE_CACHED_STATEMENTS = 256 # Size of sqlite3's per-connection cache of compiled SQL texts (default 128)
+
 # Piece Scaling
 PIECE_SCALE_FACTOR = 0.85 # Slightly smaller pieces for more board visibility
 
@@ -39,3 +61,9 @@ PADDING_LARGE = 24
 BUTTON_HEIGHT_STD = 50
 INPUT_HEIGHT_STD = 40
 BORDER_RADIUS_STD = 8
+
+# Tournaments
+TOURNAMENT_CONCURRENCY = 1 # Games of a round played in parallel worker processes (e.g. os.cpu_count())
+TOURNAMENT_RATING_SYSTEM = "elo" # "elo" (update after every game) or "glicko2" (batched update per round)
+TOURNAMENT_RESULT_BATCH_SIZE = 10 # Games saved per database transaction; a crash replays at most this many games
+TOURNAMENT_TIME_CONTROL = "60+0.5" # Per engine and game: "[moves/]seconds[+increment]" or "movetime=seconds"; None for no clock
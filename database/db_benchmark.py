@@ -0,0 +1,132 @@
+# database/db_benchmark.py
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from database.db_manager import DBManager
+
+# Fills a scratch database with engine games, then runs the DBManager queries the UI and the
+# tournaments use most. For each one it prints the time taken and checks with EXPLAIN QUERY PLAN
+# that every statement it runs reads its tables through an index: a plan step "SCAN <table>" without
+# "USING ... INDEX" reads the whole table, which at 10^6 games costs seconds instead of milliseconds.
+#
+#   python -m database.db_benchmark [number of games, default 100000]
+
+DEFAULT_NUM_GAMES = 100_000
+NUM_ENGINES = 50
+NUM_PLAYERS = 200
+GAMES_PER_TOURNAMENT = 1000
+BATCH_SIZE = 10_000
+RESULTS = ('white', 'black', 'draw')
+
+def populate(db: DBManager, num_games: int, seed: int = 1):
+    """Saves num_games random games (engine games in tournaments, plus some human games) in batches."""
+    rng = random.Random(seed)
+    engine_ids = [db.add_engine(f"Engine {i}", "1.0") for i in range(NUM_ENGINES)]
+    start = datetime(2024, 1, 1)
+    tournament_id = None
+    batch = db.result_batch()
+    for game_number in range(num_games):
+        if game_number % GAMES_PER_TOURNAMENT == 0:
+            batch.flush() # Tournament rows are written outside of batches
+            tournament_id = db.save_tournament({'name': f"Benchmark {game_number // GAMES_PER_TOURNAMENT}",
+                                                'start_date': (start + timedelta(minutes=game_number)).isoformat(),
+                                                'rounds': 10, 'status': 'completed', 'config': {}})
+        played = start + timedelta(minutes=game_number)
+        game_data = {'start_time': played.isoformat(), 'end_time': played.isoformat(),
+                     'winner': rng.choice(RESULTS), 'reason': 'benchmark', 'pgn': '1. e4 e5 *'}
+        if game_number % 10 == 0: # Human games
+            game_data.update({'white_player_type': 'human', 'black_player_type': 'engine',
+                              'white_player_name': f"Player {rng.randrange(NUM_PLAYERS)}"})
+            white = None
+        else:
+            white = rng.randrange(NUM_ENGINES)
+            game_data.update({'white_player_type': 'engine', 'black_player_type': 'engine',
+                              'white_player_name': f"Engine {white}", 'engine_white_id': engine_ids[white],
+                              'tournament_id': tournament_id})
+        black = (rng.randrange(1, NUM_ENGINES) + (white or 0)) % NUM_ENGINES
+        game_data.update({'black_player_name': f"Engine {black}", 'engine_black_id': engine_ids[black]})
+        tournament_game = None
+        if white is not None:
+            tournament_game = {'round_number': game_number % GAMES_PER_TOURNAMENT // 25 + 1,
+                               'result': {'white': 'white_win', 'black': 'black_win', 'draw': 'draw'}[game_data['winner']]}
+        batch.add_game(game_data, tournament_game=tournament_game)
+        if len(batch) >= BATCH_SIZE:
+            batch.flush()
+    batch.flush()
+    return engine_ids
+
+
+def full_scans(db: DBManager, method, *args, **kwargs):
+    """
+    Calls a DBManager method, recording the statements it runs, and returns
+    (elapsed seconds, [(statement, plan steps scanning a whole table)]) for its SELECTs.
+    """
+    statements = []
+    db.conn.set_trace_callback(statements.append) # SQL with the parameters filled in
+    started = time.perf_counter()
+    method(*args, **kwargs)
+    elapsed = time.perf_counter() - started
+    db.conn.set_trace_callback(None)
+
+    scans = []
+    for statement in statements:
+        if not statement.lstrip().upper().startswith("SELECT"):
+            continue
+        db.cursor.execute("EXPLAIN QUERY PLAN " + statement)
+        details = [row[3] for row in db.cursor.fetchall()]
+        # Scans of subquery results and of the row of a constant SELECT read no table
+        table_scans = [detail for detail in details if detail.startswith("SCAN ") and " INDEX " not in detail
+                       and not detail.startswith(("SCAN (", "SCAN CONSTANT ROW"))]
+        if table_scans:
+            scans.append((" ".join(statement.split()), table_scans))
+    return elapsed, scans
+
+
+def hot_queries(db: DBManager, engine_ids):
+    """The queries to check, as (label, method, args[, kwargs])."""
+    tournament_id = db.get_all_tournaments()[0]['tournament_id']
+    return [
+        ("game history", db.get_games_history, (100,)),
+        ("game history of a player", db.get_games_history, (), {'player_name': "Player 7"}),
+        ("game history of an engine", db.get_games_history, (), {'engine_name': "Engine 3"}),
+        ("game history of a tournament", db.get_games_history, (), {'tournament_id': tournament_id}),
+        ("engine ID by name", db.get_engine_id, ("Engine 42",)),
+        ("engine by name", db.get_engine_by_name, ("Engine 42",)),
+        ("tournament list", db.get_all_tournaments, ()),
+        ("tournament games", db.get_tournament_games, (tournament_id,)),
+        ("tournament engine stats", db.get_tournament_engine_stats, (tournament_id,)),
+        ("pairwise results of a tournament", db.get_pairwise_results, (tournament_id,)),
+        ("leaderboard", db.get_leaderboard, (20,)),
+        ("rating history", db.get_rating_history, (engine_ids[0],)),
+    ]
+
+
+def run_benchmark(num_games: int = DEFAULT_NUM_GAMES):
+    """Returns True if every hot query uses indexes only."""
+    with tempfile.TemporaryDirectory() as directory:
+        db = DBManager(os.path.join(directory, "benchmark.db"))
+        started = time.perf_counter()
+        engine_ids = populate(db, num_games)
+        print(f"\nStored {num_games} games in {time.perf_counter() - started:.1f}s")
+        db.cursor.execute("ANALYZE") # Statistics for the query planner, as PRAGMA optimize keeps them on close
+
+        all_indexed = True
+        for label, method, args, *kwargs in hot_queries(db, engine_ids):
+            elapsed, scans = full_scans(db, method, *args, **(kwargs[0] if kwargs else {}))
+            print(f"{label:<35} {elapsed * 1000:9.2f} ms  {'FULL SCAN' if scans else 'indexed'}")
+            for statement, table_scans in scans:
+                print(f"    {table_scans} in: {statement[:150]}")
+            all_indexed = all_indexed and not scans
+        db.close()
+    return all_indexed
+
+
+if __name__ == '__main__':
+    # Example Usage / Simple Test:
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_NUM_GAMES
+    all_indexed = run_benchmark(num_games)
+    print("Every hot query uses an index." if all_indexed else "Some hot queries scan whole tables.")
+    sys.exit(0 if all_indexed else 1)
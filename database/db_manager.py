@@ -2,30 +2,71 @@
 import sqlite3
 import json
 from datetime import datetime
-from config import DATABASE_NAME
+from config import DATABASE_NAME, DATABASE_PRAGMA_PROFILES, DATABASE_PRAGMA_PROFILE, DATABASE_CACHED_STATEMENTS
+from game.move_codec import decode_moves
+
+# Values SQLite reports for the named settings of these pragmas
+PRAGMA_VALUE_NAMES = {
+    "synchronous": {"OFF": 0, "NORMAL": 1, "FULL": 2, "EXTRA": 3},
+    "temp_store": {"DEFAULT": 0, "FILE": 1, "MEMORY": 2},
+}
 
 class DBManager:
     """
     Manages the SQLite database for storing game history, player data,
     engine details, and tournament results.
     """
-    def __init__(self):
+    def __init__(self, database_name: str = DATABASE_NAME, pragma_profile: str = DATABASE_PRAGMA_PROFILE):
+        self.database_name = database_name
         self.conn = None
         self.cursor = None
+        self.pragmas = DATABASE_PRAGMA_PROFILES[pragma_profile]
         self._connect()
+        self._apply_pragmas()
+        self.check_pragmas()
         self._create_tables()
 
     def _connect(self):
         """Establishes a connection to the SQLite database."""
         try:
-            self.conn = sqlite3.connect(DATABASE_NAME)
+            # A larger sqlite3 statement cache: it keeps the compiled form of the most recently used
+            # SQL texts, so the constant SQL of hot statements (saving games, leaderboard upserts,
+            # lookups) is not recompiled on every call. There is no separate prepared-statement
+            # layer; all methods still run their statements through the shared self.cursor
+            self.conn = sqlite3.connect(self.database_name, cached_statements=DATABASE_CACHED_STATEMENTS)
             self.cursor = self.conn.cursor()
-            print(f"Connected to database: {DATABASE_NAME}")
+            print(f"Connected to database: {self.database_name}")
         except sqlite3.Error as e:
             print(f"Database connection error: {e}")
             # In a real app, you might want to exit or show an error to the user
             exit()
 
+    def _apply_pragmas(self):
+        """Applies the connection's pragma profile (config.DATABASE_PRAGMA_PROFILES)."""
+        for name, value in self.pragmas.items():
+            try:
+                self.cursor.execute(f"PRAGMA {name} = {value}")
+            except sqlite3.Error as e:
+                print(f"Error setting PRAGMA {name} = {value}: {e}")
+
+    def check_pragmas(self):
+        """
+        Reads back the pragmas of the profile and reports the settings in effect, with a warning
+        for each one SQLite did not take (e.g. no WAL for an in-memory database, or mmap_size
+        capped by the build). Returns {pragma: value in effect}.
+        """
+        in_effect = {}
+        for name, wanted in self.pragmas.items():
+            self.cursor.execute(f"PRAGMA {name}")
+            row = self.cursor.fetchone()
+            in_effect[name] = row[0] if row else None
+            if isinstance(wanted, str):
+                wanted = PRAGMA_VALUE_NAMES.get(name, {}).get(wanted.upper(), wanted)
+            if str(in_effect[name]).lower() != str(wanted).lower():
+                print(f"Warning: PRAGMA {name} is {in_effect[name]}, not {wanted} as configured.")
+        print("SQLite settings: " + ", ".join(f"{name}={value}" for name, value in in_effect.items()))
+        return in_effect
+
     def _create_tables(self):
         """
         Creates necessary tables if they don't already exist.
@@ -35,6 +76,10 @@ class DBManager:
         - engines: Stores details of AI engines.
         - tournaments: Stores details of each tournament.
         - tournament_games: Links games to tournaments and stores specific results for engine comparison.
+        - sprt_tests: Head-to-head SPRT matches, with their pentanomial counts and outcome.
+        - sprt_llr: LLR trajectory of each SPRT match, one row per game pair.
+        - rating_history: Every rating change of an engine, with the game (or rating period) that caused it.
+        - leaderboard: Running totals and current ratings per engine, updated with every saved game.
         # tournament_engine_stats: Stores per-engine performance stats for each tournament.
         """
         try:
@@ -53,6 +98,11 @@ class DBManager:
                     engine_white_id INTEGER, -- FK to engines table if engine
                     engine_black_id INTEGER, -- FK to engines table if engine
                     tournament_id INTEGER,   -- FK to tournaments table if part of a tournament
+                    moves_blob BLOB,         -- Moves packed 16 bits each (see game/move_codec.py)
+                    start_fen TEXT,          -- Position moves_blob starts from, NULL for the standard one
+                    opening_index INTEGER,   -- Index in the tournament's opening suite, if it used one
+                    time_control TEXT,       -- e.g. '40/60', '60+0.5' or 'movetime=0.5' (see game/chess_clock.py)
+                    move_times TEXT,         -- JSON list of milliseconds spent on each engine move
                     FOREIGN KEY (engine_white_id) REFERENCES engines(engine_id),
                     FOREIGN KEY (engine_black_id) REFERENCES engines(engine_id),
                     FOREIGN KEY (tournament_id) REFERENCES tournaments(tournament_id)
@@ -73,7 +123,10 @@ class DBManager:
                     version TEXT,
                     path TEXT,            -- Path to the engine executable (e.g., Stockfish)
                     parameters TEXT,      -- JSON string of engine parameters (e.g., {"Skill Level": 10})
-                    elo INTEGER DEFAULT 1200 -- Added Elo rating with a default value
+                    elo INTEGER DEFAULT 1200, -- Added Elo rating with a default value
+                    glicko_rating REAL DEFAULT 1500, -- Glicko-2 rating, deviation and volatility (see tournament/glicko2.py)
+                    glicko_rd REAL DEFAULT 350,
+                    glicko_volatility REAL DEFAULT 0.06
                 )
             ''')
             
@@ -122,11 +175,150 @@ class DBManager:
                 )
             ''')
 
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sprt_tests (
+                    test_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    engine_a_id INTEGER,  -- Candidate engine
+                    engine_b_id INTEGER,  -- Baseline engine
+                    elo0 REAL NOT NULL,
+                    elo1 REAL NOT NULL,
+                    alpha REAL NOT NULL,
+                    beta REAL NOT NULL,
+                    start_date TEXT NOT NULL,
+                    end_date TEXT,
+                    status TEXT,          -- 'running', 'H0', 'H1', 'inconclusive'
+                    llr REAL,
+                    pentanomial TEXT,     -- JSON list of game-pair counts, engine A scoring 0, 0.5, 1, 1.5, 2
+                    FOREIGN KEY (engine_a_id) REFERENCES engines(engine_id),
+                    FOREIGN KEY (engine_b_id) REFERENCES engines(engine_id)
+                )
+            ''')
+
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sprt_llr (
+                    test_id INTEGER NOT NULL,
+                    pair_number INTEGER NOT NULL, -- LLR after this many game pairs
+                    llr REAL NOT NULL,
+                    PRIMARY KEY (test_id, pair_number),
+                    FOREIGN KEY (test_id) REFERENCES sprt_tests(test_id)
+                )
+            ''')
+
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS tournament_checkpoints (
+                    tournament_id INTEGER PRIMARY KEY,
+                    current_round INTEGER NOT NULL,
+                    state TEXT NOT NULL,  -- JSON: scores, opponent and color history, current pairings, RNG state
+                    updated_at TEXT NOT NULL,
+                    FOREIGN KEY (tournament_id) REFERENCES tournaments(tournament_id)
+                )
+            ''')
+
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS rating_history (
+                    history_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    engine_id INTEGER NOT NULL,
+                    game_id INTEGER,        -- Game that caused the change; NULL for Glicko-2 periods and manual changes
+                    tournament_id INTEGER,
+                    rating_system TEXT NOT NULL, -- 'elo' or 'glicko2'
+                    rating_before REAL,
+                    rating_after REAL NOT NULL,
+                    recorded_at TEXT NOT NULL,
+                    FOREIGN KEY (engine_id) REFERENCES engines(engine_id),
+                    FOREIGN KEY (game_id) REFERENCES games(game_id)
+                )
+            ''')
+
+            self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'leaderboard'")
+            leaderboard_is_new = self.cursor.fetchone() is None
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS leaderboard (
+                    engine_id INTEGER PRIMARY KEY,
+                    games INTEGER NOT NULL DEFAULT 0,
+                    wins INTEGER NOT NULL DEFAULT 0,
+                    draws INTEGER NOT NULL DEFAULT 0,
+                    losses INTEGER NOT NULL DEFAULT 0,
+                    points REAL NOT NULL DEFAULT 0,
+                    elo INTEGER,
+                    glicko_rating REAL,
+                    updated_at TEXT,
+                    FOREIGN KEY (engine_id) REFERENCES engines(engine_id)
+                )
+            ''')
+
+            # Columns added after the first release; CREATE TABLE IF NOT EXISTS leaves old tables as they were
+            self._ensure_column('games', 'moves_blob', 'BLOB')
+            self._ensure_column('games', 'start_fen', 'TEXT') # NULL: the standard initial position
+            self._ensure_column('games', 'opening_index', 'INTEGER') # Index in the tournament's opening suite
+            self._ensure_column('games', 'time_control', 'TEXT')
+            self._ensure_column('games', 'move_times', 'TEXT') # JSON list of milliseconds per engine move
+            self._ensure_column('engines', 'glicko_rating', 'REAL DEFAULT 1500')
+            self._ensure_column('engines', 'glicko_rd', 'REAL DEFAULT 350')
+            self._ensure_column('engines', 'glicko_volatility', 'REAL DEFAULT 0.06')
+            # Secondary indexes of the hot queries (see database/db_benchmark.py for their query plans)
+            for index, definition in self.INDEXES.items():
+                self._ensure_index(index, definition)
+            if leaderboard_is_new:
+                self._rebuild_leaderboard()
+
             self.conn.commit()
             print("Database tables checked/created successfully.")
         except sqlite3.Error as e:
             print(f"Error creating tables: {e}")
 
+    INDEXES = {
+        # get_games_history(): newest first, optionally for one player/engine or one tournament
+        'idx_games_start_time': 'games (start_time)',
+        'idx_games_white_player': 'games (white_player_name, start_time)',
+        'idx_games_black_player': 'games (black_player_name, start_time)',
+        'idx_games_tournament': 'games (tournament_id, start_time)',
+        # get_pairwise_results(): covers the whole GROUP BY, so the games table itself is not read
+        'idx_games_engines': 'games (engine_white_id, engine_black_id, winner)',
+        # get_tournament_games(): one tournament's rows in round order
+        'idx_tournament_games_tournament': 'tournament_games (tournament_id, round_number)',
+        'idx_tournaments_start_date': 'tournaments (start_date)',
+        'idx_rating_history_engine': 'rating_history (engine_id, recorded_at)',
+        # get_leaderboard(): top-N by rating or points
+        'idx_leaderboard_elo': 'leaderboard (elo DESC)',
+        'idx_leaderboard_glicko': 'leaderboard (glicko_rating DESC)',
+        'idx_leaderboard_points': 'leaderboard (points DESC)',
+    }
+
+    def _ensure_column(self, table, column, definition):
+        """Adds a column to an existing table if it is missing (simple forward-only migration)."""
+        self.cursor.execute(f"PRAGMA table_info({table})")
+        if column not in {row[1] for row in self.cursor.fetchall()}:
+            self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            print(f"Added column {table}.{column}")
+
+    def _rebuild_leaderboard(self):
+        """Fills the leaderboard from all engine games stored so far (for databases from before it existed)."""
+        self.cursor.execute("DELETE FROM leaderboard")
+        self.cursor.execute("""
+            INSERT INTO leaderboard (engine_id, games, wins, draws, losses, points, elo, glicko_rating, updated_at)
+            SELECT e.engine_id, COUNT(r.engine_id), COALESCE(SUM(r.win), 0), COALESCE(SUM(r.draw), 0),
+                   COALESCE(SUM(r.loss), 0), COALESCE(SUM(r.win + 0.5 * r.draw), 0), e.elo, e.glicko_rating, ?
+            FROM engines e
+            LEFT JOIN (
+                SELECT engine_white_id AS engine_id, winner = 'white' AS win, winner = 'draw' AS draw,
+                       winner = 'black' AS loss
+                FROM games WHERE engine_white_id IS NOT NULL AND winner IS NOT NULL
+                UNION ALL
+                SELECT engine_black_id, winner = 'black', winner = 'draw', winner = 'white'
+                FROM games WHERE engine_black_id IS NOT NULL AND winner IS NOT NULL
+            ) r ON r.engine_id = e.engine_id
+            GROUP BY e.engine_id
+        """, (datetime.now().isoformat(),))
+        print(f"Leaderboard rebuilt for {self.cursor.rowcount} engines.")
+
+    def _ensure_index(self, index, definition):
+        """Creates an index if it is missing (existing databases get it on their next start)."""
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (index,))
+        if self.cursor.fetchone() is None:
+            self.cursor.execute(f"CREATE INDEX {index} ON {definition}")
+            print(f"Added index {index}")
+
     def add_player(self, name):
         """Adds a new human player if they don't already exist."""
         try:
@@ -163,6 +355,10 @@ class DBManager:
                     INSERT INTO engines (name, version, path, parameters, elo) VALUES (?, ?, ?, ?, ?)
                 """, (name, version, path, params_json, 1200)) # Default ELO 1200
                 engine_id = self.cursor.lastrowid
+                self.cursor.execute("""
+                    INSERT OR IGNORE INTO leaderboard (engine_id, elo, glicko_rating, updated_at)
+                    SELECT engine_id, elo, glicko_rating, ? FROM engines WHERE engine_id = ?
+                """, (datetime.now().isoformat(), engine_id))
 
             self.conn.commit()
             return engine_id
@@ -176,19 +372,28 @@ class DBManager:
         result = self.cursor.fetchone()
         return result[0] if result else None
 
+    ENGINE_COLUMNS = "engine_id, name, version, path, parameters, elo, glicko_rating, glicko_rd, glicko_volatility"
+
+    @staticmethod
+    def _engine_row_to_dict(row):
+        return {
+            'engine_id': row[0],
+            'name': row[1],
+            'version': row[2],
+            'path': row[3],
+            'parameters': json.loads(row[4]) if row[4] else {},
+            'elo': row[5],
+            'glicko_rating': row[6],
+            'glicko_rd': row[7],
+            'glicko_volatility': row[8]
+        }
+
     def get_engine_by_name(self, name: str):
-        """Retrieves full engine details by name, including elo."""
-        self.cursor.execute("SELECT engine_id, name, version, path, parameters, elo FROM engines WHERE name = ?", (name,))
+        """Retrieves full engine details by name, including Elo and Glicko-2 ratings."""
+        self.cursor.execute(f"SELECT {self.ENGINE_COLUMNS} FROM engines WHERE name = ?", (name,))
         row = self.cursor.fetchone()
         if row:
-            return {
-                'engine_id': row[0],
-                'name': row[1],
-                'version': row[2],
-                'path': row[3],
-                'parameters': json.loads(row[4]) if row[4] else {},
-                'elo': row[5]
-            }
+            return self._engine_row_to_dict(row)
         return None
 
     def get_engine_elo(self, engine_id):
@@ -198,30 +403,68 @@ class DBManager:
         return result[0] if result else None # Default to 1200 if not found or error?
 
     def update_engine_elo(self, engine_id, new_elo):
-        """Updates the Elo rating of a specific engine."""
+        """Updates the Elo rating of a specific engine (outside of a game), keeping its history and leaderboard row."""
         try:
-            self.cursor.execute("UPDATE engines SET elo = ? WHERE engine_id = ?", (new_elo, engine_id))
-            self.conn.commit()
+            self._write_rating_changes([(engine_id, None, None, 'elo', self.get_engine_elo(engine_id), new_elo)])
             if self.cursor.rowcount == 0:
                 print(f"Warning: No engine found with ID {engine_id} to update Elo.")
-            # else:
-                # print(f"Engine ID {engine_id} Elo updated to {new_elo}")
+            self.conn.commit()
         except sqlite3.Error as e:
+            self.conn.rollback()
             print(f"Error updating Elo for engine ID {engine_id}: {e}")
 
+    def _write_rating_changes(self, rows):
+        """
+        Writes rating changes, rows of (engine_id, game_id, tournament_id, rating_system, rating_before,
+        rating_after) in the order they happened, to rating_history, the leaderboard and the engines table.
+        Does not commit.
+        """
+        now = datetime.now().isoformat()
+        self.cursor.executemany("""
+            INSERT INTO rating_history (engine_id, game_id, tournament_id, rating_system, rating_before,
+                                        rating_after, recorded_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [row + (now,) for row in rows])
+        for rating_system, column in (('elo', 'elo'), ('glicko2', 'glicko_rating')):
+            changes = [(row[5], row[0]) for row in rows if row[3] == rating_system]
+            if changes:
+                self.cursor.executemany(f"UPDATE leaderboard SET {column} = ?, updated_at = ? WHERE engine_id = ?",
+                                        [(rating, now, engine_id) for rating, engine_id in changes])
+                self.cursor.executemany(f"UPDATE engines SET {column} = ? WHERE engine_id = ?", changes)
+
     def get_all_engines(self):
-        """Retrieves all stored engine details, including Elo."""
-        self.cursor.execute("SELECT engine_id, name, version, path, parameters, elo FROM engines")
-        return [{
-            'engine_id': row[0],
-            'name': row[1],
-            'version': row[2],
-            'path': row[3],
-            'parameters': json.loads(row[4]) if row[4] else {},
-            'elo': row[5]
-        } for row in self.cursor.fetchall()]
+        """Retrieves all stored engine details, including Elo and Glicko-2 ratings."""
+        self.cursor.execute(f"SELECT {self.ENGINE_COLUMNS} FROM engines")
+        return [self._engine_row_to_dict(row) for row in self.cursor.fetchall()]
 
-    def save_game(self, game_data):
+    def update_glicko_ratings(self, updates, tournament_id=None, checkpoint=None):
+        """
+        Stores the Glicko-2 ratings of a rating period in one transaction, with their rating history
+        and optionally the tournament checkpoint (tournament_id, current_round, state) recording that
+        the period is rated, so a resumed tournament never rates it twice.
+        updates is a list of (engine_id, rating, rd, volatility). Returns True if everything was written.
+        """
+        try:
+            before = {}
+            for engine_id, _, _, _ in updates:
+                self.cursor.execute("SELECT glicko_rating FROM engines WHERE engine_id = ?", (engine_id,))
+                row = self.cursor.fetchone()
+                before[engine_id] = row[0] if row else None
+            self._write_rating_changes([(engine_id, None, tournament_id, 'glicko2', before[engine_id], rating)
+                                        for engine_id, rating, _, _ in updates])
+            self.cursor.executemany(
+                "UPDATE engines SET glicko_rd = ?, glicko_volatility = ? WHERE engine_id = ?",
+                [(rd, volatility, engine_id) for engine_id, _, rd, volatility in updates])
+            if checkpoint is not None:
+                self._write_tournament_checkpoint(*checkpoint)
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            print(f"Error updating Glicko-2 ratings: {e}")
+            return False
+
+    def save_game(self, game_data, rating_changes=None, tournament_game=None):
         """
         Saves a completed game to the database.
         game_data should be a dictionary with keys:
@@ -229,60 +472,208 @@ class DBManager:
         'white_player_type', 'black_player_type',
         'white_player_name', 'black_player_name',
         'engine_white_id' (optional), 'engine_black_id' (optional),
-        'tournament_id' (optional)
+        'tournament_id' (optional), 'moves_blob' (optional, from ChessGameManager.get_encoded_moves()),
+        'start_fen' (optional, the position moves_blob starts from, ChessGameManager.start_fen),
+        'opening_index' (optional, index of the game's opening in its tournament's opening suite),
+        'time_control' (optional), 'move_times' (optional, list of milliseconds per engine move)
+
+        In the same transaction as the game, the engines' leaderboard rows are updated and, if given:
+        rating_changes: list of (engine_id, rating_system, rating_before, rating_after) caused by the game.
+        tournament_game: {'round_number', 'result'} for the game's tournament_games row.
+        To save many games in one transaction, use result_batch().
+        """
+        game_ids = self._write_games([(game_data, rating_changes, tournament_game)])
+        if game_ids is None:
+            return None
+        print(f"Game saved with ID: {game_ids[0]}")
+        return game_ids[0]
+
+    def result_batch(self):
+        """Returns a ResultBatch buffering game results until it is flushed in one transaction."""
+        return ResultBatch(self)
+
+    def _write_games(self, entries, checkpoint=None):
+        """
+        Writes games, entries of (game_data, rating_changes, tournament_game) as for save_game(),
+        and optionally a tournament checkpoint (tournament_id, current_round, state) in one
+        transaction, every table but games with a single executemany. Returns the new game IDs in order,
+        or None (and nothing is written) on error.
         """
         try:
-            # Ensure players/engines exist to get their IDs for FKs
-            white_player_id = None
-            if game_data['white_player_type'] == 'human':
-                white_player_id = self.add_player(game_data['white_player_name'])
-            elif game_data['white_player_type'] == 'engine' and 'engine_white_id' not in game_data:
-                 game_data['engine_white_id'] = self.get_engine_id(game_data['white_player_name'])
-
-            black_player_id = None
-            if game_data['black_player_type'] == 'human':
-                black_player_id = self.add_player(game_data['black_player_name'])
-            elif game_data['black_player_type'] == 'engine' and 'engine_black_id' not in game_data:
-                game_data['engine_black_id'] = self.get_engine_id(game_data['black_player_name'])
+            # Ensure players/engines exist to get their IDs for FKs; engine IDs are looked up once per name
+            players = set()
+            engine_ids = {}
+            for game_data, _, _ in entries:
+                for color in ('white', 'black'):
+                    player_type, name = game_data[f'{color}_player_type'], game_data[f'{color}_player_name']
+                    if player_type == 'human':
+                        players.add(name)
+                    elif player_type == 'engine' and f'engine_{color}_id' not in game_data:
+                        if name not in engine_ids:
+                            engine_ids[name] = self.get_engine_id(name)
+                        game_data[f'engine_{color}_id'] = engine_ids[name]
 
-            self.cursor.execute("""
-                INSERT INTO games (
-                    start_time, end_time, winner, reason, pgn,
-                    white_player_type, black_player_type,
-                    white_player_name, black_player_name,
-                    engine_white_id, engine_black_id, tournament_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                game_data['start_time'], game_data['end_time'], game_data['winner'],
-                game_data['reason'], game_data['pgn'],
-                game_data['white_player_type'], game_data['black_player_type'],
-                game_data['white_player_name'], game_data['black_player_name'],
-                game_data.get('engine_white_id'), game_data.get('engine_black_id'),
-                game_data.get('tournament_id')
-            ))
+            if not self.conn.in_transaction:
+                self.cursor.execute("BEGIN IMMEDIATE") # Takes the write lock before the first insert
+            self.cursor.executemany("INSERT OR IGNORE INTO players (name) VALUES (?)", [(name,) for name in players])
+
+            # One insert per game: SQLite assigns each game ID, which rating history and
+            # tournament_games rows then refer to
+            game_ids = []
+            for game_data, _, _ in entries:
+                self.cursor.execute("""
+                    INSERT INTO games (
+                        start_time, end_time, winner, reason, pgn,
+                        white_player_type, black_player_type,
+                        white_player_name, black_player_name,
+                        engine_white_id, engine_black_id, tournament_id, moves_blob, start_fen, opening_index,
+                        time_control, move_times
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    game_data['start_time'], game_data['end_time'], game_data['winner'],
+                    game_data['reason'], game_data['pgn'],
+                    game_data['white_player_type'], game_data['black_player_type'],
+                    game_data['white_player_name'], game_data['black_player_name'],
+                    game_data.get('engine_white_id'), game_data.get('engine_black_id'),
+                    game_data.get('tournament_id'), game_data.get('moves_blob'), game_data.get('start_fen'),
+                    game_data.get('opening_index'),
+                    game_data.get('time_control'),
+                    json.dumps(game_data['move_times']) if game_data.get('move_times') is not None else None
+                ))
+                game_ids.append(self.cursor.lastrowid)
+
+            self._add_to_leaderboard([game_data for game_data, _, _ in entries])
+            self._write_rating_changes([
+                (engine_id, game_id, game_data.get('tournament_id'), rating_system, before, after)
+                for game_id, (game_data, rating_changes, _) in zip(game_ids, entries)
+                for engine_id, rating_system, before, after in rating_changes or ()])
+            self.cursor.executemany("""
+                INSERT INTO tournament_games (tournament_id, game_id, round_number, white_engine_id, black_engine_id, result)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [(game_data['tournament_id'], game_id, tournament_game['round_number'],
+                   game_data.get('engine_white_id'), game_data.get('engine_black_id'), tournament_game['result'])
+                  for game_id, (game_data, _, tournament_game) in zip(game_ids, entries) if tournament_game is not None])
+            if checkpoint is not None:
+                self._write_tournament_checkpoint(*checkpoint)
             self.conn.commit()
-            print(f"Game saved with ID: {self.cursor.lastrowid}")
-            return self.cursor.lastrowid
+            return game_ids
         except sqlite3.Error as e:
+            self.conn.rollback()
             print(f"Error saving game: {e}")
             return None
 
+    def _add_to_leaderboard(self, games):
+        """Adds the results of games (game_data dicts) to the leaderboard rows of their engines. Does not commit."""
+        totals = {} # engine_id -> [games, wins, draws, losses]
+        for game_data in games:
+            winner = game_data['winner']
+            if winner not in ('white', 'black', 'draw'):
+                continue
+            for engine_id, color in ((game_data.get('engine_white_id'), 'white'), (game_data.get('engine_black_id'), 'black')):
+                if engine_id is None:
+                    continue
+                counts = totals.setdefault(engine_id, [0, 0, 0, 0])
+                counts[0] += 1
+                counts[1 if winner == color else 2 if winner == 'draw' else 3] += 1
+        self.cursor.executemany("""
+            INSERT INTO leaderboard (engine_id, games, wins, draws, losses, points, elo, glicko_rating, updated_at)
+            SELECT engine_id, ?, ?, ?, ?, ?, elo, glicko_rating, ? FROM engines WHERE engine_id = ?
+            ON CONFLICT(engine_id) DO UPDATE SET
+                games = games + excluded.games,
+                wins = wins + excluded.wins,
+                draws = draws + excluded.draws,
+                losses = losses + excluded.losses,
+                points = points + excluded.points,
+                updated_at = excluded.updated_at
+        """, [(games_played, wins, draws, losses, wins + 0.5 * draws, datetime.now().isoformat(), engine_id)
+              for engine_id, (games_played, wins, draws, losses) in totals.items()])
+
+    def get_leaderboard(self, limit=50, order_by='elo'):
+        """
+        Top engines from the precomputed leaderboard, ordered by 'elo', 'glicko_rating' or 'points'.
+        Rows have engine_id, name, games, wins, draws, losses, points, elo, glicko_rating, updated_at.
+        """
+        if order_by not in ('elo', 'glicko_rating', 'points'):
+            raise ValueError(f"Unknown leaderboard order: {order_by}")
+        self.cursor.execute(f"""
+            SELECT l.engine_id, e.name, l.games, l.wins, l.draws, l.losses, l.points, l.elo, l.glicko_rating, l.updated_at
+            FROM leaderboard l
+            JOIN engines e ON l.engine_id = e.engine_id
+            ORDER BY l.{order_by} DESC
+            LIMIT ?
+        """, (limit,))
+        columns = [description[0] for description in self.cursor.description]
+        return [dict(zip(columns, row)) for row in self.cursor.fetchall()]
+
+    def get_rating_history(self, engine_id, rating_system=None):
+        """Rating changes of an engine in the order they happened, optionally of one rating system only."""
+        query = """
+            SELECT game_id, tournament_id, rating_system, rating_before, rating_after, recorded_at
+            FROM rating_history WHERE engine_id = ?
+        """
+        params = [engine_id]
+        if rating_system is not None:
+            query += " AND rating_system = ?"
+            params.append(rating_system)
+        query += " ORDER BY recorded_at, history_id"
+        self.cursor.execute(query, tuple(params))
+        columns = [description[0] for description in self.cursor.description]
+        return [dict(zip(columns, row)) for row in self.cursor.fetchall()]
+
+    def get_pairwise_results(self, tournament_id=None):
+        """
+        Aggregates engine-vs-engine games into one row per (white engine, black engine):
+        (white_engine_id, black_engine_id, white_wins, draws, black_wins).
+        Games of one tournament only if tournament_id is given.
+        """
+        query = """
+            SELECT engine_white_id, engine_black_id,
+                   SUM(winner = 'white'), SUM(winner = 'draw'), SUM(winner = 'black')
+            FROM games
+            WHERE engine_white_id IS NOT NULL AND engine_black_id IS NOT NULL AND winner IS NOT NULL
+        """
+        params = ()
+        if tournament_id is not None:
+            query += " AND tournament_id = ?"
+            params = (tournament_id,)
+        query += " GROUP BY engine_white_id, engine_black_id"
+        self.cursor.execute(query, params)
+        return self.cursor.fetchall()
+
+    def get_game_moves(self, game_id):
+        """
+        Returns (start_fen, moves) of a stored game: the FEN of the position its moves start
+        from (None for the standard one) and the moves as a list of chess.Move, or None if it
+        has no moves_blob. ChessGameManager.load_encoded_moves() takes the same start_fen.
+        """
+        self.cursor.execute("SELECT moves_blob, start_fen FROM games WHERE game_id = ?", (game_id,))
+        result = self.cursor.fetchone()
+        return (result[1], decode_moves(result[0])) if result and result[0] is not None else None
+
     def get_games_history(self, limit=100, offset=0, player_name=None, engine_name=None, tournament_id=None):
-        """Retrieves game history based on filters."""
-        query = "SELECT * FROM games WHERE 1=1"
+        """Retrieves game history based on filters, newest games first."""
+        conditions = ["1=1"]
         params = []
-        if player_name:
-            query += " AND (white_player_name = ? OR black_player_name = ?)"
-            params.extend([player_name, player_name])
-        if engine_name:
-            query += " AND (white_player_name = ? OR black_player_name = ?)"
-            params.extend([engine_name, engine_name])
         if tournament_id:
-            query += " AND tournament_id = ?"
+            conditions.append("tournament_id = ?")
             params.append(tournament_id)
-        
-        query += " ORDER BY start_time DESC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
+        names = [name for name in (player_name, engine_name) if name]
+        for name in names[1:]:
+            conditions.append("(white_player_name = ? OR black_player_name = ?)")
+            params.extend([name, name])
+        condition = " AND ".join(conditions)
+
+        if names:
+            # The newest games with the name as white and as black, each read in order from its index
+            # (an OR of both would fetch and sort every game of the player), then merged
+            branch = (f"SELECT game_id FROM (SELECT game_id FROM games WHERE {{column}} = ? AND {condition} "
+                      f"ORDER BY start_time DESC LIMIT ?)")
+            query = (f"SELECT * FROM games WHERE game_id IN ({branch.format(column='white_player_name')} "
+                     f"UNION ALL {branch.format(column='black_player_name')}) ORDER BY start_time DESC LIMIT ? OFFSET ?")
+            params = [names[0], *params, limit + offset, names[0], *params, limit + offset, limit, offset]
+        else:
+            query = f"SELECT * FROM games WHERE {condition} ORDER BY start_time DESC LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
 
         self.cursor.execute(query, tuple(params))
         columns = [description[0] for description in self.cursor.description]
@@ -330,6 +721,7 @@ class DBManager:
     def save_tournament_game_result(self, tournament_id, game_id, round_number, white_engine_id, black_engine_id, result):
         """
         Records a game result specifically for a tournament, linking it to the main games table.
+        (Tournaments save it together with its game, see save_game(tournament_game=...).)
         """
         try:
             self.cursor.execute("""
@@ -352,11 +744,45 @@ class DBManager:
             JOIN games g ON tg.game_id = g.game_id
             LEFT JOIN engines ew ON tg.white_engine_id = ew.engine_id
             LEFT JOIN engines bw ON tg.black_engine_id = bw.engine_id
-            WHERE tg.tournament_id = ? ORDER BY tg.round_number
+            WHERE tg.tournament_id = ? ORDER BY tg.round_number, tg.tournament_game_id
         """, (tournament_id,))
         columns = [description[0] for description in self.cursor.description]
         return [dict(zip(columns, row)) for row in self.cursor.fetchall()]
 
+    def get_tournament(self, tournament_id):
+        """Retrieves a tournament's details (config decoded from JSON), or None if it does not exist."""
+        self.cursor.execute("SELECT * FROM tournaments WHERE tournament_id = ?", (tournament_id,))
+        row = self.cursor.fetchone()
+        if row is None:
+            return None
+        columns = [description[0] for description in self.cursor.description]
+        tournament = dict(zip(columns, row))
+        tournament['config'] = json.loads(tournament['config']) if tournament['config'] else {}
+        return tournament
+
+    def save_tournament_checkpoint(self, tournament_id, current_round, state):
+        """Stores the in-memory state of a running tournament (a JSON-serializable dict), replacing the previous one."""
+        try:
+            self._write_tournament_checkpoint(tournament_id, current_round, state)
+            self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error saving checkpoint of tournament {tournament_id}: {e}")
+
+    def _write_tournament_checkpoint(self, tournament_id, current_round, state):
+        self.cursor.execute("""
+            INSERT OR REPLACE INTO tournament_checkpoints (tournament_id, current_round, state, updated_at)
+            VALUES (?, ?, ?, ?)
+        """, (tournament_id, current_round, json.dumps(state), datetime.now().isoformat()))
+
+    def get_tournament_checkpoint(self, tournament_id):
+        """Returns the last checkpoint of a tournament (state decoded from JSON), or None if there is none."""
+        self.cursor.execute("SELECT current_round, state, updated_at FROM tournament_checkpoints WHERE tournament_id = ?",
+                            (tournament_id,))
+        row = self.cursor.fetchone()
+        if row is None:
+            return None
+        return {'current_round': row[0], 'state': json.loads(row[1]), 'updated_at': row[2]}
+
     def save_tournament_engine_stats(self, tournament_id, engine_id, initial_elo, final_elo, wins, losses, draws, points_scored):
         """Saves or updates the performance statistics for an engine in a specific tournament."""
         try:
@@ -393,12 +819,109 @@ class DBManager:
         columns = [description[0] for description in self.cursor.description]
         return [dict(zip(columns, row)) for row in self.cursor.fetchall()]
 
+    def save_sprt_test(self, test_data):
+        """
+        Saves a new SPRT match.
+        test_data should be a dictionary with keys:
+        'name', 'engine_a_id', 'engine_b_id', 'elo0', 'elo1', 'alpha', 'beta', 'start_date'
+        """
+        try:
+            self.cursor.execute("""
+                INSERT INTO sprt_tests (name, engine_a_id, engine_b_id, elo0, elo1, alpha, beta, start_date, status, llr, pentanomial)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'running', 0.0, ?)
+            """, (
+                test_data['name'], test_data['engine_a_id'], test_data['engine_b_id'],
+                test_data['elo0'], test_data['elo1'], test_data['alpha'], test_data['beta'],
+                test_data['start_date'], json.dumps([0, 0, 0, 0, 0])
+            ))
+            self.conn.commit()
+            print(f"SPRT test saved with ID: {self.cursor.lastrowid}")
+            return self.cursor.lastrowid
+        except sqlite3.Error as e:
+            print(f"Error saving SPRT test: {e}")
+            return None
+
+    def save_sprt_progress(self, test_id, pair_number, llr, pentanomial, status='running', end_date=None):
+        """Appends a point to an SPRT match's LLR trajectory and updates its current state."""
+        try:
+            self.cursor.execute("INSERT OR REPLACE INTO sprt_llr (test_id, pair_number, llr) VALUES (?, ?, ?)",
+                                (test_id, pair_number, llr))
+            self.cursor.execute("""
+                UPDATE sprt_tests SET llr = ?, pentanomial = ?, status = ?, end_date = ? WHERE test_id = ?
+            """, (llr, json.dumps(pentanomial), status, end_date, test_id))
+            self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error saving SPRT progress for test {test_id}: {e}")
+
+    def get_sprt_llr_trajectory(self, test_id):
+        """Returns the LLR trajectory of an SPRT match as a list of (pair_number, llr)."""
+        self.cursor.execute("SELECT pair_number, llr FROM sprt_llr WHERE test_id = ? ORDER BY pair_number", (test_id,))
+        return self.cursor.fetchall()
+
     def close(self):
-        """Closes the database connection."""
+        """Closes the database connection, updating the query planner statistics first."""
         if self.conn:
+            try:
+                self.cursor.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                print(f"Error optimizing database: {e}")
             self.conn.close()
             print("Database connection closed.")
 
+class ResultBatch:
+    """
+    Unit of work for game results: buffers games (with their rating changes and tournament_games
+    rows) and optionally a tournament checkpoint, then writes them all in one transaction, so a
+    round of a tournament costs one commit instead of several per game.
+
+    Usage:
+        with db.result_batch() as batch:
+            batch.add_game(game_data, rating_changes, tournament_game) # Arguments as for DBManager.save_game()
+            ...
+        # Flushed when the block ends without an exception; batch.game_ids then holds the new IDs
+    """
+    def __init__(self, db_manager: DBManager):
+        self.db_manager = db_manager
+        self.entries = []
+        self.checkpoint = None
+        self.game_ids = []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add_game(self, game_data, rating_changes=None, tournament_game=None):
+        self.entries.append((game_data, rating_changes, tournament_game))
+
+    def set_checkpoint(self, tournament_id, current_round, state):
+        """Tournament checkpoint written with the games (it should count them), replacing an earlier one of the batch."""
+        self.checkpoint = (tournament_id, current_round, state)
+
+    def flush(self):
+        """
+        Writes the buffered games and checkpoint in one transaction and empties the batch.
+        Returns the new game IDs, or None if nothing could be written; the batch then keeps
+        its games and checkpoint, so the flush can be retried.
+        """
+        if not self.entries and self.checkpoint is None:
+            return []
+        game_ids = self.db_manager._write_games(self.entries, self.checkpoint)
+        if game_ids is None:
+            return None
+        print(f"Saved {len(game_ids)} games" + (f" (IDs {game_ids[0]}-{game_ids[-1]})" if game_ids else ""))
+        self.game_ids.extend(game_ids)
+        self.entries = []
+        self.checkpoint = None
+        return game_ids
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        return False
+
+
 # Example Usage (for testing purposes, remove in final app)
 if __name__ == "__main__":
     db = DBManager()
@@ -472,8 +995,29 @@ if __name__ == "__main__":
         'engine_black_id': custom_ai_id,
         'tournament_id': tournament_id
     }
-    game3_id = db.save_game(game3_data)
-    db.save_tournament_game_result(tournament_id, game3_id, 1, stockfish_id, custom_ai_id, 'white_win')
+    # Game, Elo changes and tournament result are saved in one transaction
+    stockfish_elo, custom_ai_elo = db.get_engine_elo(stockfish_id), db.get_engine_elo(custom_ai_id)
+    game3_id = db.save_game(game3_data,
+                            rating_changes=[(stockfish_id, 'elo', stockfish_elo, stockfish_elo + 10),
+                                            (custom_ai_id, 'elo', custom_ai_elo, custom_ai_elo - 10)],
+                            tournament_game={'round_number': 1, 'result': 'white_win'})
+
+    print("\n--- Leaderboard ---")
+    for row in db.get_leaderboard(limit=10):
+        print(row)
+    print(f"Stockfish rating history: {db.get_rating_history(stockfish_id)}")
+
+    # Many results in one transaction: a commit per batch instead of one per game
+    import time
+    start = time.perf_counter()
+    for _ in range(50):
+        db.save_game(dict(game3_data, tournament_id=None))
+    single_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    with db.result_batch() as batch:
+        for _ in range(50):
+            batch.add_game(dict(game3_data, tournament_id=None))
+    print(f"50 games: {single_seconds:.3f}s one by one, {time.perf_counter() - start:.3f}s in one batch")
 
 
     # Get game history
@@ -1,6 +1,15 @@
 import chess
 import chess.engine
 import sys
+import json
+import math
+import random
+import threading
+import time
+from engine.base_engine import BaseChessEngine
+from engine.mate_search import find_mate, DEFAULT_MATE_SEARCH_NODES
+from engine.search_stats import SearchStats
+from game.chess_clock import think_time_for
 
 # Define piece values
 PIECE_VALUES = {
@@ -12,9 +21,63 @@ PIECE_VALUES = {
     chess.KING: 0 # King value is handled by checkmate/game over, not material
 }
 
+# Search constants
+MATE_SCORE = 100000 # Score for delivering mate at the root; mates further away score less
+MAX_PLY = 128
+INFINITY_SCORE = MATE_SCORE + 1
+DEFAULT_SEARCH_DEPTH = 4
+DEFAULT_THINK_TIME = 1.0 # Seconds per move when no clock information is given
+MAX_TT_ENTRIES = 200000 # Transposition table is cleared when it grows past this
+MAX_MULTIPV = 64
+BENCH_DEPTH = 4
+BENCH_POSITIONS = [ # Used by the 'bench' UCI command
+    chess.STARTING_FEN,
+    "r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 3 3",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+]
+
+# Transposition table entry bounds
+TT_EXACT = 0
+TT_LOWER = 1 # Score is a lower bound (fail high)
+TT_UPPER = 2 # Score is an upper bound (fail low)
+
+class SearchAborted(Exception):
+    """Raised inside the search when the stop flag is set or the deadline passes."""
+    pass
+
+def pick_line_by_temperature(lines, temperature, rng=random):
+    """
+    Picks one of the (move, score, pv) lines returned by search_multipv().
+    Lines are weighted by exp((score - best_score) / temperature), with the
+    temperature in centipawns: 0 always plays the best line, higher values
+    make weaker alternatives more likely.
+    """
+    if not lines:
+        return None
+    if temperature <= 0 or len(lines) == 1:
+        return lines[0]
+    best_score = lines[0][1]
+    weights = [math.exp(max(score - best_score, -50 * temperature) / temperature) for _, score, _ in lines]
+    return rng.choices(lines, weights=weights)[0]
+
 class MaterialEvaluator:
     def __init__(self):
         self.board = chess.Board()
+        self.transposition_table = {}
+        self.stop_event = threading.Event() # Set from another thread to abort the search
+        self.deadline = None # time.perf_counter() value at which the search stops, None for no limit
+        self.nodes = 0
+        self.stats = None # Attach a SearchStats instance to collect search statistics
+
+        # UCI loop state
+        self.search_thread = None
+        self.pondering = False
+        self.infinite = False
+        self.release_event = threading.Event() # Set by 'stop'/'ponderhit' to let a finished ponder/infinite search report
+        self.think_time = DEFAULT_THINK_TIME
+        self.ponder_start = None
+        self.multipv = 1
 
     def evaluate_board(self, board):
         """
@@ -27,6 +90,11 @@ class MaterialEvaluator:
             score -= len(board.pieces(piece_type, chess.BLACK)) * PIECE_VALUES[piece_type]
         return score
 
+    def _evaluate_relative(self, board):
+        """Material evaluation from the point of view of the side to move."""
+        score = self.evaluate_board(board)
+        return score if board.turn == chess.WHITE else -score
+
     def find_best_move(self):
         """
         Finds the best move by looking one ply ahead (evaluates after opponent's move is made).
@@ -87,6 +155,257 @@ class MaterialEvaluator:
 
         return best_move
 
+    def search(self, max_depth=DEFAULT_SEARCH_DEPTH, time_limit=None, info_callback=None):
+        """
+        Iterative-deepening alpha-beta search from self.board.
+
+        The search stops after max_depth plies, once time_limit seconds have
+        elapsed, or when stop_event is set; the result of the last completed
+        iteration is returned. When time_limit is None the current deadline
+        attribute is used as is, so another thread may move it while the
+        search runs (this is how a ponder hit hands the search its clock).
+
+        Returns a tuple (best_move, score, pv). The score is in centipawns
+        from the side to move's point of view, pv is a list of chess.Move.
+        """
+        lines = self.search_multipv(max_depth, 1, time_limit, info_callback)
+        if not lines:
+            return None, (-MATE_SCORE if self.board.is_check() else 0), []
+        return lines[0]
+
+    def search_multipv(self, max_depth=DEFAULT_SEARCH_DEPTH, multipv=1, time_limit=None, info_callback=None):
+        """
+        Same as search(), but finds the best `multipv` root moves. Each
+        iteration searches the root once per line, excluding the moves
+        already picked for earlier lines.
+
+        Returns a list of up to `multipv` (move, score, pv) tuples, best
+        first (empty if there are no legal moves). info_callback, if given,
+        is called as info_callback(depth, score, nodes, elapsed, pv, multipv_index)
+        for every line of every completed iteration.
+        """
+        start_time = time.perf_counter()
+        if time_limit is not None:
+            self.deadline = start_time + time_limit
+        self.nodes = 0
+        stats = self.stats
+        if stats is not None:
+            stats.reset()
+        if len(self.transposition_table) > MAX_TT_ENTRIES:
+            self.transposition_table.clear()
+
+        board = self.board
+        root_moves = self._ordered_moves(board)
+        if not root_moves:
+            return []
+        multipv = max(1, min(multipv, len(root_moves)))
+
+        root_stack_size = len(board.move_stack)
+        best_lines = [(move, 0, [move]) for move in root_moves[:multipv]]
+        for depth in range(1, max_depth + 1):
+            lines = []
+            iteration_start = time.perf_counter()
+            if stats is not None:
+                stats.start_iteration()
+            try:
+                for pv_index in range(multipv):
+                    excluded = {line[0] for line in lines}
+                    candidates = [move for move in root_moves if move not in excluded]
+                    score, move = self._search_root(candidates, depth, store_in_tt=(pv_index == 0))
+                    lines.append((move, score, self._line_pv(move, depth)))
+            except SearchAborted:
+                # Unwind the moves the interrupted iteration left on the board
+                while len(board.move_stack) > root_stack_size:
+                    board.pop()
+                break
+
+            best_lines = lines
+            if stats is not None:
+                stats.end_iteration(depth, time.perf_counter() - iteration_start)
+            # Search this iteration's best moves first next iteration
+            chosen_moves = [line[0] for line in lines]
+            root_moves = chosen_moves + [move for move in root_moves if move not in chosen_moves]
+
+            if info_callback:
+                elapsed = time.perf_counter() - start_time
+                for pv_index, (_, score, pv) in enumerate(lines):
+                    info_callback(depth, score, self.nodes, elapsed, pv, pv_index + 1)
+            if multipv == 1 and abs(lines[0][1]) >= MATE_SCORE - MAX_PLY:
+                break # Forced mate found, deeper iterations cannot improve on it
+
+        return best_lines
+
+    def _search_root(self, root_moves, depth, store_in_tt=True):
+        """Searches the given root moves to the given depth. Returns (score, best_move)."""
+        board = self.board
+        alpha, beta = -INFINITY_SCORE, INFINITY_SCORE
+        best_move = None
+        for move in root_moves:
+            board.push(move)
+            score = -self._negamax(depth - 1, -beta, -alpha, 1)
+            board.pop()
+            if best_move is None or score > alpha:
+                alpha = score
+                best_move = move
+        if store_in_tt:
+            self.transposition_table[board._transposition_key()] = (depth, alpha, TT_EXACT, best_move)
+        return alpha, best_move
+
+    def _negamax(self, depth, alpha, beta, ply):
+        """Fail-soft alpha-beta search. Scores are relative to the side to move."""
+        self.nodes += 1
+        if self.nodes & 1023 == 0:
+            self._check_abort()
+        stats = self.stats
+
+        board = self.board
+        if board.halfmove_clock >= 100 or board.is_repetition(2) or board.is_insufficient_material():
+            return 0
+        if depth <= 0:
+            return self._quiescence(alpha, beta, ply)
+        if stats is not None:
+            stats.nodes += 1
+
+        key = board._transposition_key()
+        entry = self.transposition_table.get(key)
+        tt_move = None
+        if stats is not None:
+            stats.tt_probes += 1
+        if entry:
+            entry_depth, entry_score, entry_flag, tt_move = entry
+            if stats is not None:
+                stats.tt_hits += 1
+            if entry_depth >= depth:
+                entry_score = self._score_from_tt(entry_score, ply)
+                if entry_flag == TT_EXACT or \
+                   (entry_flag == TT_LOWER and entry_score >= beta) or \
+                   (entry_flag == TT_UPPER and entry_score <= alpha):
+                    if stats is not None:
+                        stats.tt_cutoffs += 1
+                    return entry_score
+
+        moves = self._ordered_moves(board, tt_move)
+        if not moves:
+            return -MATE_SCORE + ply if board.is_check() else 0
+
+        original_alpha = alpha
+        best_score = -INFINITY_SCORE
+        best_move = None
+        for move_index, move in enumerate(moves):
+            board.push(move)
+            score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            board.pop()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if stats is not None:
+                            stats.beta_cutoffs += 1
+                            if move_index == 0:
+                                stats.first_move_beta_cutoffs += 1
+                        break
+
+        if best_score <= original_alpha:
+            flag = TT_UPPER
+        elif best_score >= beta:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
+        self.transposition_table[key] = (depth, self._score_to_tt(best_score, ply), flag, best_move)
+        return best_score
+
+    def _quiescence(self, alpha, beta, ply):
+        """Searches captures only until the position is quiet, to avoid horizon blunders."""
+        self.nodes += 1
+        if self.nodes & 1023 == 0:
+            self._check_abort()
+        if self.stats is not None:
+            self.stats.qnodes += 1
+
+        board = self.board
+        stand_pat = self._evaluate_relative(board)
+        if stand_pat >= beta or ply >= MAX_PLY:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        for move in self._ordered_moves(board, captures_only=True):
+            board.push(move)
+            score = -self._quiescence(-beta, -alpha, ply + 1)
+            board.pop()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def _ordered_moves(self, board, tt_move=None, captures_only=False):
+        """
+        Returns legal moves ordered for alpha-beta: transposition table move first,
+        then captures by most valuable victim / least valuable attacker, then promotions.
+        """
+        moves = board.generate_legal_captures() if captures_only else board.legal_moves
+
+        def order_key(move):
+            if move == tt_move:
+                return -1000000
+            if board.is_capture(move):
+                victim = board.piece_type_at(move.to_square) or chess.PAWN # En passant leaves the target square empty
+                attacker = board.piece_type_at(move.from_square)
+                return -(PIECE_VALUES[victim] * 10 - attacker)
+            if move.promotion:
+                return -PIECE_VALUES[move.promotion]
+            return 0
+
+        return sorted(moves, key=order_key)
+
+    def _line_pv(self, root_move, max_length):
+        """Principal variation starting with a given root move."""
+        self.board.push(root_move)
+        pv = [root_move] + self._extract_pv(max_length - 1)
+        self.board.pop()
+        return pv
+
+    def _extract_pv(self, max_length):
+        """Follows best moves stored in the transposition table to build the principal variation."""
+        board = self.board.copy(stack=False)
+        pv = []
+        seen = set()
+        while len(pv) < max_length:
+            key = board._transposition_key()
+            entry = self.transposition_table.get(key)
+            if not entry or entry[3] is None or key in seen or entry[3] not in board.legal_moves:
+                break
+            seen.add(key)
+            pv.append(entry[3])
+            board.push(entry[3])
+        return pv
+
+    def _check_abort(self):
+        """Raises SearchAborted if the search has been stopped or has run out of time."""
+        if self.stop_event.is_set() or (self.deadline is not None and time.perf_counter() >= self.deadline):
+            raise SearchAborted()
+
+    @staticmethod
+    def _score_to_tt(score, ply):
+        """Stores mate scores relative to the node rather than the root."""
+        if score >= MATE_SCORE - MAX_PLY:
+            return score + ply
+        if score <= -MATE_SCORE + MAX_PLY:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _score_from_tt(score, ply):
+        """Converts a node-relative mate score back to a root-relative one."""
+        if score >= MATE_SCORE - MAX_PLY:
+            return score - ply
+        if score <= -MATE_SCORE + MAX_PLY:
+            return score + ply
+        return score
+
     def uci_loop(self):
         """Implements a basic UCI loop to communicate with a UCI GUI/tester."""
         while True:
@@ -94,39 +413,325 @@ class MaterialEvaluator:
             if line == "uci":
                 sys.stdout.write("id name MaterialEvaluator\n")
                 sys.stdout.write("id author YourName\n")
+                sys.stdout.write("option name Ponder type check default false\n")
+                sys.stdout.write(f"option name MultiPV type spin default 1 min 1 max {MAX_MULTIPV}\n")
+                sys.stdout.write("option name SearchStats type check default false\n")
                 sys.stdout.write("uciok\n")
                 sys.stdout.flush()
             elif line == "isready":
                 sys.stdout.write("readyok\n")
                 sys.stdout.flush()
+            elif line.startswith("setoption"):
+                self._set_option(line.split())
             elif line == "ucinewgame":
+                self._stop_search()
                 self.board = chess.Board()
+                self.transposition_table.clear()
             elif line.startswith("position"):
-                parts = line.split()
-                if "moves" in parts:
-                    moves_index = parts.index("moves")
-                    fen_part = " ".join(parts[1:moves_index])
-                    self.board = chess.Board(fen_part)
-                    for move_uci in parts[moves_index + 1:]:
-                        move = chess.Move.from_uci(move_uci)
-                        if move in self.board.legal_moves:
-                            self.board.push(move)
-                        else:
-                            print(f"info string Illegal move received: {move_uci}", file=sys.stderr)
-                else:
-                    self.board = chess.Board(" ".join(parts[1:]))
+                self._stop_search()
+                self._set_position(line.split())
             elif line.startswith("go"):
-                chosen_move = self.find_best_move()
-                if chosen_move:
-                    sys.stdout.write(f"bestmove {chosen_move.uci()}\n")
-                else:
-                    sys.stdout.write("bestmove (none)\n")
-                sys.stdout.flush()
+                self._stop_search()
+                self._go(line.split())
+            elif line == "ponderhit":
+                self._ponderhit()
+            elif line == "stop":
+                self._stop_search()
+            elif line == "bench":
+                self._stop_search()
+                self._bench()
             elif line == "quit":
+                self._stop_search()
                 break
             else:
                 print(f"info string Unknown command: {line}", file=sys.stderr)
 
+    def _set_option(self, parts):
+        """Handles 'setoption name <id> [value <x>]'. Ponder needs no configuration: the GUI decides when to send 'go ponder'."""
+        if "name" not in parts:
+            return
+        value_index = parts.index("value") if "value" in parts else len(parts)
+        name = " ".join(parts[parts.index("name") + 1:value_index]).lower()
+        value = " ".join(parts[value_index + 1:])
+        if name == "multipv":
+            try:
+                self.multipv = max(1, min(int(value), MAX_MULTIPV))
+            except ValueError:
+                print(f"info string Invalid MultiPV value: {value}", file=sys.stderr)
+        elif name == "searchstats":
+            self.stats = SearchStats() if value.lower() == "true" else None
+
+    def _set_position(self, parts):
+        """Handles 'position [startpos | fen <fen>] [moves <move1> ...]'."""
+        moves_index = parts.index("moves") if "moves" in parts else len(parts)
+        if len(parts) > 1 and parts[1] == "startpos":
+            self.board = chess.Board()
+        else:
+            fen_parts = parts[2:moves_index] if len(parts) > 1 and parts[1] == "fen" else parts[1:moves_index]
+            self.board = chess.Board(" ".join(fen_parts))
+        for move_uci in parts[moves_index + 1:]:
+            move = chess.Move.from_uci(move_uci)
+            if move in self.board.legal_moves:
+                self.board.push(move)
+            else:
+                print(f"info string Illegal move received: {move_uci}", file=sys.stderr)
+
+    def _go(self, parts):
+        """
+        Handles 'go' and its limits (depth, movetime, wtime/btime/winc/binc, infinite, ponder, mate).
+        The search runs in a background thread so that 'stop' and 'ponderhit' can be read meanwhile.
+        """
+        params = {}
+        for i, token in enumerate(parts):
+            if token in ("depth", "movetime", "wtime", "btime", "winc", "binc", "movestogo", "mate") and i + 1 < len(parts):
+                params[token] = int(parts[i + 1])
+
+        if "mate" in params:
+            self.stop_event.clear()
+            self.release_event.set()
+            self.search_thread = threading.Thread(target=self._mate_search_and_report, args=(params["mate"],), daemon=True)
+            self.search_thread.start()
+            return
+
+        self.pondering = "ponder" in parts
+        self.infinite = "infinite" in parts
+        max_depth = params.get("depth", MAX_PLY if self.infinite else DEFAULT_SEARCH_DEPTH)
+
+        if "movetime" in params:
+            self.think_time = params["movetime"] / 1000.0
+        elif "wtime" in params or "btime" in params:
+            # Pondering searches the position after the opponent's expected reply, so our clock is the one to move
+            our_clock = "wtime" if self.board.turn == chess.WHITE else "btime"
+            our_increment = "winc" if self.board.turn == chess.WHITE else "binc"
+            moves_to_go = params.get("movestogo", 30)
+            self.think_time = (params.get(our_clock, 0) / moves_to_go + params.get(our_increment, 0)) / 1000.0
+        else:
+            self.think_time = DEFAULT_THINK_TIME if "depth" not in params else None
+
+        self.stop_event.clear()
+        self.release_event.clear()
+        self.ponder_start = time.perf_counter()
+        if self.pondering or self.infinite or self.think_time is None:
+            self.deadline = None
+        else:
+            self.deadline = self.ponder_start + self.think_time
+
+        self.search_thread = threading.Thread(target=self._search_and_report, args=(max_depth,), daemon=True)
+        self.search_thread.start()
+
+    def _search_and_report(self, max_depth):
+        """Background search thread body: searches, waits for release if pondering, then prints bestmove."""
+        def report_info(depth, score, nodes, elapsed, pv, multipv_index):
+            score_text = self._uci_score_text(score)
+            sys.stdout.write(f"info depth {depth} multipv {multipv_index} score {score_text} nodes {nodes} "
+                             f"time {int(elapsed * 1000)} pv {' '.join(m.uci() for m in pv)}\n")
+            sys.stdout.flush()
+
+        lines = self.search_multipv(max_depth, self.multipv, info_callback=report_info)
+        best_move, _, pv = lines[0] if lines else (None, 0, [])
+        if self.stats is not None:
+            sys.stdout.write("".join(f"{info_line}\n" for info_line in self.stats.uci_info_lines()))
+
+        # UCI forbids sending bestmove while pondering or in infinite mode until 'ponderhit'/'stop' arrives
+        if self.pondering or self.infinite:
+            self.release_event.wait()
+
+        if best_move:
+            ponder_text = f" ponder {pv[1].uci()}" if len(pv) > 1 else ""
+            sys.stdout.write(f"bestmove {best_move.uci()}{ponder_text}\n")
+        else:
+            sys.stdout.write("bestmove (none)\n")
+        sys.stdout.flush()
+
+    def _bench(self):
+        """
+        Searches BENCH_POSITIONS to a fixed depth with statistics enabled and
+        prints one JSON object per position plus a summary line, for benchmark tooling.
+        """
+        previous_board, previous_stats = self.board, self.stats
+        self.stats = SearchStats()
+        total_nodes, total_time = 0, 0.0
+        for fen in BENCH_POSITIONS:
+            self.board = chess.Board(fen)
+            self.transposition_table.clear()
+            self.stop_event.clear()
+            self.deadline = None
+            start_time = time.perf_counter()
+            best_move, score, _ = self.search(BENCH_DEPTH)
+            elapsed = time.perf_counter() - start_time
+            total_nodes += self.nodes
+            total_time += elapsed
+            result = {"fen": fen, "depth": BENCH_DEPTH, "bestmove": best_move.uci() if best_move else None,
+                      "score": score, "time_ms": round(elapsed * 1000, 3), "stats": self.stats.to_dict()}
+            sys.stdout.write(json.dumps(result) + "\n")
+        nps = int(total_nodes / total_time) if total_time else 0
+        sys.stdout.write(json.dumps({"total_nodes": total_nodes, "total_time_ms": round(total_time * 1000, 3), "nps": nps}) + "\n")
+        sys.stdout.flush()
+        self.board, self.stats = previous_board, previous_stats
+
+    def _mate_search_and_report(self, mate_in_moves):
+        """Background body of 'go mate N': proof-number search for a mate in at most N moves."""
+        mating_line = find_mate(self.board, DEFAULT_MATE_SEARCH_NODES, max_plies=2 * mate_in_moves - 1,
+                                stop_event=self.stop_event)
+        if mating_line:
+            sys.stdout.write(f"info depth {len(mating_line)} score mate {(len(mating_line) + 1) // 2} "
+                             f"pv {' '.join(m.uci() for m in mating_line)}\n")
+            sys.stdout.write(f"bestmove {mating_line[0].uci()}\n")
+            sys.stdout.flush()
+        else:
+            # No mate proven: fall back to the normal search so the GUI still gets a move
+            # (a pending 'stop' stays set, so that search returns at once)
+            self.pondering = self.infinite = False
+            self.deadline = time.perf_counter() + DEFAULT_THINK_TIME
+            self._search_and_report(DEFAULT_SEARCH_DEPTH)
+
+    def _ponderhit(self):
+        """The opponent played the expected move: the ponder search becomes the real search."""
+        if not self.pondering:
+            return
+        self.pondering = False
+        if self.think_time is not None:
+            # Time already spent pondering counts, so a long ponder returns almost at once
+            self.deadline = self.ponder_start + self.think_time
+        if not self.infinite:
+            self.release_event.set()
+
+    def _stop_search(self):
+        """Stops a running search (if any) and waits for it to print its bestmove."""
+        if self.search_thread and self.search_thread.is_alive():
+            self.stop_event.set()
+            self.release_event.set()
+            self.search_thread.join()
+        self.search_thread = None
+        self.pondering = False
+        self.infinite = False
+
+    @staticmethod
+    def _uci_score_text(score):
+        """Formats a search score as a UCI 'cp <x>' or 'mate <n>' string."""
+        if abs(score) >= MATE_SCORE - MAX_PLY:
+            plies_to_mate = MATE_SCORE - abs(score)
+            moves_to_mate = (plies_to_mate + 1) // 2
+            return f"mate {moves_to_mate if score > 0 else -moves_to_mate}"
+        return f"cp {score}"
+
+
+class MaterialSearchEngine(BaseChessEngine):
+    """
+    Plays the moves found by the MaterialEvaluator alpha-beta search.
+    With ponder enabled it keeps searching the opponent's expected reply
+    (the second move of its principal variation) while the opponent thinks.
+    For weakened play, set multipv > 1 and a temperature (centipawns): the
+    move is then drawn from the top `multipv` root moves instead of always
+    playing the best one.
+    """
+    def __init__(self, name="MaterialSearchEngine", version="1.0", depth=DEFAULT_SEARCH_DEPTH,
+                 think_time=DEFAULT_THINK_TIME, ponder=False, multipv=1, temperature=0.0):
+        super().__init__(name, version)
+        self.depth = depth
+        self.think_time = think_time
+        self.ponder = ponder
+        self.multipv = multipv
+        self.temperature = temperature
+        self.searcher = MaterialEvaluator()
+        self.last_pv = [] # Principal variation of the last move played
+        self._ponder_thread = None
+        self._ponder_board = None # Position the ponder search is running on
+        self._ponder_result = None
+        self._ponder_start = None
+
+    def make_move(self) -> chess.Move | None:
+        """
+        Returns the best move found within think_time seconds (or depth plies).
+        On a ponder hit the background search is finished instead of starting over.
+        """
+        if self.board.is_game_over(claim_draw=True):
+            return None
+
+        if self._ponder_thread is not None:
+            if self._ponder_board == self.board and self._ponder_board.move_stack == self.board.move_stack:
+                return self._finish_ponder_hit()
+            self.stop_ponder() # Ponder miss: discard and search the real position
+
+        self.searcher.board = self.board
+        self.searcher.stop_event.clear()
+        move_time = self._move_time()
+        if move_time is None:
+            self.searcher.deadline = None # No limit: a deadline left from an earlier search must not stop this one
+        lines = self.searcher.search_multipv(self.depth, self.multipv, time_limit=move_time)
+        return self._play_line(lines)
+
+    def _move_time(self):
+        """Seconds to think: allocated from the game clock when there is one, think_time otherwise."""
+        if self.time_limits is not None:
+            return think_time_for(self.time_limits, self.board.turn)
+        return self.think_time
+
+    def _play_line(self, lines):
+        """Chooses the line to play (best, or by temperature when weakened) and remembers its PV."""
+        self.last_nodes = self.searcher.nodes
+        line = pick_line_by_temperature(lines, self.temperature)
+        if line is None:
+            self.last_pv = []
+            return None
+        self.last_pv = line[2]
+        self.last_score = line[1]
+        return line[0]
+
+    def start_ponder(self):
+        """
+        Starts searching the position after the expected reply in a background thread.
+        Expects set_board() to have been called with the position after this engine's move.
+        """
+        if not self.ponder or len(self.last_pv) < 2:
+            return
+        self.stop_ponder()
+        if not self.board.move_stack or self.board.peek() != self.last_pv[0]:
+            return # The board is not the one our PV was computed for
+        expected_reply = self.last_pv[1]
+        if expected_reply not in self.board.legal_moves:
+            return
+
+        ponder_board = self.board.copy()
+        ponder_board.push(expected_reply)
+        if ponder_board.is_game_over(claim_draw=True):
+            return
+
+        self._ponder_board = ponder_board
+        self.searcher.board = ponder_board.copy()
+        self.searcher.deadline = None # Search until ponder hit/miss
+        self.searcher.stop_event.clear()
+        self._ponder_start = time.perf_counter()
+        self._ponder_thread = threading.Thread(target=self._ponder_search, daemon=True)
+        self._ponder_thread.start()
+
+    def stop_ponder(self):
+        """Aborts the background ponder search, if one is running."""
+        if self._ponder_thread is not None:
+            self.searcher.stop_event.set()
+            self._ponder_thread.join()
+        self._ponder_thread = None
+        self._ponder_board = None
+        self._ponder_result = None
+
+    def quit(self):
+        """Stops pondering so no background thread outlives the game."""
+        self.stop_ponder()
+
+    def _ponder_search(self):
+        self._ponder_result = self.searcher.search_multipv(self.depth, self.multipv)
+
+    def _finish_ponder_hit(self):
+        """Gives the running ponder search its normal time budget (counted from ponder start) and waits for it."""
+        move_time = self._move_time()
+        self.searcher.deadline = self._ponder_start + move_time if move_time is not None else None
+        self._ponder_thread.join()
+        lines = self._ponder_result
+        self._ponder_thread = None
+        self._ponder_board = None
+        self._ponder_result = None
+        return self._play_line(lines)
+
 if __name__ == "__main__":
     engine = MaterialEvaluator()
     engine.uci_loop()
\ No newline at end of file
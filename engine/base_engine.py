@@ -11,6 +11,10 @@ class BaseChessEngine(abc.ABC):
         self.name = name
         self.version = version
         self.board = chess.Board() # Internal board state for the engine
+        self.ponder = False # Engines that can think on the opponent's time may enable this
+        self.last_nodes = None # Nodes searched for the last move, for engines that report it
+        self.time_limits = None # Clock state for the next move (see game.chess_clock.ChessClock.engine_limits()), None without a clock
+        self.last_score = None # Evaluation of the last move in centipawns, from the engine's side, for engines that report it
 
     def set_board(self, board: chess.Board):
         """
@@ -27,3 +31,16 @@ class BaseChessEngine(abc.ABC):
         Returns a chess.Move object.
         """
         pass
+
+    def start_ponder(self):
+        """
+        Starts thinking on the opponent's time from the current board state
+        (the position right after this engine's move). The next make_move()
+        call finishes or discards that work depending on the reply played.
+        Engines that cannot ponder simply ignore this call.
+        """
+        pass
+
+    def stop_ponder(self):
+        """Stops any background thinking started by start_ponder()."""
+        pass
@@ -0,0 +1,57 @@
+# engine/engine_factory.py
+import os
+import inspect
+from engine.stockfish_engine import StockfishEngine
+from engine.simple_ai_engine import SimpleAIEngine
+from engine.RandomMover import RandomMover
+from engine.CapturePreferringEngine import CapturePreferringEngine
+from engine.MaterialEvaluator import MaterialSearchEngine
+
+# Internal engine classes by the 'class' name stored in an engine's DB parameters
+INTERNAL_ENGINE_CLASSES = {
+    "SimpleAIEngine": SimpleAIEngine,
+    "RandomMover": RandomMover,
+    "CapturePreferringEngine": CapturePreferringEngine,
+    "MaterialSearchEngine": MaterialSearchEngine,
+}
+
+def create_engine(engine_data: dict, **overrides):
+    """
+    Builds an engine instance from an engine record as returned by
+    DBManager.get_all_engines()/get_engine_by_name().
+
+    Internal engines are selected by parameters['class']; any other entry of
+    parameters matching a constructor argument (e.g. "depth") is passed on,
+    as are keyword overrides (e.g. ponder=True). Engines with a path are
+    started as external UCI engines.
+
+    Returns the engine, or None if the record does not describe a usable engine.
+    """
+    parameters = engine_data.get('parameters') or {}
+    name = engine_data['name']
+    version = engine_data.get('version') or "1.0"
+
+    if parameters.get('type') == 'internal':
+        engine_class = INTERNAL_ENGINE_CLASSES.get(parameters.get('class'))
+        if engine_class is None:
+            print(f"Unknown internal engine class: {parameters.get('class')} for {name}.")
+            return None
+        accepted = inspect.signature(engine_class.__init__).parameters
+        kwargs = {key: value for key, value in {**parameters, **overrides}.items()
+                  if key in accepted and key not in ('self', 'name', 'version')}
+        return engine_class(name=name, version=version, **kwargs)
+
+    path = engine_data.get('path')
+    if path and os.path.exists(path): # External UCI engine
+        try:
+            engine = StockfishEngine(path, name=name, version=version, **overrides)
+        except Exception as e:
+            print(f"Error initializing external engine {name}: {e}")
+            return None
+        if not engine.engine: # Process failed to start
+            print(f"Failed to connect to external engine {name} at {path}.")
+            return None
+        return engine
+
+    print(f"Engine {name} has no valid path for external type or unrecognized internal type.")
+    return None
@@ -0,0 +1,160 @@
+# engine/mate_search.py
+import chess
+
+INFINITE_PROOF = float('inf')
+DEFAULT_MATE_SEARCH_NODES = 200000
+
+class _ProofNode:
+    """A node of the proof-number search tree. OR nodes have the attacker to move, AND nodes the defender."""
+    __slots__ = ("move", "parent", "children", "is_or_node", "depth", "proof", "disproof")
+
+    def __init__(self, move, parent, is_or_node, depth):
+        self.move = move # Move leading from the parent to this node (None for the root)
+        self.parent = parent
+        self.children = None # None until expanded
+        self.is_or_node = is_or_node
+        self.depth = depth # Plies from the root
+        self.proof = 1
+        self.disproof = 1
+
+    def set_proven(self):
+        self.proof, self.disproof = 0, INFINITE_PROOF
+
+    def set_disproven(self):
+        self.proof, self.disproof = INFINITE_PROOF, 0
+
+
+def find_mate(board: chess.Board, max_nodes: int = DEFAULT_MATE_SEARCH_NODES, max_plies: int | None = None,
+              checks_only: bool = False, stop_event=None) -> list | None:
+    """
+    Looks for a forced mate for the side to move using proof-number search.
+
+    Args:
+        board: Position to search. It is not modified (a copy is searched).
+        max_nodes: Size of the node table; the search gives up once this many nodes exist.
+        max_plies: Optional length limit of the mating line in plies (mate in N moves is 2N-1 plies).
+        checks_only: Only consider checking moves for the attacker. Much cheaper, finds
+                     only mates where every attacking move is a check.
+        stop_event: Optional threading.Event that aborts the search when set.
+
+    Returns:
+        The mating line as a list of chess.Move starting with the attacker's move,
+        or None if no forced mate was proven within the limits.
+    """
+    board = board.copy()
+    attacker = board.turn
+    if board.is_game_over() or board.has_insufficient_material(attacker):
+        return None
+
+    root = _ProofNode(None, None, True, 0)
+    node_count = 1
+
+    while root.proof != 0 and root.disproof != 0:
+        if stop_event is not None and stop_event.is_set():
+            return None
+
+        # Walk down to the most-proving node, playing its moves on the board
+        node = root
+        while node.children is not None:
+            if node.is_or_node:
+                node = next(child for child in node.children if child.proof == node.proof)
+            else:
+                node = next(child for child in node.children if child.disproof == node.disproof)
+            board.push(node.move)
+
+        # Expand it, evaluating every child as a leaf
+        moves = list(board.legal_moves)
+        if node.is_or_node and checks_only:
+            moves = [move for move in moves if board.gives_check(move)]
+        if node_count + len(moves) > max_nodes:
+            return None
+        node.children = []
+        for move in moves:
+            child = _ProofNode(move, node, not node.is_or_node, node.depth + 1)
+            board.push(move)
+            _evaluate_leaf(board, child, attacker, max_plies, checks_only)
+            board.pop()
+            node.children.append(child)
+        node_count += len(moves)
+
+        # Back up proof/disproof numbers to the root, undoing moves on the way
+        while node is not None:
+            _update_proof_numbers(node)
+            if node.move is not None:
+                board.pop()
+            node = node.parent
+
+    if root.proof != 0:
+        return None
+    return _extract_mating_line(root)
+
+
+def _evaluate_leaf(board, node, attacker, max_plies, checks_only):
+    """Sets the proof numbers of a freshly created node from the position reached."""
+    if board.is_checkmate():
+        if board.turn != attacker:
+            node.set_proven()
+        else:
+            node.set_disproven()
+    elif board.is_stalemate() or board.is_insufficient_material() or \
+         board.halfmove_clock >= 100 or board.is_repetition(2):
+        node.set_disproven()
+    elif max_plies is not None and node.depth >= max_plies:
+        node.set_disproven() # No mate within the allowed length
+    elif checks_only and node.is_or_node and not any(board.gives_check(move) for move in board.legal_moves):
+        node.set_disproven()
+
+
+def _update_proof_numbers(node):
+    """Recomputes an expanded node's proof/disproof numbers from its children."""
+    children = node.children
+    if not children:
+        # No legal (or no considered) moves: a mated/stalemated side is caught at evaluation,
+        # so this is an attacker without checks (checks_only) - not a proof.
+        if node.is_or_node:
+            node.set_disproven()
+        else:
+            node.set_proven()
+        return
+    if node.is_or_node:
+        node.proof = min(child.proof for child in children)
+        node.disproof = sum(child.disproof for child in children)
+    else:
+        node.proof = sum(child.proof for child in children)
+        node.disproof = min(child.disproof for child in children)
+
+
+def _extract_mating_line(root):
+    """Follows proven children from the root. The defender is assumed to choose the longest resistance."""
+    line = []
+    node = root
+    while node.children:
+        if node.is_or_node:
+            node = min((child for child in node.children if child.proof == 0), key=_proven_length)
+        else:
+            node = max(node.children, key=_proven_length)
+        line.append(node.move)
+    return line
+
+
+def _proven_length(node):
+    """Length in plies of the proven line below a node (used to pick short mates and long defences)."""
+    if not node.children:
+        return 0
+    if node.is_or_node:
+        return 1 + min(_proven_length(child) for child in node.children if child.proof == 0)
+    return 1 + max(_proven_length(child) for child in node.children)
+
+
+if __name__ == '__main__':
+    # Example Usage / Simple Test:
+    board = chess.Board("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1") # Back-rank mate: Ra8#
+    line = find_mate(board, max_nodes=10000)
+    print(f"Mate line: {[move.uci() for move in line] if line else None} (Expected: ['a1a8'])")
+
+    board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4") # Scholar's mate
+    line = find_mate(board, max_nodes=10000, max_plies=1)
+    print(f"Mate line: {[move.uci() for move in line] if line else None} (Expected: ['h5f7'])")
+
+    board = chess.Board()
+    print(f"Mate from the initial position: {find_mate(board, max_nodes=2000)} (Expected: None)")
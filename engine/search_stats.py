@@ -0,0 +1,87 @@
+# engine/search_stats.py
+import json
+
+class SearchStats:
+    """
+    Counters filled in by MaterialEvaluator's search when attached to it
+    (evaluator.stats = SearchStats()). With no stats object attached the
+    search only pays for a None check per counted event.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Clears all counters, e.g. before a new search."""
+        self.nodes = 0            # Alpha-beta nodes (excluding quiescence)
+        self.qnodes = 0           # Quiescence nodes
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tt_cutoffs = 0       # Probes whose stored bound ended the node
+        self.beta_cutoffs = 0
+        self.first_move_beta_cutoffs = 0 # Beta cutoffs produced by the first move searched (move ordering quality)
+        self.iterations = []      # One dict per completed iteration, see end_iteration()
+        self._nodes_at_iteration_start = 0
+
+    def start_iteration(self):
+        """Marks the start of an iterative-deepening iteration."""
+        self._nodes_at_iteration_start = self.nodes + self.qnodes
+
+    def end_iteration(self, depth, elapsed_seconds):
+        """Records a completed iteration with its node count, time and effective branching factor."""
+        total_nodes = self.nodes + self.qnodes
+        iteration_nodes = total_nodes - self._nodes_at_iteration_start
+        previous_nodes = self.iterations[-1]["iteration_nodes"] if self.iterations else 0
+        self.iterations.append({
+            "depth": depth,
+            "iteration_nodes": iteration_nodes,
+            "total_nodes": total_nodes,
+            "time_ms": round(elapsed_seconds * 1000, 3),
+            # Nodes of this iteration relative to the previous one
+            "ebf": round(iteration_nodes / previous_nodes, 3) if previous_nodes else None,
+        })
+
+    @staticmethod
+    def _rate(part, whole):
+        return part / whole if whole else 0.0
+
+    @property
+    def tt_hit_rate(self):
+        return self._rate(self.tt_hits, self.tt_probes)
+
+    @property
+    def first_move_cutoff_rate(self):
+        return self._rate(self.first_move_beta_cutoffs, self.beta_cutoffs)
+
+    def to_dict(self):
+        """Returns all counters and derived rates as a plain dictionary."""
+        return {
+            "nodes": self.nodes,
+            "qnodes": self.qnodes,
+            "tt_probes": self.tt_probes,
+            "tt_hits": self.tt_hits,
+            "tt_cutoffs": self.tt_cutoffs,
+            "tt_hit_rate": round(self.tt_hit_rate, 4),
+            "beta_cutoffs": self.beta_cutoffs,
+            "first_move_beta_cutoffs": self.first_move_beta_cutoffs,
+            "first_move_cutoff_rate": round(self.first_move_cutoff_rate, 4),
+            "iterations": list(self.iterations),
+        }
+
+    def to_json(self):
+        """Serializes the statistics for benchmark tooling."""
+        return json.dumps(self.to_dict())
+
+    def uci_info_lines(self):
+        """Formats the statistics as UCI 'info string' lines."""
+        lines = [
+            f"info string stats nodes {self.nodes} qnodes {self.qnodes} "
+            f"tt_probes {self.tt_probes} tt_hits {self.tt_hits} tt_cutoffs {self.tt_cutoffs} "
+            f"tt_hit_rate {self.tt_hit_rate:.3f}",
+            f"info string stats beta_cutoffs {self.beta_cutoffs} "
+            f"first_move_cutoff_rate {self.first_move_cutoff_rate:.3f}",
+        ]
+        for iteration in self.iterations:
+            ebf = f"{iteration['ebf']:.2f}" if iteration["ebf"] is not None else "-"
+            lines.append(f"info string stats depth {iteration['depth']} nodes {iteration['iteration_nodes']} "
+                         f"time {iteration['time_ms']:.1f} ebf {ebf}")
+        return lines
@@ -4,15 +4,19 @@ import chess.engine
 import sys
 from engine.base_engine import BaseChessEngine
 
+MATE_SCORE = 100000 # Centipawn value given to mate scores in last_score
+
 class StockfishEngine(BaseChessEngine):
     """
     A wrapper for the Stockfish chess engine (or any UCI-compatible engine).
     Requires the Stockfish executable to be downloaded and its path provided.
     """
-    def __init__(self, path_to_engine: str, name="Stockfish", version="15", skill_level=20):
+    def __init__(self, path_to_engine: str, name="Stockfish", version="15", skill_level=20, think_time=0.5, ponder=False):
         super().__init__(name, version)
         self.path_to_engine = path_to_engine
         self.skill_level = skill_level
+        self.think_time = think_time # Seconds per move
+        self.ponder = ponder
         self.engine = None
         self._connect_engine()
 
@@ -45,7 +49,14 @@ class StockfishEngine(BaseChessEngine):
             # `self.engine.play(board, limit)` asks the engine to find a move
             # `chess.engine.Limit(time=2.0)` limits thinking time to 2 seconds
             # You can also use `depth`, `nodes`, etc.
-            result = self.engine.play(self.board, chess.engine.Limit(time=0.5)) # 0.5 seconds thinking time
+            # With ponder=True python-chess sends `go ponder` on the expected reply as soon as
+            # the move is returned, and the next play() call sends `ponderhit` if that reply was played
+            # (or `stop` and a fresh search on a miss).
+            result = self.engine.play(self.board, self._limit(), ponder=self.ponder,
+                                      info=chess.engine.INFO_BASIC | chess.engine.INFO_SCORE)
+            self.last_nodes = result.info.get("nodes")
+            score = result.info.get("score")
+            self.last_score = score.pov(self.board.turn).score(mate_score=MATE_SCORE) if score else None
             return result.move
         except chess.engine.EngineError as e:
             print(f"Engine error during move calculation: {e}", file=sys.stderr)
@@ -54,6 +65,24 @@ class StockfishEngine(BaseChessEngine):
             print(f"Unexpected error in engine.make_move: {e}", file=sys.stderr)
             return None
 
+    def _limit(self):
+        """Search limit: the game clock when there is one, think_time seconds per move otherwise."""
+        limits = self.time_limits
+        if limits is None:
+            return chess.engine.Limit(time=self.think_time)
+        if "movetime" in limits:
+            return chess.engine.Limit(time=limits["movetime"])
+        return chess.engine.Limit(white_clock=limits["wtime"], black_clock=limits["btime"], white_inc=limits["winc"],
+                                  black_inc=limits["binc"], remaining_moves=limits["movestogo"])
+
+    def stop_ponder(self):
+        """Stops the engine's `go ponder` search, e.g. when the game ends or is abandoned."""
+        if self.engine and self.ponder:
+            try:
+                self.engine.ping() # Any new command makes python-chess send `stop` to a pondering engine
+            except chess.engine.EngineError as e:
+                print(f"Engine error while stopping ponder: {e}", file=sys.stderr)
+
     def quit(self):
         """Terminates the engine process."""
         if self.engine:
@@ -0,0 +1,171 @@
+# game/chess_clock.py
+import time
+import chess
+
+DEFAULT_MOVES_TO_GO = 30 # Moves an engine plans for when the time control has no sessions
+DEFAULT_TIME_MARGIN = 0.05 # Seconds an engine may overstep its time before it loses on time
+NS_PER_SECOND = 1_000_000_000
+
+class TimeControl:
+    """
+    Time control of a game, the same for both sides. Times are in seconds.
+
+    base, increment: time at the start, and added after every move (Fischer).
+    moves_per_session: with base, every moves_per_session moves the base time is
+                       added again (e.g. 40 moves in 60 seconds, repeating). 0 for a single session.
+    movetime: fixed time per move instead of a clock (base and sessions are ignored).
+
+    Written as "[moves/]base[+increment]" (e.g. "40/60", "60+0.5") or "movetime=0.5".
+    """
+    __slots__ = ("base", "increment", "moves_per_session", "movetime")
+
+    def __init__(self, base: float | None = None, increment: float = 0.0, moves_per_session: int = 0,
+                 movetime: float | None = None):
+        if base is None and movetime is None:
+            raise ValueError("A time control needs a base time or a time per move.")
+        self.base = base
+        self.increment = increment
+        self.moves_per_session = moves_per_session
+        self.movetime = movetime
+
+    @classmethod
+    def parse(cls, text: str):
+        """Parses "[moves/]base[+increment]" or "movetime=seconds"."""
+        text = text.strip()
+        if text.startswith("movetime="):
+            return cls(movetime=float(text[len("movetime="):]))
+        moves_per_session = 0
+        if "/" in text:
+            moves, text = text.split("/", 1)
+            moves_per_session = int(moves)
+        base, _, increment = text.partition("+")
+        return cls(float(base), float(increment or 0), moves_per_session)
+
+    def pgn_tag(self) -> str:
+        """Value of the PGN TimeControl tag ("40/60", "60+0.5", "*0.5" for a fixed time per move)."""
+        if self.movetime is not None:
+            return f"*{self.movetime:g}"
+        tag = f"{self.moves_per_session}/{self.base:g}" if self.moves_per_session else f"{self.base:g}"
+        return f"{tag}+{self.increment:g}" if self.increment else tag
+
+    def __str__(self):
+        return f"movetime={self.movetime:g}" if self.movetime is not None else self.pgn_tag()
+
+    def __repr__(self):
+        return f"TimeControl({self})"
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+class ChessClock:
+    """
+    Both players' clocks for one game, measured with time.perf_counter_ns().
+
+    Usage:
+        clock = ChessClock(TimeControl.parse("60+0.5"))
+        clock.start_move(board.turn)
+        ... the player thinks ...
+        elapsed = clock.stop_move() # Seconds; clock.flagged tells whether the player lost on time
+
+    A player whose clock runs below -margin (or who takes more than movetime +
+    margin with a fixed time per move) has flagged; the margin absorbs the
+    overhead of asking an engine for its move.
+    """
+    def __init__(self, time_control: TimeControl, margin: float = DEFAULT_TIME_MARGIN):
+        self.time_control = time_control
+        self.margin_ns = int(margin * NS_PER_SECOND)
+        base_ns = int((time_control.base or 0) * NS_PER_SECOND)
+        self.remaining_ns = {chess.WHITE: base_ns, chess.BLACK: base_ns}
+        self.moves_made = {chess.WHITE: 0, chess.BLACK: 0}
+        self.flagged = None # Color that lost on time, if any
+        self._running_color = None
+        self._move_start_ns = None
+
+    def start_move(self, color: chess.Color):
+        """Starts the clock of the player to move."""
+        self._running_color = color
+        self._move_start_ns = time.perf_counter_ns()
+
+    def stop_move(self) -> float:
+        """Stops the running clock after a move and returns the time the move took, in seconds."""
+        elapsed_ns = time.perf_counter_ns() - self._move_start_ns
+        color = self._running_color
+        self._running_color = None
+        self.moves_made[color] += 1
+        time_control = self.time_control
+
+        if time_control.movetime is not None:
+            if elapsed_ns > time_control.movetime * NS_PER_SECOND + self.margin_ns:
+                self.flagged = color
+            return elapsed_ns / NS_PER_SECOND
+
+        self.remaining_ns[color] -= elapsed_ns
+        if self.remaining_ns[color] < -self.margin_ns:
+            self.flagged = color
+        self.remaining_ns[color] += int(time_control.increment * NS_PER_SECOND)
+        if time_control.moves_per_session and self.moves_made[color] % time_control.moves_per_session == 0:
+            self.remaining_ns[color] += int(time_control.base * NS_PER_SECOND)
+        return elapsed_ns / NS_PER_SECOND
+
+    def remaining(self, color: chess.Color) -> float:
+        """Time left on a player's clock in seconds (not counting a move in progress)."""
+        return self.remaining_ns[color] / NS_PER_SECOND
+
+    def engine_limits(self, color: chess.Color) -> dict:
+        """
+        Clock state handed to the engine playing `color` before it moves (BaseChessEngine.time_limits),
+        in seconds: wtime, btime, winc, binc and movestogo (None without sessions),
+        or only movetime with a fixed time per move.
+        """
+        time_control = self.time_control
+        if time_control.movetime is not None:
+            return {"movetime": time_control.movetime}
+        moves_to_go = None
+        if time_control.moves_per_session:
+            moves_to_go = time_control.moves_per_session - self.moves_made[color] % time_control.moves_per_session
+        return {
+            "wtime": max(0.0, self.remaining(chess.WHITE)),
+            "btime": max(0.0, self.remaining(chess.BLACK)),
+            "winc": time_control.increment,
+            "binc": time_control.increment,
+            "movestogo": moves_to_go,
+        }
+
+
+def think_time_for(time_limits: dict, color: chess.Color) -> float:
+    """
+    Simple time allocation for engines: the fixed time per move, or an even
+    share of the remaining time over the moves to go plus the increment,
+    never more than most of what is left on the clock.
+    """
+    if "movetime" in time_limits:
+        return time_limits["movetime"]
+    remaining = time_limits["wtime"] if color == chess.WHITE else time_limits["btime"]
+    increment = time_limits["winc"] if color == chess.WHITE else time_limits["binc"]
+    moves_to_go = time_limits.get("movestogo") or DEFAULT_MOVES_TO_GO
+    return max(0.0, min(remaining / moves_to_go + increment, remaining * 0.8))
+
+
+if __name__ == '__main__':
+    # Example Usage / Simple Test:
+    for text in ("60+0.5", "40/60", "movetime=0.2"):
+        time_control = TimeControl.parse(text)
+        print(f"{text!r}: {time_control!r}, PGN tag {time_control.pgn_tag()}, round trip {str(time_control) == text}")
+
+    clock = ChessClock(TimeControl.parse("2/0.1"), margin=0.0)
+    for move_number in range(3):
+        limits = clock.engine_limits(chess.WHITE)
+        clock.start_move(chess.WHITE)
+        time.sleep(0.03)
+        elapsed = clock.stop_move()
+        print(f"Move {move_number + 1}: movestogo {limits['movestogo']}, took {elapsed:.3f}s, "
+              f"{clock.remaining(chess.WHITE):.3f}s left, flagged {clock.flagged}")
+    clock.start_move(chess.BLACK)
+    time.sleep(0.12)
+    clock.stop_move()
+    print(f"Black overstepped 0.1s: flagged {clock.flagged == chess.BLACK}")
@@ -1,5 +1,29 @@
 # game/chess_game_manager.py
 import chess
+from array import array
+from collections import deque
+from game.move_codec import encode_move, codes_to_bytes, decode_moves_uci
+
+PGN_COLUMNS = 80 # Movetext line width, same as chess.pgn.StringExporter's default
+RESULT_STRINGS = {'white': '1-0', 'black': '0-1', 'draw': '1/2-1/2'}
+SNAPSHOT_INTERVAL = 16 # Plies between position snapshots
+SNAPSHOT_RING_SIZE = 64 # Snapshots kept; older ones are dropped (64 * 16 plies covers long games)
+
+class GameStatus:
+    """
+    Termination status of a position, computed once per move by ChessGameManager.
+    winner is 'white', 'black' or 'draw' and reason a string such as 'checkmate'
+    when the game is over; both are None otherwise.
+    """
+    __slots__ = ("is_over", "winner", "reason")
+
+    def __init__(self, is_over=False, winner=None, reason=None):
+        self.is_over = is_over
+        self.winner = winner
+        self.reason = reason
+
+    def __repr__(self):
+        return f"GameStatus(is_over={self.is_over}, winner={self.winner}, reason={self.reason})"
 
 class ChessGameManager:
     """
@@ -8,12 +32,116 @@ class ChessGameManager:
     """
     def __init__(self):
         self.board = chess.Board()
+        self.start_fen = None # FEN of the position the game started from, None for the standard one
         self.moves_history = [] # To store actual moves played
+        self._move_codes = array('H') # moves_history packed 16 bits per move (see game.move_codec)
+        # Legal moves of the current position grouped by from-square, with the position key they belong to
+        self._legal_moves_by_square = None
+        self._legal_moves_key = None
+        # Occurrences of each position key in the game so far, for repetition detection without rescanning the move stack
+        self._position_counts = {}
+        self._status = None
+        self._status_key = None
+        self._rebuild_position_counts()
+        # PGN is built incrementally: SAN is appended as each move is made, headers are kept apart
+        self.pgn_headers = self._default_pgn_headers()
+        self._san_history = []
+        self._movetext_lines = [] # Completed (wrapped) movetext lines
+        self._movetext_line = ""  # Movetext line being filled
+        self._movetext_marks = [] # Movetext state before each move, so undo can truncate it
+        self._redo_moves = [] # Undone moves, most recently undone last
+        # (ply, board copy without move stack) every SNAPSHOT_INTERVAL plies, for get_board_at_ply()
+        self._snapshots = deque(maxlen=SNAPSHOT_RING_SIZE)
 
-    def reset_game(self):
-        """Resets the board to the initial chess position."""
-        self.board.reset()
+    def reset_game(self, fen=None):
+        """Resets the board to the initial chess position, or to the position given as a FEN string."""
+        if fen is None:
+            self.board.reset()
+        else:
+            self.board.set_fen(fen)
+        self.start_fen = None if self.board.fen() == chess.STARTING_FEN else self.board.fen()
         self.moves_history = []
+        self._move_codes = array('H')
+        self._invalidate_legal_moves()
+        self._rebuild_position_counts()
+        self.pgn_headers = self._default_pgn_headers()
+        if fen is not None and self.board.fen() != chess.STARTING_FEN:
+            self.pgn_headers["FEN"] = self.board.fen()
+            self.pgn_headers["SetUp"] = "1"
+        self._san_history = []
+        self._movetext_lines = []
+        self._movetext_line = ""
+        self._movetext_marks = []
+        self._redo_moves = []
+        self._snapshots.clear()
+
+    def _invalidate_legal_moves(self):
+        """Drops the cached legal moves; called whenever the position changes."""
+        self._legal_moves_by_square = None
+        self._legal_moves_key = None
+
+    def _get_legal_moves_by_square(self):
+        """
+        Returns the legal moves of the current position as a dict {from_square: [moves]}.
+        Move generation runs once per position; the ply/position key guards
+        against the board having been changed behind the manager's back.
+        """
+        key = (self.board.ply(), self.board._transposition_key())
+        if self._legal_moves_by_square is None or self._legal_moves_key != key:
+            moves_by_square = {}
+            for move in self.board.legal_moves:
+                moves_by_square.setdefault(move.from_square, []).append(move)
+            self._legal_moves_by_square = moves_by_square
+            self._legal_moves_key = key
+        return self._legal_moves_by_square
+
+    def _rebuild_position_counts(self):
+        """Recounts position occurrences by replaying the board's move stack (O(n), only on reset or resync)."""
+        replay_board = self.board.root()
+        counts = {replay_board._transposition_key(): 1}
+        for move in self.board.move_stack:
+            replay_board.push(move)
+            key = replay_board._transposition_key()
+            counts[key] = counts.get(key, 0) + 1
+        self._position_counts = counts
+        self._update_status()
+
+    def _update_status(self):
+        """
+        Computes the termination status of the current position. Mirrors
+        board.is_game_over() (checkmate, stalemate, insufficient material,
+        fivefold repetition, 75-move rule), using the cached legal moves
+        and the position counter instead of scanning the move stack.
+        """
+        board = self.board
+        key = board._transposition_key()
+        has_legal_moves = bool(self._get_legal_moves_by_square())
+
+        if not has_legal_moves and board.is_check():
+            status = GameStatus(True, 'black' if board.turn == chess.WHITE else 'white', 'checkmate')
+        elif not has_legal_moves:
+            status = GameStatus(True, 'draw', 'stalemate')
+        elif board.is_insufficient_material():
+            status = GameStatus(True, 'draw', 'insufficient material')
+        elif self._position_counts.get(key, 0) >= 5:
+            status = GameStatus(True, 'draw', '75-move rule') # 5-fold repetition implies 75-move rule
+        elif board.halfmove_clock >= 150:
+            status = GameStatus(True, 'draw', '75-move rule')
+        else:
+            status = GameStatus()
+        self._status = status
+        self._status_key = (board.ply(), key)
+
+    def get_game_status(self):
+        """Returns the cached GameStatus of the current position."""
+        if self._status_key != (self.board.ply(), self.board._transposition_key()):
+            # The board was changed without going through this manager: resynchronize
+            self._rebuild_position_counts()
+        return self._status
+
+    def is_legal_move(self, move):
+        """Checks a chess.Move against the cached legal moves of the current position."""
+        return move in self._get_legal_moves_by_square().get(move.from_square, ())
 
     def make_move(self, uci_move_str):
         """
@@ -22,7 +150,7 @@ class ChessGameManager:
         """
         try:
             move = chess.Move.from_uci(uci_move_str)
-            if move in self.board.legal_moves:
+            if self.is_legal_move(move):
                 # Handle promotions if the move is a pawn promotion and 'promotion' field is missing
                 # For human input, you might need a dialog to ask for promotion piece
                 # For engine input, UCI move string usually includes promotion (e.g., 'e7e8q')
@@ -35,8 +163,8 @@ class ChessGameManager:
                     print("Warning: Promotion move without specified promotion piece. Defaulting to Queen.")
                     move.promotion = chess.QUEEN # Default to Queen for simplicity
                 
-                self.board.push(move)
-                self.moves_history.append(move) # Store the actual move object
+                self._push_move(move)
+                self._redo_moves = [] # A new move starts a new line: nothing left to redo
                 return True
             else:
                 print(f"Illegal move attempted: {uci_move_str}")
@@ -45,6 +173,87 @@ class ChessGameManager:
             print(f"Invalid UCI move string: {uci_move_str}")
             return False
 
+    def _push_move(self, move):
+        """Plays a legal move and updates history, caches, PGN and snapshots incrementally."""
+        self._movetext_marks.append((len(self._movetext_lines), self._movetext_line))
+        self._append_san(move) # SAN needs the position before the move
+        self.board.push(move)
+        self.moves_history.append(move) # Store the actual move object
+        self._move_codes.append(encode_move(move))
+        self._invalidate_legal_moves()
+        key = self.board._transposition_key()
+        self._position_counts[key] = self._position_counts.get(key, 0) + 1
+        self._update_status()
+        ply = len(self.moves_history)
+        if ply % SNAPSHOT_INTERVAL == 0:
+            self._snapshots.append((ply, self.board.copy(stack=False)))
+
+    def undo_move(self):
+        """
+        Takes back the last move. The move can be replayed with redo_move()
+        until a different move is made. Returns the undone chess.Move, or None
+        if there is nothing to undo.
+        """
+        if not self.moves_history:
+            return None
+        key = self.board._transposition_key()
+        count = self._position_counts.get(key, 0) - 1
+        if count > 0:
+            self._position_counts[key] = count
+        else:
+            self._position_counts.pop(key, None)
+
+        ply = len(self.moves_history)
+        if self._snapshots and self._snapshots[-1][0] == ply:
+            self._snapshots.pop()
+        move = self.board.pop()
+        self.moves_history.pop()
+        self._move_codes.pop()
+        self._san_history.pop()
+        lines_count, self._movetext_line = self._movetext_marks.pop()
+        del self._movetext_lines[lines_count:]
+        self._invalidate_legal_moves()
+        self._update_status()
+        self._redo_moves.append(move)
+        return move
+
+    def redo_move(self):
+        """Replays the last undone move. Returns it, or None if there is nothing to redo."""
+        if not self._redo_moves:
+            return None
+        move = self._redo_moves.pop()
+        self._push_move(move)
+        return move
+
+    def can_undo(self):
+        """Returns True if there is a move to take back."""
+        return bool(self.moves_history)
+
+    def can_redo(self):
+        """Returns True if there is an undone move to replay."""
+        return bool(self._redo_moves)
+
+    def get_board_at_ply(self, ply):
+        """
+        Returns a new board with the position after the first `ply` moves of the game
+        (0 is the initial position), e.g. for game review. Starts from the closest
+        snapshot, so at most SNAPSHOT_INTERVAL - 1 moves are replayed while the
+        snapshot ring still covers that part of the game. The returned board's move
+        stack only holds the replayed moves. Returns None if ply is out of range.
+        """
+        if not 0 <= ply <= len(self.moves_history):
+            return None
+        start_ply, board = 0, None
+        for snapshot_ply, snapshot in reversed(self._snapshots):
+            if snapshot_ply <= ply:
+                start_ply, board = snapshot_ply, snapshot.copy(stack=False)
+                break
+        if board is None:
+            board = self.board.root()
+        for move in self.moves_history[start_ply:ply]:
+            board.push(move)
+        return board
+
     def get_board_fen(self):
         """Returns the current board state in FEN format."""
         return self.board.fen()
@@ -58,15 +267,11 @@ class ChessGameManager:
         Returns a list of legal destination squares (chess.Square integers)
         for a piece on the given square.
         """
-        moves = []
-        for move in self.board.legal_moves:
-            if move.from_square == square:
-                moves.append(move.to_square)
-        return moves
+        return [move.to_square for move in self._get_legal_moves_by_square().get(square, ())]
 
     def is_game_over(self):
         """Checks if the current game is over (checkmate, stalemate, draw, etc.)."""
-        return self.board.is_game_over()
+        return self.get_game_status().is_over
 
     def get_game_result(self):
         """
@@ -75,47 +280,70 @@ class ChessGameManager:
         Winner: 'white', 'black', 'draw'
         Reason: 'checkmate', 'stalemate', 'insufficient material', '50-move rule', '75-move rule', 'repetition', 'resignation'
         """
-        if not self.board.is_game_over():
+        status = self.get_game_status()
+        if not status.is_over:
             return None, None
-        
-        result_string = self.board.result(claim_draw=True) # e.g., '1-0', '0-1', '1/2-1/2'
-        
-        winner = None
-        if result_string == '1-0':
-            winner = 'white'
-        elif result_string == '0-1':
-            winner = 'black'
-        elif result_string == '1/2-1/2':
-            winner = 'draw'
-
-        reason = None
-        if self.board.is_checkmate():
-            reason = 'checkmate'
-        elif self.board.is_stalemate():
-            reason = 'stalemate'
-        elif self.board.is_insufficient_material():
-            reason = 'insufficient material'
-        elif self.board.is_fivefold_repetition():
-            reason = '75-move rule' # 5-fold repetition implies 75-move rule
-        elif self.board.is_seventyfive_moves():
-            reason = '75-move rule'
-        elif self.board.is_fifty_moves():
-            reason = '50-move rule'
-        elif self.board.is_fivefold_repetition(): # 5-fold repetition is technically part of 75-move rule.
-            reason = 'repetition'
-        elif self.board.is_repetition(): # 3-fold repetition, claimable draw
-            reason = 'repetition'
         # Add a reason for resignation if you implement a resign button
-        
-        return winner, reason
+        return status.winner, status.reason
+
+    @staticmethod
+    def _default_pgn_headers():
+        """The PGN Seven Tag Roster with unknown values, as chess.pgn.Game() creates it."""
+        return {"Event": "?", "Site": "?", "Date": "????.??.??", "Round": "?",
+                "White": "?", "Black": "?", "Result": "*"}
+
+    def _append_san(self, move):
+        """Appends a move (not yet pushed) to the movetext, numbering and wrapping like chess.pgn.StringExporter."""
+        san = self.board.san(move)
+        self._san_history.append(san)
+        if self.board.turn == chess.WHITE:
+            self._append_movetext_token(f"{self.board.fullmove_number}. ")
+        elif len(self._san_history) == 1:
+            self._append_movetext_token(f"{self.board.fullmove_number}... ")
+        self._append_movetext_token(san + " ")
+
+    def _append_movetext_token(self, token):
+        if PGN_COLUMNS - len(self._movetext_line) < len(token):
+            if self._movetext_line:
+                self._movetext_lines.append(self._movetext_line.rstrip())
+            self._movetext_line = ""
+        self._movetext_line += token
 
     def get_pgn(self):
-        """Returns the game history in PGN format."""
-        game = chess.pgn.Game.from_board(chess.Board())
-        for move in self.moves_history:
-            game.add_variation(move)
-        exporter = chess.pgn.StringExporter(headers=True, variations=True, comments=True)
-        return game.accept(exporter)
+        """
+        Returns the game history in PGN format. The movetext is kept up to date
+        as moves are made, so exporting is a string join with no game replay.
+        The Result tag follows the game status unless it was set in pgn_headers.
+        """
+        headers = dict(self.pgn_headers)
+        if headers.get("Result", "*") == "*":
+            headers["Result"] = RESULT_STRINGS.get(self.get_game_status().winner, "*")
+
+        lines = [f'[{name} "{value}"]' for name, value in headers.items()]
+        lines.append("")
+        lines.extend(self._movetext_lines)
+
+        result_token = headers["Result"] + " "
+        last_line = self._movetext_line
+        if PGN_COLUMNS - len(last_line) < len(result_token):
+            if last_line:
+                lines.append(last_line.rstrip())
+            last_line = ""
+        lines.append((last_line + result_token).rstrip())
+        return "\n".join(lines).rstrip()
+
+    def get_encoded_moves(self):
+        """Returns the moves played as a compact bytes blob (2 bytes per move), e.g. for DB storage."""
+        return codes_to_bytes(self._move_codes)
+
+    def load_encoded_moves(self, blob, start_fen=None):
+        """
+        Resets the game to start_fen (the standard position if None), i.e. the game's
+        start_fen when the blob was saved, and replays the moves of a blob from
+        get_encoded_moves(). Returns True if every move was legal and played.
+        """
+        self.reset_game(start_fen)
+        return all(self.make_move(uci) for uci in decode_moves_uci(blob))
 
     def get_current_turn_color(self):
         """Returns the color of the current player to move."""
@@ -0,0 +1,84 @@
+# game/move_codec.py
+import sys
+from array import array
+import chess
+import numpy as np
+
+# A move is packed into 16 bits: bits 0-5 from-square, bits 6-11 to-square,
+# bits 12-15 promotion piece type (0 = none, chess.KNIGHT .. chess.QUEEN).
+# Move lists are stored as little-endian arrays of these codes, which the decoders
+# read as a numpy view of the blob (no copy) and split with bit masks.
+
+_FROM_TO_UCI = [chess.SQUARE_NAMES[code & 63] + chess.SQUARE_NAMES[code >> 6] for code in range(4096)]
+_PROMOTION_SUFFIX = ["", "", "n", "b", "r", "q", "", ""] + [""] * 8 # Indexed by promotion piece type
+_NULL_MOVE_CODE = 0 # Move.null() is a1a1, which no real move uses
+_CODE_DTYPE = np.dtype('<u2')
+_uci_table = None # UCI string of every 16-bit code, built on first use
+
+def encode_move(move: chess.Move) -> int:
+    """Packs a chess.Move into a 16-bit integer."""
+    return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+def decode_move(code: int) -> chess.Move:
+    """Unpacks a 16-bit integer produced by encode_move() into a chess.Move."""
+    if code == _NULL_MOVE_CODE:
+        return chess.Move.null()
+    return chess.Move(code & 63, (code >> 6) & 63, (code >> 12) or None)
+
+def encode_moves(moves) -> bytes:
+    """Encodes an iterable of chess.Move as a compact bytes blob (2 bytes per move)."""
+    return codes_to_bytes(array('H', [encode_move(move) for move in moves]))
+
+def codes_to_bytes(codes: array) -> bytes:
+    """Serializes an array('H') of move codes as little-endian bytes."""
+    if sys.byteorder == 'big':
+        codes = array('H', codes)
+        codes.byteswap()
+    return codes.tobytes()
+
+def bytes_to_codes(blob: bytes) -> array:
+    """Deserializes a blob written by codes_to_bytes()/encode_moves() into an array('H')."""
+    codes = array('H')
+    codes.frombytes(blob or b"")
+    if sys.byteorder == 'big':
+        codes.byteswap()
+    return codes
+
+def codes_view(blob: bytes) -> np.ndarray:
+    """The move codes of a blob as a read-only numpy array sharing the blob's memory."""
+    return np.frombuffer(blob or b"", dtype=_CODE_DTYPE)
+
+def decode_moves(blob: bytes) -> list:
+    """Decodes a blob into a list of chess.Move."""
+    codes = codes_view(blob)
+    from_squares = (codes & 63).tolist()
+    to_squares = ((codes >> 6) & 63).tolist()
+    promotions = (codes >> 12).tolist()
+    return [chess.Move(from_square, to_square, promotion or None) if code else chess.Move.null()
+            for code, from_square, to_square, promotion in zip(codes.tolist(), from_squares, to_squares, promotions)]
+
+def decode_moves_uci(blob: bytes) -> list:
+    """Decodes a blob straight into UCI strings with one table lookup for all codes (no chess.Move objects)."""
+    global _uci_table
+    if _uci_table is None:
+        _uci_table = np.array([_FROM_TO_UCI[code & 4095] + _PROMOTION_SUFFIX[code >> 12] for code in range(65536)],
+                              dtype=object)
+        _uci_table[_NULL_MOVE_CODE] = "0000"
+    return _uci_table[codes_view(blob)].tolist()
+
+if __name__ == '__main__':
+    # Example Usage / Simple Test:
+    moves = [chess.Move.from_uci(uci) for uci in ["e2e4", "e7e5", "g1f3", "a7a8q", "b2b1n"]]
+    blob = encode_moves(moves)
+    print(f"{len(moves)} moves encoded in {len(blob)} bytes: {blob.hex()}")
+    print(f"Decoded moves: {decode_moves(blob)}")
+    print(f"Decoded UCI: {decode_moves_uci(blob)}")
+    assert decode_moves(blob) == moves
+    assert decode_moves_uci(blob) == [move.uci() for move in moves]
+
+    import time
+    long_blob = blob * 200_000 # A million moves
+    for decoder in (decode_moves, decode_moves_uci):
+        start = time.perf_counter()
+        decoded = decoder(long_blob)
+        print(f"{decoder.__name__}: {len(decoded)} moves in {time.perf_counter() - start:.3f}s")
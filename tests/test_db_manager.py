@@ -0,0 +1,33 @@
+# tests/test_db_manager.py
+import pytest
+from database.db_manager import DBManager
+
+@pytest.fixture
+def db(tmp_path):
+    db = DBManager(str(tmp_path / "games.db"))
+    yield db
+    db.close()
+
+
+def _game(number, tournament_id=None):
+    return {'start_time': "2024-01-01T00:00:00", 'end_time': "2024-01-01T01:00:00", 'winner': 'white',
+            'reason': 'checkmate', 'pgn': f"Game {number}", 'white_player_type': 'engine',
+            'black_player_type': 'engine', 'white_player_name': "A", 'black_player_name': "B",
+            'tournament_id': tournament_id}
+
+
+def test_batched_games_get_the_ids_sqlite_assigns(db):
+    db.add_engine("A", "1.0")
+    db.add_engine("B", "1.0")
+    tournament_id = db.save_tournament({'name': "Batch", 'start_date': "2024-01-01", 'rounds': 1,
+                                        'status': 'ongoing', 'config': {}})
+    first = db.save_game(_game(0))
+    db.cursor.execute("DELETE FROM games WHERE game_id = ?", (first,)) # The next IDs must not reuse it
+    db.conn.commit()
+    with db.result_batch() as batch:
+        for number in range(1, 4):
+            batch.add_game(_game(number, tournament_id), tournament_game={'round_number': 1, 'result': 'white_win'})
+    assert first not in batch.game_ids
+    db.cursor.execute("SELECT game_id, pgn FROM games ORDER BY game_id")
+    assert db.cursor.fetchall() == [(game_id, f"Game {number}") for number, game_id in enumerate(batch.game_ids, 1)]
+    assert [row['game_id'] for row in db.get_tournament_games(tournament_id)] == batch.game_ids
@@ -0,0 +1,72 @@
+# tests/test_distributed.py
+import json
+import socket
+import pytest
+from tournament.distributed import GameCoordinator
+
+WHITE = {"name": "CapturePreferringEngine", "parameters": {"type": "internal", "class": "CapturePreferringEngine"}}
+BLACK = {"name": "RandomMover", "parameters": {"type": "internal", "class": "RandomMover"}}
+
+@pytest.fixture
+def coordinator():
+    coordinator = GameCoordinator(port=0, token="secret")
+    coordinator.start()
+    yield coordinator
+    coordinator.shutdown()
+
+
+def _connect(coordinator, token):
+    sock = socket.create_connection((coordinator.host, coordinator.port), timeout=5)
+    reader = sock.makefile("r", encoding="utf-8")
+    _send(sock, {"type": "hello", "name": "test", "token": token})
+    return sock, reader
+
+
+def _send(sock, message):
+    sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+
+def _request(sock, reader, message):
+    _send(sock, message)
+    return reader.readline()
+
+
+def test_coordinator_listens_on_localhost_by_default():
+    assert GameCoordinator().host == "127.0.0.1"
+
+
+def test_connection_without_the_token_is_closed(coordinator):
+    coordinator.submit(WHITE, BLACK)
+    sock, reader = _connect(coordinator, "wrong")
+    try:
+        assert _request(sock, reader, {"type": "get_job"}) == "" # Closed, no job handed out
+    finally:
+        sock.close()
+
+
+def test_result_from_a_worker_not_assigned_the_job_is_ignored(coordinator):
+    job_id = coordinator.submit(WHITE, BLACK)
+    sock, reader = _connect(coordinator, "secret")
+    try:
+        _request(sock, reader, {"type": "get_job"})
+        other, other_reader = _connect(coordinator, "secret")
+        try:
+            assert json.loads(_request(other, other_reader, {"type": "get_job"}))["type"] == "no_job"
+            _send(other, {"type": "error", "job_id": job_id, "message": "forged"})
+        finally:
+            other.close()
+        with pytest.raises(TimeoutError):
+            coordinator.wait_for_result(job_id, timeout=0.5)
+    finally:
+        sock.close()
+
+
+def test_timed_out_job_is_withdrawn(coordinator):
+    job_id = coordinator.submit(WHITE, BLACK)
+    with pytest.raises(TimeoutError):
+        coordinator.wait_for_result(job_id, timeout=0.1)
+    sock, reader = _connect(coordinator, "secret")
+    try:
+        assert json.loads(_request(sock, reader, {"type": "get_job"}))["type"] == "no_job"
+    finally:
+        sock.close()
@@ -0,0 +1,21 @@
+# tests/test_match_runner.py
+import random
+from engine.RandomMover import RandomMover
+from engine.CapturePreferringEngine import CapturePreferringEngine
+from tournament.match_runner import run_game, AdjudicationRules
+
+def test_adjudication_is_off_by_default():
+    rules = AdjudicationRules()
+    assert rules.mate_search_nodes == 0
+    assert rules.resign_score is None and rules.draw_score is None
+    for _ in range(5):
+        record = run_game(CapturePreferringEngine("Capture"), RandomMover("Random"))
+        assert "adjudicated" not in record.reason
+
+
+def test_mate_adjudication_when_asked_for():
+    random.seed(0) # RandomMover's moves
+    rules = AdjudicationRules(mate_search_nodes=500)
+    reasons = {run_game(CapturePreferringEngine("Capture"), RandomMover("Random"), adjudication=rules).reason
+               for _ in range(5)}
+    assert 'forced mate (adjudicated)' in reasons
@@ -0,0 +1,13 @@
+# tests/test_material_search_engine.py
+import time
+import chess
+from engine.MaterialEvaluator import MaterialSearchEngine
+from engine.search_stats import SearchStats
+
+def test_search_without_time_limit_ignores_an_earlier_deadline():
+    engine = MaterialSearchEngine(depth=3, think_time=None)
+    engine.searcher.stats = SearchStats()
+    engine.searcher.deadline = time.perf_counter() - 1.0 # Left over from an earlier timed search
+    engine.set_board(chess.Board())
+    assert engine.make_move() is not None
+    assert [iteration["depth"] for iteration in engine.searcher.stats.iterations] == [1, 2, 3]
@@ -0,0 +1,45 @@
+# tests/test_move_codec.py
+import chess
+from database.db_manager import DBManager
+from engine.RandomMover import RandomMover
+from game.chess_game_manager import ChessGameManager
+from game.move_codec import encode_moves, decode_moves, decode_moves_uci
+from tournament.match_runner import run_game
+
+FEN = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
+
+def test_decoders_round_trip():
+    moves = [chess.Move.from_uci(uci) for uci in ["e2e4", "e7e5", "g1f3", "a7a8q", "b2b1n", "h7h8r"]]
+    moves.append(chess.Move.null())
+    blob = encode_moves(moves)
+    assert len(blob) == 2 * len(moves)
+    assert decode_moves(blob) == moves
+    assert decode_moves_uci(blob) == [move.uci() for move in moves]
+    assert decode_moves(b"") == [] and decode_moves_uci(None) == []
+
+
+def test_game_from_a_fen_replays_from_its_start_position(tmp_path):
+    record = run_game(RandomMover("A"), RandomMover("B"), start_fen=FEN, opening_moves=["f1c4"])
+    db = DBManager(str(tmp_path / "games.db"))
+    try:
+        game_id = db.save_game(record.to_game_data())
+        start_fen, moves = db.get_game_moves(game_id)
+    finally:
+        db.close()
+    assert start_fen == FEN
+    assert moves[0] == chess.Move.from_uci("f1c4")
+
+    replay = ChessGameManager()
+    assert replay.load_encoded_moves(record.moves_blob, start_fen)
+    expected = chess.Board(FEN)
+    for move in moves:
+        expected.push(move)
+    assert replay.get_board_object().fen() == expected.fen()
+
+
+def test_standard_start_is_stored_as_none():
+    manager = ChessGameManager()
+    manager.reset_game(chess.STARTING_FEN)
+    assert manager.start_fen is None
+    manager.reset_game(FEN)
+    assert manager.start_fen == FEN
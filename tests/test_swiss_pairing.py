@@ -0,0 +1,84 @@
+# tests/test_swiss_pairing.py
+import random
+import time
+import pytest
+from tournament.swiss_pairing import pair_round
+
+def _player(name, rating, points=0.0, opponents=(), colors=()):
+    return {'name': name, 'points': points, 'rating': rating, 'opponents': list(opponents),
+            'colors': list(colors), 'byes': 0}
+
+
+def _repeat_free_pairing_exists(players):
+    """Exhaustive search for a perfect matching without a repeat pairing (small fields only)."""
+    if not players:
+        return True
+    first, rest = players[0], players[1:]
+    for index, partner in enumerate(rest):
+        if partner['name'] not in first['opponents'] and \
+           _repeat_free_pairing_exists(rest[:index] + rest[index + 1:]):
+            return True
+    return False
+
+
+def _play_round(pairings, by_name, rng):
+    """Records random results of a round's pairings."""
+    for white, black in pairings:
+        score = 1.0 if rng.random() < 0.5 else rng.choice((0.0, 0.5))
+        by_name[white]['points'] += score
+        by_name[black]['points'] += 1.0 - score
+        by_name[white]['opponents'].append(black)
+        by_name[black]['opponents'].append(white)
+        by_name[white]['colors'].append('w')
+        by_name[black]['colors'].append('b')
+
+
+@pytest.mark.parametrize("block_size", [2, 4, 32])
+def test_top_player_meets_only_unplayed_opponent_at_bottom_of_pairing_order(block_size):
+    # Equal scores: pairing order is P0, P4, P1, P5, P2, P6, P3, P7. P0 has met everyone but P7,
+    # the last player in that order, so the only repeat-free pairing puts P0 against P7. With
+    # small blocks the matching has to widen across blocks to find it
+    players = [_player(f"P{i}", 2000 - 10 * i) for i in range(8)]
+    players[0]['opponents'] = [f"P{i}" for i in range(1, 7)]
+    for i in range(1, 7):
+        players[i]['opponents'] = ["P0"]
+    pairings, bye = pair_round(players, block_size=block_size, rng=random.Random(0))
+    assert bye is None
+    assert {"P0", "P7"} in [set(pair) for pair in pairings]
+
+
+@pytest.mark.parametrize("block_size", [4, 32])
+def test_no_repeat_pairing_when_one_is_avoidable(block_size):
+    for num_players, num_rounds in ((10, 9), (8, 7), (12, 7), (16, 9)):
+        for seed in range(10):
+            rng = random.Random(seed)
+            players = [_player(f"E{i}", rng.randint(1000, 2800)) for i in range(num_players)]
+            by_name = {p['name']: p for p in players}
+            for _ in range(num_rounds):
+                pairings, bye = pair_round(players, block_size=block_size, rng=rng)
+                repeats = sum(by_name[white]['opponents'].count(black) for white, black in pairings)
+                if repeats:
+                    assert not _repeat_free_pairing_exists([p for p in players if p['name'] != bye]), \
+                        f"{num_players} players, seed {seed}: avoidable repeat pairing"
+                _play_round(pairings, by_name, rng)
+
+
+def test_large_field_is_paired_in_well_under_a_second():
+    rng = random.Random(3)
+    players = [_player(f"E{i}", rng.randint(1000, 2800)) for i in range(1000)]
+    by_name = {p['name']: p for p in players}
+    for round_number in range(1, 10):
+        start = time.perf_counter()
+        pairings, bye = pair_round(players, rng=rng)
+        elapsed = time.perf_counter() - start
+        assert elapsed < 1.0, f"Round {round_number} of 1000 players paired in {elapsed:.2f}s"
+        assert bye is None and len(pairings) == 500
+        assert not any(by_name[white]['opponents'].count(black) for white, black in pairings)
+        _play_round(pairings, by_name, rng)
+
+
+def test_every_player_paired_once():
+    players = [_player(f"E{i}", 1500 + i) for i in range(9)]
+    pairings, bye = pair_round(players, rng=random.Random(1))
+    names = [name for pair in pairings for name in pair] + [bye]
+    assert sorted(names) == sorted(p['name'] for p in players)
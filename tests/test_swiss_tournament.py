@@ -0,0 +1,113 @@
+# tests/test_swiss_tournament.py
+import sqlite3
+import pytest
+from database.db_manager import DBManager
+from engine.simple_ai_engine import SimpleAIEngine
+from tournament.match_runner import run_game
+from tournament.swiss_tournament import SwissTournament
+
+ENGINE_NAMES = ["Alpha", "Bravo", "Charlie", "Delta"]
+
+class _FailingCoordinator:
+    """Stands in for a GameCoordinator whose workers fail every other job."""
+    def __init__(self):
+        self.jobs = {}
+
+    def submit(self, white_data, black_data, **options):
+        job_id = len(self.jobs) + 1
+        self.jobs[job_id] = (white_data['name'], black_data['name'], options)
+        return job_id
+
+    def wait_for_result(self, job_id, timeout=None):
+        if job_id % 2:
+            raise RuntimeError(f"worker failed job {job_id}")
+        white, black, options = self.jobs[job_id]
+        return run_game(SimpleAIEngine(white, delay_seconds=0), SimpleAIEngine(black, delay_seconds=0), **options)
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DBManager(str(tmp_path / "tournament.db"))
+    for name in ENGINE_NAMES:
+        db.add_engine(name, "1.0", None, {})
+    yield db
+    db.close()
+
+
+def _engines():
+    return [SimpleAIEngine(name=name, delay_seconds=0) for name in ENGINE_NAMES]
+
+
+def test_games_failed_by_workers_are_replayed(db):
+    tournament = SwissTournament("Worker failures", _engines(), 2, db, coordinator=_FailingCoordinator())
+    tournament.start_tournament()
+    while tournament.run_next_round():
+        pass
+    assert len(db.get_tournament_games(tournament.tournament_id)) == 4 # 2 rounds of 2 games
+    assert all(scores["games_played"] == 2 for scores in tournament.engine_scores.values())
+
+
+def _failing_writes(db, failures):
+    """Makes the next `failures` result writes fail as on a database error."""
+    write_games = db._write_games
+    remaining = [failures]
+    def write(entries, checkpoint=None):
+        if remaining[0] > 0:
+            remaining[0] -= 1
+            return None
+        return write_games(entries, checkpoint)
+    return write
+
+
+def test_failed_result_save_is_retried(db, monkeypatch):
+    monkeypatch.setattr("tournament.swiss_tournament.RESULT_SAVE_RETRY_DELAY", 0)
+    monkeypatch.setattr(db, "_write_games", _failing_writes(db, 2))
+    tournament = SwissTournament("Save retries", _engines(), 1, db, result_batch_size=2)
+    tournament.start_tournament()
+    assert len(db.get_tournament_games(tournament.tournament_id)) == 2
+    assert db.get_tournament_checkpoint(tournament.tournament_id)['state']["games_recorded"] == 2
+
+
+def test_tournament_stops_when_results_cannot_be_saved(db, monkeypatch):
+    monkeypatch.setattr("tournament.swiss_tournament.RESULT_SAVE_RETRY_DELAY", 0)
+    monkeypatch.setattr(db, "_write_games", _failing_writes(db, 1000))
+    tournament = SwissTournament("Save failures", _engines(), 2, db, result_batch_size=2)
+    with pytest.raises(RuntimeError):
+        tournament.start_tournament()
+    assert not tournament.is_tournament_running
+    assert len(tournament._results) == 2 # Still buffered
+    assert db.get_tournament_games(tournament.tournament_id) == []
+
+    monkeypatch.undo()
+    resumed = SwissTournament("Save failures", _engines(), 2, db, result_batch_size=2)
+    more_rounds = resumed.resume_tournament(tournament.tournament_id)
+    while more_rounds:
+        more_rounds = resumed.run_next_round()
+    assert len(db.get_tournament_games(tournament.tournament_id)) == 4
+    assert all(scores["games_played"] == 2 for scores in resumed.engine_scores.values())
+
+
+def test_glicko_period_is_rated_once_when_its_save_fails(db, monkeypatch):
+    def fail(*args):
+        raise sqlite3.OperationalError("disk I/O error")
+    update_glicko_ratings = db.update_glicko_ratings
+    def update_failing_at_checkpoint(*args):
+        # The ratings are written, then the checkpoint of the same transaction fails
+        with monkeypatch.context() as patch:
+            patch.setattr(db, "_write_tournament_checkpoint", fail)
+            return update_glicko_ratings(*args)
+    monkeypatch.setattr(db, "update_glicko_ratings", update_failing_at_checkpoint)
+    tournament = SwissTournament("Glicko failures", _engines(), 2, db, rating_system="glicko2")
+    with pytest.raises(RuntimeError):
+        tournament.start_tournament()
+    assert not tournament.is_tournament_running
+    engine_ids = [db.get_engine_id(name) for name in ENGINE_NAMES]
+    assert all(db.get_rating_history(engine_id, 'glicko2') == [] for engine_id in engine_ids) # Rolled back
+
+    monkeypatch.undo()
+    resumed = SwissTournament("Glicko failures", _engines(), 2, db, rating_system="glicko2")
+    more_rounds = resumed.resume_tournament(tournament.tournament_id)
+    while more_rounds:
+        more_rounds = resumed.run_next_round()
+    # One rating change per engine and round
+    assert all(len(db.get_rating_history(engine_id, 'glicko2')) == 2 for engine_id in engine_ids)
@@ -0,0 +1,397 @@
+# tournament/blossom.py
+
+# Maximum-weight matching in general graphs with Edmonds' blossom algorithm and a primal-dual
+# method, O(n^3). Follows Galil, "Efficient algorithms for finding maximum matching in graphs"
+# (1986) and the well-known public-domain implementation of Joris van Rantwijk. With integer
+# weights only integer arithmetic is used, so the result is exact.
+#
+# Vertices are 0 .. n-1. An edge endpoint p is 2*k (first vertex of edge k) or 2*k+1 (second);
+# p ^ 1 is the other end. Labels: 1 = S (outer), 2 = T (inner), 0 = free; bit 4 marks
+# blossoms visited by _scan_blossom.
+
+def max_weight_matching(edges, max_cardinality: bool = False) -> list:
+    """
+    Computes a maximum-weight matching of an undirected graph.
+
+    Args:
+        edges: List of (i, j, weight) with vertex indexes i != j and integer weights.
+        max_cardinality: Only consider matchings with the most edges (a perfect
+                         matching if one exists), and among them the heaviest.
+
+    Returns:
+        mate: mate[v] is the vertex matched to v, or -1 if v is unmatched.
+    """
+    if not edges:
+        return []
+    num_edges = len(edges)
+    n = 1 + max(max(i, j) for i, j, _ in edges)
+    max_weight = max(0, max(weight for _, _, weight in edges))
+
+    endpoint = [edges[p // 2][p % 2] for p in range(2 * num_edges)]
+    neighbour_ends = [[] for _ in range(n)] # Remote endpoints of the edges of each vertex
+    for k, (i, j, _) in enumerate(edges):
+        neighbour_ends[i].append(2 * k + 1)
+        neighbour_ends[j].append(2 * k)
+
+    mate = [-1] * n # Remote endpoint of the matched edge of each vertex
+    label = [0] * (2 * n) # Of top-level blossoms (and of vertices, for T-vertices in a T-blossom)
+    label_end = [-1] * (2 * n) # Endpoint through which the label was reached
+    in_blossom = list(range(n)) # Top-level blossom of each vertex
+    blossom_parent = [-1] * (2 * n)
+    blossom_children = [None] * (2 * n) # Sub-blossoms in cycle order, starting at the base
+    blossom_base = list(range(n)) + [-1] * n
+    blossom_endpoints = [None] * (2 * n) # Endpoints of the edges connecting the sub-blossoms
+    best_edge = [-1] * (2 * n) # Least-slack edge to a different S-blossom (or from a free vertex)
+    blossom_best_edges = [None] * (2 * n)
+    unused_blossoms = list(range(n, 2 * n))
+    dual = [max_weight] * n + [0] * n # Vertex duals u(v), then blossom duals z(b)
+    allowed = [False] * num_edges # Edges with zero slack
+    queue = [] # S-vertices to scan
+
+    def slack(k):
+        i, j, weight = edges[k]
+        return dual[i] + dual[j] - 2 * weight
+
+    def blossom_leaves(b):
+        if b < n:
+            yield b
+        else:
+            for child in blossom_children[b]:
+                if child < n:
+                    yield child
+                else:
+                    yield from blossom_leaves(child)
+
+    def assign_label(w, t, p):
+        b = in_blossom[w]
+        label[w] = label[b] = t
+        label_end[w] = label_end[b] = p
+        best_edge[w] = best_edge[b] = -1
+        if t == 1:
+            queue.extend(blossom_leaves(b))
+        elif t == 2:
+            base = blossom_base[b]
+            assign_label(endpoint[mate[base]], 1, mate[base] ^ 1)
+
+    def scan_blossom(v, w):
+        """Traces back from v and w; returns the base of a new blossom, or -1 for an augmenting path."""
+        path = []
+        base = -1
+        while v != -1 or w != -1:
+            b = in_blossom[v]
+            if label[b] & 4:
+                base = blossom_base[b]
+                break
+            path.append(b)
+            label[b] = 5
+            if label_end[b] == -1:
+                v = -1
+            else:
+                v = endpoint[label_end[b]]
+                b = in_blossom[v]
+                v = endpoint[label_end[b]]
+            if w != -1:
+                v, w = w, v
+        for b in path:
+            label[b] = 1
+        return base
+
+    def add_blossom(base, k):
+        v, w, _ = edges[k]
+        base_blossom, bv, bw = in_blossom[base], in_blossom[v], in_blossom[w]
+        b = unused_blossoms.pop()
+        blossom_base[b] = base
+        blossom_parent[b] = -1
+        blossom_parent[base_blossom] = b
+        blossom_children[b] = path = []
+        blossom_endpoints[b] = ends = []
+        while bv != base_blossom:
+            blossom_parent[bv] = b
+            path.append(bv)
+            ends.append(label_end[bv])
+            v = endpoint[label_end[bv]]
+            bv = in_blossom[v]
+        path.append(base_blossom)
+        path.reverse()
+        ends.reverse()
+        ends.append(2 * k)
+        while bw != base_blossom:
+            blossom_parent[bw] = b
+            path.append(bw)
+            ends.append(label_end[bw] ^ 1)
+            w = endpoint[label_end[bw]]
+            bw = in_blossom[w]
+        label[b] = 1
+        label_end[b] = label_end[base_blossom]
+        dual[b] = 0
+        for v in blossom_leaves(b):
+            if label[in_blossom[v]] == 2:
+                queue.append(v) # T-vertices become S-vertices
+            in_blossom[v] = b
+
+        best_edge_to = [-1] * (2 * n)
+        for bv in path:
+            if blossom_best_edges[bv] is None:
+                edge_lists = [[p // 2 for p in neighbour_ends[v]] for v in blossom_leaves(bv)]
+            else:
+                edge_lists = [blossom_best_edges[bv]]
+            for edge_list in edge_lists:
+                for k in edge_list:
+                    i, j, _ = edges[k]
+                    if in_blossom[j] == b:
+                        i, j = j, i
+                    bj = in_blossom[j]
+                    if bj != b and label[bj] == 1 and (best_edge_to[bj] == -1 or slack(k) < slack(best_edge_to[bj])):
+                        best_edge_to[bj] = k
+            blossom_best_edges[bv] = None
+            best_edge[bv] = -1
+        blossom_best_edges[b] = [k for k in best_edge_to if k != -1]
+        best_edge[b] = -1
+        for k in blossom_best_edges[b]:
+            if best_edge[b] == -1 or slack(k) < slack(best_edge[b]):
+                best_edge[b] = k
+
+    def expand_blossom(b, end_stage):
+        for s in blossom_children[b]:
+            blossom_parent[s] = -1
+            if s < n:
+                in_blossom[s] = s
+            elif end_stage and dual[s] == 0:
+                expand_blossom(s, end_stage)
+            else:
+                for v in blossom_leaves(s):
+                    in_blossom[v] = s
+        if not end_stage and label[b] == 2:
+            # Relabel the sub-blossoms on the even-length path from the entry child to the base
+            entry_child = in_blossom[endpoint[label_end[b] ^ 1]]
+            j = blossom_children[b].index(entry_child)
+            if j & 1:
+                j -= len(blossom_children[b])
+                step, trick = 1, 0
+            else:
+                step, trick = -1, 1
+            p = label_end[b]
+            while j != 0:
+                label[endpoint[p ^ 1]] = 0
+                label[endpoint[blossom_endpoints[b][j - trick] ^ trick ^ 1]] = 0
+                assign_label(endpoint[p ^ 1], 2, p)
+                allowed[blossom_endpoints[b][j - trick] // 2] = True
+                j += step
+                p = blossom_endpoints[b][j - trick] ^ trick
+                allowed[p // 2] = True
+                j += step
+            bv = blossom_children[b][j]
+            label[endpoint[p ^ 1]] = label[bv] = 2
+            label_end[endpoint[p ^ 1]] = label_end[bv] = p
+            best_edge[bv] = -1
+            j += step
+            while blossom_children[b][j] != entry_child:
+                bv = blossom_children[b][j]
+                if label[bv] == 1:
+                    j += step
+                    continue
+                for v in blossom_leaves(bv):
+                    if label[v] != 0:
+                        break
+                if label[v] != 0:
+                    label[v] = 0
+                    label[endpoint[mate[blossom_base[bv]]]] = 0
+                    assign_label(v, 2, label_end[v])
+                j += step
+        label[b] = label_end[b] = -1
+        blossom_children[b] = blossom_endpoints[b] = None
+        blossom_base[b] = -1
+        blossom_best_edges[b] = None
+        best_edge[b] = -1
+        unused_blossoms.append(b)
+
+    def augment_blossom(b, v):
+        """Swaps matched and unmatched edges on the path from v to the base of blossom b."""
+        t = v
+        while blossom_parent[t] != b:
+            t = blossom_parent[t]
+        if t >= n:
+            augment_blossom(t, v)
+        i = j = blossom_children[b].index(t)
+        if i & 1:
+            j -= len(blossom_children[b])
+            step, trick = 1, 0
+        else:
+            step, trick = -1, 1
+        while j != 0:
+            j += step
+            t = blossom_children[b][j]
+            p = blossom_endpoints[b][j - trick] ^ trick
+            if t >= n:
+                augment_blossom(t, endpoint[p])
+            j += step
+            t = blossom_children[b][j]
+            if t >= n:
+                augment_blossom(t, endpoint[p ^ 1])
+            mate[endpoint[p]] = p ^ 1
+            mate[endpoint[p ^ 1]] = p
+        blossom_children[b] = blossom_children[b][i:] + blossom_children[b][:i]
+        blossom_endpoints[b] = blossom_endpoints[b][i:] + blossom_endpoints[b][:i]
+        blossom_base[b] = blossom_base[blossom_children[b][0]]
+
+    def augment_matching(k):
+        v, w, _ = edges[k]
+        for s, p in ((v, 2 * k + 1), (w, 2 * k)):
+            while True:
+                bs = in_blossom[s]
+                if bs >= n:
+                    augment_blossom(bs, s)
+                mate[s] = p
+                if label_end[bs] == -1:
+                    break # Reached a single vertex
+                t = endpoint[label_end[bs]]
+                bt = in_blossom[t]
+                s = endpoint[label_end[bt]]
+                j = endpoint[label_end[bt] ^ 1]
+                if bt >= n:
+                    augment_blossom(bt, j)
+                mate[j] = label_end[bt]
+                p = label_end[bt] ^ 1
+
+    for _ in range(n): # Each stage augments the matching by one edge, or ends the search
+        label[:] = [0] * (2 * n)
+        best_edge[:] = [-1] * (2 * n)
+        blossom_best_edges[n:] = [None] * n
+        allowed[:] = [False] * num_edges
+        queue[:] = []
+        for v in range(n):
+            if mate[v] == -1 and label[in_blossom[v]] == 0:
+                assign_label(v, 1, -1)
+
+        augmented = False
+        while True:
+            while queue and not augmented:
+                v = queue.pop()
+                for p in neighbour_ends[v]:
+                    k = p // 2
+                    w = endpoint[p]
+                    if in_blossom[v] == in_blossom[w]:
+                        continue
+                    if not allowed[k]:
+                        k_slack = slack(k)
+                        if k_slack <= 0:
+                            allowed[k] = True
+                    if allowed[k]:
+                        if label[in_blossom[w]] == 0:
+                            assign_label(w, 2, p ^ 1)
+                        elif label[in_blossom[w]] == 1:
+                            base = scan_blossom(v, w)
+                            if base >= 0:
+                                add_blossom(base, k)
+                            else:
+                                augment_matching(k)
+                                augmented = True
+                                break
+                        elif label[w] == 0:
+                            label[w] = 2 # T-vertex inside a T-blossom
+                            label_end[w] = p ^ 1
+                    elif label[in_blossom[w]] == 1:
+                        b = in_blossom[v]
+                        if best_edge[b] == -1 or k_slack < slack(best_edge[b]):
+                            best_edge[b] = k
+                    elif label[w] == 0:
+                        if best_edge[w] == -1 or k_slack < slack(best_edge[w]):
+                            best_edge[w] = k
+            if augmented:
+                break
+
+            # No augmenting path with the allowed edges: change the duals by the largest possible delta
+            delta_type, delta, delta_edge, delta_blossom = -1, None, None, None
+            if not max_cardinality:
+                delta_type, delta = 1, min(dual[:n])
+            for v in range(n):
+                if label[in_blossom[v]] == 0 and best_edge[v] != -1:
+                    d = slack(best_edge[v])
+                    if delta_type == -1 or d < delta:
+                        delta_type, delta, delta_edge = 2, d, best_edge[v]
+            for b in range(2 * n):
+                if blossom_parent[b] == -1 and label[b] == 1 and best_edge[b] != -1:
+                    d = slack(best_edge[b]) // 2
+                    if delta_type == -1 or d < delta:
+                        delta_type, delta, delta_edge = 3, d, best_edge[b]
+            for b in range(n, 2 * n):
+                if blossom_base[b] >= 0 and blossom_parent[b] == -1 and label[b] == 2 and \
+                   (delta_type == -1 or dual[b] < delta):
+                    delta_type, delta, delta_blossom = 4, dual[b], b
+            if delta_type == -1:
+                # No further improvement possible; max cardinality is reached
+                delta_type, delta = 1, max(0, min(dual[:n]))
+
+            for v in range(n):
+                if label[in_blossom[v]] == 1:
+                    dual[v] -= delta
+                elif label[in_blossom[v]] == 2:
+                    dual[v] += delta
+            for b in range(n, 2 * n):
+                if blossom_base[b] >= 0 and blossom_parent[b] == -1:
+                    if label[b] == 1:
+                        dual[b] += delta
+                    elif label[b] == 2:
+                        dual[b] -= delta
+
+            if delta_type == 1:
+                break # Optimum reached
+            elif delta_type == 2:
+                allowed[delta_edge] = True
+                i, j, _ = edges[delta_edge]
+                if label[in_blossom[i]] == 0:
+                    i, j = j, i
+                queue.append(i)
+            elif delta_type == 3:
+                allowed[delta_edge] = True
+                i, j, _ = edges[delta_edge]
+                queue.append(i)
+            else:
+                expand_blossom(delta_blossom, False)
+
+        if not augmented:
+            break
+        for b in range(n, 2 * n): # S-blossoms with zero dual are expanded at the end of each stage
+            if blossom_parent[b] == -1 and blossom_base[b] >= 0 and label[b] == 1 and dual[b] == 0:
+                expand_blossom(b, True)
+
+    return [endpoint[p] if p >= 0 else -1 for p in mate]
+
+
+if __name__ == '__main__':
+    # Example Usage / Simple Test: against exhaustive search on small random graphs
+    import itertools
+    import random
+    import time
+    rng = random.Random(1)
+
+    def brute_force(n, edges, max_cardinality):
+        best = None
+        for r in range(len(edges) + 1):
+            for subset in itertools.combinations(edges, r):
+                vertices = [v for i, j, _ in subset for v in (i, j)]
+                if len(vertices) != len(set(vertices)):
+                    continue
+                key = (len(subset), sum(w for _, _, w in subset)) if max_cardinality else (sum(w for _, _, w in subset),)
+                best = key if best is None or key > best else best
+        return best
+
+    mismatches = 0
+    for trial in range(300):
+        n = rng.randint(2, 8)
+        edges = [(i, j, rng.randint(-5, 20)) for i in range(n) for j in range(i + 1, n) if rng.random() < 0.6]
+        if not edges:
+            continue
+        for max_cardinality in (False, True):
+            mate = max_weight_matching(edges, max_cardinality)
+            weights = {(i, j): w for i, j, w in edges}
+            chosen = [(v, mate[v]) for v in range(len(mate)) if mate[v] > v]
+            key = (len(chosen), sum(weights[e] for e in chosen)) if max_cardinality else (sum(weights[e] for e in chosen),)
+            mismatches += key != brute_force(n, edges, max_cardinality)
+    print(f"Mismatches against exhaustive search: {mismatches}")
+
+    n = 200
+    edges = [(i, j, rng.randint(0, 1000)) for i in range(n) for j in range(i + 1, n)]
+    start = time.perf_counter()
+    mate = max_weight_matching(edges, max_cardinality=True)
+    print(f"Complete graph of {n} vertices: perfect {all(m >= 0 for m in mate)}, {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,336 @@
+# tournament/distributed.py
+import argparse
+import hmac
+import itertools
+import json
+import os
+import secrets
+import socket
+import threading
+import time
+from collections import deque
+from tournament.match_runner import run_game_from_data, GameRecord, AdjudicationRules
+from game.chess_clock import TimeControl
+
+# Coordinator/worker mode: the coordinator (e.g. a SwissTournament) owns pairings and
+# database writes; workers on any machine connect over TCP, pull game jobs, play them
+# with match_runner and send back GameRecords. Messages are JSON objects, one per line.
+#
+#   worker -> coordinator: hello (name, token), get_job, heartbeat, result (job_id, record), error (job_id, message)
+#   coordinator -> worker: job (job_id, white, black, options), no_job, shutdown
+#
+# Workers run the engine commands the coordinator sends, and the coordinator stores the results
+# workers send, so both sides must be trusted: the coordinator listens on localhost unless given
+# another host, and drops any connection whose hello does not carry its shared token.
+
+DEFAULT_HOST = "127.0.0.1" # Localhost only; "0.0.0.0" accepts workers from other machines
+TOKEN_ENV_VARIABLE = "CHESS_WORKER_TOKEN" # Shared token of workers started without --token
+DEFAULT_PORT = 5555
+HEARTBEAT_INTERVAL = 2.0 # Seconds between worker heartbeats, also sent while a game is being played
+HEARTBEAT_TIMEOUT = 10.0 # A worker silent for this long is considered dead and its job re-queued
+IDLE_POLL_INTERVAL = 0.5 # Seconds an idle worker waits before asking for a job again
+
+def _send_message(sock, message, lock):
+    data = (json.dumps(message) + "\n").encode("utf-8")
+    with lock:
+        sock.sendall(data)
+
+
+class _WorkerConnection:
+    """Coordinator-side state of one connected worker."""
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+        self.name = f"{address[0]}:{address[1]}"
+        self.send_lock = threading.Lock()
+        self.last_seen = time.monotonic()
+        self.job_id = None # Job currently assigned to this worker
+        self.authenticated = False # Set once the worker's hello carried the coordinator's token
+
+
+class GameCoordinator:
+    """
+    Hands out game jobs to remote workers and collects their results.
+
+    Usage:
+        coordinator = GameCoordinator(port=5555, token="...")
+        coordinator.start()
+        job_id = coordinator.submit(white_data, black_data, pgn_headers={...})
+        record = coordinator.wait_for_result(job_id, timeout=600)
+        coordinator.shutdown()
+
+    Workers must send the shared token in their hello message (without a token, one
+    is generated and printed by start()); other connections are closed. Results are
+    only accepted from the worker a job is assigned to.
+
+    Jobs of a worker that disconnects or misses heartbeats for heartbeat_timeout
+    seconds go back to the front of the queue. A late result for a job that
+    was already completed by another worker, or given up on, is ignored.
+    """
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, heartbeat_timeout: float = HEARTBEAT_TIMEOUT,
+                 token: str | None = None):
+        self.host = host
+        self.port = port # 0 picks a free port; the actual port is set by start()
+        self.heartbeat_timeout = heartbeat_timeout
+        self.token = token or secrets.token_urlsafe(16)
+        self._token_generated = token is None
+        self._server = None
+        self._condition = threading.Condition()
+        self._pending = deque() # Jobs waiting for a worker
+        self._jobs = {} # job_id -> job message, until its result arrives
+        self._results = {} # job_id -> GameRecord, or an error message string
+        self._workers = set()
+        self._job_ids = itertools.count(1)
+        self._running = False
+
+    def start(self):
+        """Opens the listening socket and starts accepting workers."""
+        self._server = socket.create_server((self.host, self.port))
+        self.port = self._server.getsockname()[1]
+        self._running = True
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        threading.Thread(target=self._monitor_loop, daemon=True).start()
+        print(f"Game coordinator listening on {self.host}:{self.port}")
+        if self._token_generated:
+            print(f"Start workers with --token {self.token} (or set {TOKEN_ENV_VARIABLE}).")
+
+    def submit(self, white_data: dict, black_data: dict, start_fen=None, opening_moves=(),
+               adjudication: AdjudicationRules | None = None, pgn_headers: dict | None = None,
+               time_control: TimeControl | None = None) -> int:
+        """
+        Queues a game between two engines given as DB records (see engine.engine_factory)
+        and returns its job id. The other arguments are those of match_runner.run_game().
+        """
+        options = {
+            "start_fen": start_fen,
+            "opening_moves": [move if isinstance(move, str) else move.uci() for move in opening_moves],
+            "adjudication": adjudication.to_dict() if adjudication else None,
+            "pgn_headers": pgn_headers,
+            "time_control": time_control.to_dict() if time_control else None,
+        }
+        with self._condition:
+            job_id = next(self._job_ids)
+            job = {"type": "job", "job_id": job_id, "white": white_data, "black": black_data, "options": options}
+            self._jobs[job_id] = job
+            self._pending.append(job)
+        return job_id
+
+    def wait_for_result(self, job_id: int, timeout: float | None = None) -> GameRecord:
+        """
+        Blocks until the job's GameRecord arrives. Raises RuntimeError if the worker reported
+        an error, and TimeoutError after timeout seconds, in which case the job is withdrawn:
+        it is no longer handed out and a late result for it is ignored.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: job_id in self._results, timeout):
+                self._jobs.pop(job_id, None)
+                self._pending = deque(job for job in self._pending if job["job_id"] != job_id)
+                raise TimeoutError(f"No result for job {job_id} after {timeout} seconds")
+            result = self._results.pop(job_id)
+        if isinstance(result, str):
+            raise RuntimeError(result)
+        return result
+
+    def shutdown(self):
+        """Stops accepting workers; connected workers are told to exit when they next ask for a job."""
+        self._running = False
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                sock, address = self._server.accept()
+            except OSError:
+                break # Server socket closed by shutdown()
+            worker = _WorkerConnection(sock, address)
+            with self._condition:
+                self._workers.add(worker)
+            threading.Thread(target=self._serve_worker, args=(worker,), daemon=True).start()
+
+    def _serve_worker(self, worker):
+        try:
+            with worker.sock.makefile("r", encoding="utf-8") as reader:
+                for line in reader:
+                    worker.last_seen = time.monotonic()
+                    message = json.loads(line)
+                    message_type = message.get("type")
+                    if not worker.authenticated:
+                        token = message.get("token") if message_type == "hello" else None
+                        if not isinstance(token, str) or not hmac.compare_digest(token.encode("utf-8"),
+                                                                                 self.token.encode("utf-8")):
+                            print(f"Rejecting connection from {worker.name}: no valid token in its hello.")
+                            break
+                        worker.authenticated = True
+                        worker.name = message.get("name") or worker.name
+                        print(f"Worker {worker.name} connected.")
+                    elif message_type == "get_job":
+                        _send_message(worker.sock, self._next_job_for(worker), worker.send_lock)
+                    elif message_type == "result":
+                        self._complete_job(worker, message["job_id"], GameRecord.from_dict(message["record"]))
+                    elif message_type == "error":
+                        print(f"Worker {worker.name} failed job {message['job_id']}: {message['message']}")
+                        self._complete_job(worker, message["job_id"], message["message"])
+                    # Heartbeats only refresh last_seen
+        except (OSError, ValueError, LookupError, AttributeError) as e: # Malformed messages end the connection too
+            print(f"Connection to worker {worker.name} lost: {e}")
+        finally:
+            self._drop_worker(worker)
+
+    def _next_job_for(self, worker):
+        with self._condition:
+            if not self._running:
+                return {"type": "shutdown"}
+            if not self._pending:
+                return {"type": "no_job"}
+            job = self._pending.popleft()
+            worker.job_id = job["job_id"]
+            return job
+
+    def _complete_job(self, worker, job_id, result):
+        with self._condition:
+            if worker.job_id != job_id:
+                print(f"Ignoring result for job {job_id} from worker {worker.name}, which was not assigned it.")
+                return
+            worker.job_id = None
+            if job_id not in self._jobs:
+                return # Already completed by another worker after a re-queue, or timed out
+            del self._jobs[job_id]
+            if job_id in self._pending_ids():
+                self._pending = deque(job for job in self._pending if job["job_id"] != job_id)
+            self._results[job_id] = result
+            self._condition.notify_all()
+
+    def _pending_ids(self):
+        return {job["job_id"] for job in self._pending}
+
+    def _drop_worker(self, worker):
+        """Forgets a disconnected worker and puts its unfinished job back at the front of the queue."""
+        with self._condition:
+            self._workers.discard(worker)
+            job = self._jobs.get(worker.job_id)
+            if job is not None and job["job_id"] not in self._pending_ids():
+                print(f"Re-queueing job {job['job_id']} of worker {worker.name}.")
+                self._pending.appendleft(job)
+            worker.job_id = None
+        try:
+            worker.sock.close()
+        except OSError:
+            pass
+        print(f"Worker {worker.name} disconnected.")
+
+    def _monitor_loop(self):
+        """Disconnects workers whose heartbeats stopped; _serve_worker then re-queues their job."""
+        while self._running:
+            time.sleep(self.heartbeat_timeout / 4)
+            now = time.monotonic()
+            with self._condition:
+                silent_workers = [worker for worker in self._workers if now - worker.last_seen > self.heartbeat_timeout]
+            for worker in silent_workers:
+                print(f"Worker {worker.name} missed its heartbeats.")
+                try:
+                    worker.sock.shutdown(socket.SHUT_RDWR) # Unblocks the reading thread
+                except OSError:
+                    pass
+
+
+def run_worker(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, name: str | None = None, token: str | None = None):
+    """
+    Connects to a coordinator and plays the jobs it hands out until told to shut down.
+    token is the coordinator's shared token (read from the CHESS_WORKER_TOKEN environment variable if None).
+    """
+    token = token or os.environ.get(TOKEN_ENV_VARIABLE)
+    if not token:
+        print(f"Worker needs the coordinator's token (--token or {TOKEN_ENV_VARIABLE}).")
+        return
+    sock = socket.create_connection((host, port))
+    send_lock = threading.Lock()
+    stop_heartbeat = threading.Event()
+
+    def heartbeat():
+        while not stop_heartbeat.wait(HEARTBEAT_INTERVAL):
+            try:
+                _send_message(sock, {"type": "heartbeat"}, send_lock)
+            except OSError:
+                return
+
+    threading.Thread(target=heartbeat, daemon=True).start()
+    name = name or f"{socket.gethostname()}-{sock.getsockname()[1]}"
+    games_played = 0
+    try:
+        with sock.makefile("r", encoding="utf-8") as reader:
+            _send_message(sock, {"type": "hello", "name": name, "token": token}, send_lock)
+            while True:
+                _send_message(sock, {"type": "get_job"}, send_lock)
+                line = reader.readline()
+                if not line:
+                    print(f"Worker {name}: coordinator closed the connection (wrong token?).")
+                    break
+                message = json.loads(line)
+                if message["type"] == "shutdown":
+                    break
+                if message["type"] == "no_job":
+                    time.sleep(IDLE_POLL_INTERVAL)
+                    continue
+                options = dict(message["options"])
+                if options["adjudication"] is not None:
+                    options["adjudication"] = AdjudicationRules.from_dict(options["adjudication"])
+                if options["time_control"] is not None:
+                    options["time_control"] = TimeControl.from_dict(options["time_control"])
+                try:
+                    record = run_game_from_data(message["white"], message["black"], **options)
+                except Exception as e:
+                    _send_message(sock, {"type": "error", "job_id": message["job_id"], "message": str(e)}, send_lock)
+                    continue
+                _send_message(sock, {"type": "result", "job_id": message["job_id"], "record": record.to_dict()}, send_lock)
+                games_played += 1
+    except OSError as e:
+        print(f"Worker {name}: connection error: {e}")
+    finally:
+        stop_heartbeat.set()
+        sock.close()
+    print(f"Worker {name} stopped after {games_played} games.")
+
+
+def _run_local_demo(num_workers, num_games):
+    """Runs a coordinator and several local worker processes, then plays a few games through them."""
+    import multiprocessing
+    coordinator = GameCoordinator(port=0)
+    coordinator.start()
+    workers = [multiprocessing.Process(target=run_worker,
+                                       args=(coordinator.host, coordinator.port, f"local-{i + 1}", coordinator.token))
+               for i in range(num_workers)]
+    for process in workers:
+        process.start()
+
+    white = {"name": "CapturePreferringEngine", "parameters": {"type": "internal", "class": "CapturePreferringEngine"}}
+    black = {"name": "RandomMover", "parameters": {"type": "internal", "class": "RandomMover"}}
+    start = time.perf_counter()
+    job_ids = [coordinator.submit(white, black, pgn_headers={"Round": str(i + 1)}) for i in range(num_games)]
+    for job_id in job_ids:
+        print(f"Job {job_id}: {coordinator.wait_for_result(job_id, timeout=60)}")
+    print(f"{num_games} games on {num_workers} workers in {time.perf_counter() - start:.2f}s")
+
+    coordinator.shutdown()
+    for process in workers:
+        process.join()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Distributed engine-vs-engine game workers.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    worker_parser = subcommands.add_parser("worker", help="Play games handed out by a coordinator.")
+    worker_parser.add_argument("--host", default=DEFAULT_HOST)
+    worker_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    worker_parser.add_argument("--name", default=None)
+    worker_parser.add_argument("--token", default=None, help=f"Coordinator's shared token (default: ${TOKEN_ENV_VARIABLE})")
+    demo_parser = subcommands.add_parser("demo", help="Run a coordinator with local worker processes.")
+    demo_parser.add_argument("--workers", type=int, default=3)
+    demo_parser.add_argument("--games", type=int, default=6)
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        run_worker(args.host, args.port, args.name, args.token)
+    else:
+        _run_local_demo(args.workers, args.games)
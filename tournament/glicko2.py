@@ -0,0 +1,129 @@
+# tournament/glicko2.py
+import math
+import numpy as np
+
+# Glicko-2 (Glickman, "Example of the Glicko-2 system"): besides its rating, every player has a
+# rating deviation (RD, the uncertainty of the rating) and a volatility (how erratic its results
+# are). Results are processed per rating period, e.g. a tournament round: all games of the period
+# are rated at once against the opponents' ratings from before the period, so the order of the
+# games inside a period does not matter. New engines (high RD) move quickly, established ones slowly.
+
+DEFAULT_RATING = 1500.0
+DEFAULT_RD = 350.0
+DEFAULT_VOLATILITY = 0.06
+DEFAULT_TAU = 0.5 # Constrains volatility changes; 0.3 to 1.2 are reasonable
+GLICKO2_SCALE = 173.7178 # Rating points per Glicko-2 internal unit
+CONVERGENCE_TOLERANCE = 1e-6
+MAX_ITERATIONS = 100
+
+def _g(phi):
+    return 1.0 / np.sqrt(1.0 + 3.0 * phi ** 2 / math.pi ** 2)
+
+
+def rate_period(ratings, rds, volatilities, white, black, white_scores, tau: float = DEFAULT_TAU):
+    """
+    Applies one rating period to all players at once.
+
+    Args:
+        ratings, rds, volatilities: Arrays with one entry per player, before the period.
+        white, black: Player indexes of each game of the period.
+        white_scores: White's score in each game (1, 0.5 or 0).
+        tau: System constant constraining volatility changes.
+
+    Returns:
+        (ratings, rds, volatilities) after the period, as new arrays. Players
+        without games keep their rating, and their RD grows with their volatility.
+    """
+    ratings = np.asarray(ratings, dtype=float)
+    rds = np.asarray(rds, dtype=float)
+    sigma = np.asarray(volatilities, dtype=float)
+    white = np.asarray(white, dtype=np.int64)
+    black = np.asarray(black, dtype=np.int64)
+    white_scores = np.asarray(white_scores, dtype=float)
+    n = len(ratings)
+
+    mu = (ratings - DEFAULT_RATING) / GLICKO2_SCALE
+    phi = rds / GLICKO2_SCALE
+
+    # Both sides of every game: player, opponent, score
+    players = np.concatenate([white, black])
+    opponents = np.concatenate([black, white])
+    scores = np.concatenate([white_scores, 1.0 - white_scores])
+    g = _g(phi[opponents])
+    expected = 1.0 / (1.0 + np.exp(-g * (mu[players] - mu[opponents])))
+
+    information = np.bincount(players, g ** 2 * expected * (1 - expected), n)
+    played = information > 0
+    v = np.full(n, np.inf)
+    v[played] = 1.0 / information[played]
+    score_sum = np.bincount(players, g * (scores - expected), n)
+    delta = np.zeros(n)
+    delta[played] = v[played] * score_sum[played]
+
+    # New volatility of each player who played: root of f by the Illinois algorithm, all players at once
+    idx = np.nonzero(played)[0]
+    new_sigma = sigma.copy()
+    if len(idx):
+        phi2, v_p, delta2 = phi[idx] ** 2, v[idx], delta[idx] ** 2
+        a = np.log(sigma[idx] ** 2)
+
+        def f(x):
+            ex = np.exp(x)
+            return ex * (delta2 - phi2 - v_p - ex) / (2 * (phi2 + v_p + ex) ** 2) - (x - a) / tau ** 2
+
+        lower = a.copy()
+        upper = np.where(delta2 > phi2 + v_p, np.log(np.maximum(delta2 - phi2 - v_p, 1e-300)), a - tau)
+        needs_bracket = delta2 <= phi2 + v_p
+        for _ in range(MAX_ITERATIONS):
+            needs_bracket &= f(upper) < 0
+            if not needs_bracket.any():
+                break
+            upper = np.where(needs_bracket, upper - tau, upper)
+        f_lower, f_upper = f(lower), f(upper)
+        for _ in range(MAX_ITERATIONS):
+            active = np.abs(upper - lower) > CONVERGENCE_TOLERANCE
+            if not active.any():
+                break
+            c = lower + (lower - upper) * f_lower / (f_upper - f_lower)
+            f_c = f(c)
+            moves_lower = f_c * f_upper <= 0
+            lower = np.where(active & moves_lower, upper, lower)
+            f_lower = np.where(active & moves_lower, f_upper, np.where(active, f_lower / 2, f_lower))
+            upper = np.where(active, c, upper)
+            f_upper = np.where(active, f_c, f_upper)
+        new_sigma[idx] = np.exp(lower / 2)
+
+    phi_star = np.sqrt(phi ** 2 + new_sigma ** 2)
+    new_phi = np.where(played, 1.0 / np.sqrt(1.0 / phi_star ** 2 + 1.0 / v), phi_star)
+    new_phi = np.minimum(new_phi, DEFAULT_RD / GLICKO2_SCALE) # RD never exceeds that of an unrated player
+    new_mu = mu + new_phi ** 2 * score_sum
+    return new_mu * GLICKO2_SCALE + DEFAULT_RATING, new_phi * GLICKO2_SCALE, new_sigma
+
+
+if __name__ == '__main__':
+    # Example Usage / Simple Test: the worked example of Glickman's paper
+    ratings = [1500, 1400, 1550, 1700]
+    rds = [200, 30, 100, 300]
+    volatilities = [DEFAULT_VOLATILITY] * 4
+    new_ratings, new_rds, new_volatilities = rate_period(ratings, rds, volatilities, white=[0, 0, 0], black=[1, 2, 3],
+                                                         white_scores=[1, 0, 0])
+    print(f"Player 1: rating {new_ratings[0]:.2f} (1464.05), RD {new_rds[0]:.2f} (151.52), "
+          f"volatility {new_volatilities[0]:.6f} (0.059996)")
+
+    # Batched periods for many players
+    import time
+    rng = np.random.default_rng(1)
+    num_players, games_per_period = 10000, 50000
+    ratings = np.full(num_players, DEFAULT_RATING)
+    rds = np.full(num_players, DEFAULT_RD)
+    volatilities = np.full(num_players, DEFAULT_VOLATILITY)
+    strength = rng.normal(0, 200, num_players)
+    start = time.perf_counter()
+    for period in range(20):
+        white = rng.integers(0, num_players, games_per_period)
+        black = (white + rng.integers(1, num_players, games_per_period)) % num_players
+        p_white = 1 / (1 + 10 ** ((strength[black] - strength[white]) / 400))
+        ratings, rds, volatilities = rate_period(ratings, rds, volatilities, white, black,
+                                                 (rng.random(games_per_period) < p_white).astype(float))
+    print(f"20 periods of {games_per_period} games for {num_players} players in {time.perf_counter() - start:.2f}s, "
+          f"correlation with true strength {np.corrcoef(ratings, strength)[0, 1]:.3f}, mean RD {rds.mean():.1f}")
@@ -0,0 +1,346 @@
+# tournament/match_runner.py
+import time
+from datetime import datetime
+import chess
+import chess.syzygy
+from game.chess_game_manager import ChessGameManager, RESULT_STRINGS
+from game.chess_clock import ChessClock
+from engine.mate_search import find_mate
+from engine.engine_factory import create_engine
+
+DEFAULT_MAX_PLIES = 200 # Prevent infinite games for simple AIs
+DEFAULT_MATE_ADJUDICATION_NODES = 0 # Off unless asked for, e.g. 500: adjudicated mates were never played out
+DEFAULT_RESIGN_SCORE = None # Centipawns, e.g. 1000; off unless asked for
+DEFAULT_RESIGN_MOVE_COUNT = 3
+DEFAULT_DRAW_SCORE = None # Centipawns, e.g. 20; off unless asked for
+DEFAULT_DRAW_MOVE_NUMBER = 40
+DEFAULT_DRAW_MOVE_COUNT = 8
+DEFAULT_TABLEBASE_PIECES = 5
+
+class AdjudicationRules:
+    """
+    When the runner stops a game before the board says it is over.
+
+    max_plies: engine moves after which the game is declared a draw.
+    mate_search_nodes: node budget of the checks-only mate search run after each
+                       move; a forced mate for the side to move ends the game (0, the default,
+                       disables it).
+    resign_score, resign_move_count: the game is lost for a side once both engines'
+                       evaluations have been at least resign_score centipawns against it
+                       for resign_move_count consecutive moves each (None, the default,
+                       disables it).
+    draw_score, draw_move_number, draw_move_count: from full move draw_move_number on, the
+                       game is drawn once both engines' evaluations have stayed within
+                       draw_score centipawns of 0 for draw_move_count consecutive moves each
+                       (None, the default, disables it).
+    tablebase_path, tablebase_pieces: directory of Syzygy tablebases; with tablebase_pieces
+                       pieces or fewer on the board the game is decided by a WDL probe
+                       (None disables it).
+
+    Evaluations are the engines' own (BaseChessEngine.last_score). A move without one
+    restarts the counts, so games with an engine that reports none are never
+    resigned or drawn by these rules.
+    """
+    def __init__(self, max_plies: int = DEFAULT_MAX_PLIES, mate_search_nodes: int = DEFAULT_MATE_ADJUDICATION_NODES,
+                 resign_score: int | None = DEFAULT_RESIGN_SCORE, resign_move_count: int = DEFAULT_RESIGN_MOVE_COUNT,
+                 draw_score: int | None = DEFAULT_DRAW_SCORE, draw_move_number: int = DEFAULT_DRAW_MOVE_NUMBER,
+                 draw_move_count: int = DEFAULT_DRAW_MOVE_COUNT, tablebase_path: str | None = None,
+                 tablebase_pieces: int = DEFAULT_TABLEBASE_PIECES):
+        self.max_plies = max_plies
+        self.mate_search_nodes = mate_search_nodes
+        self.resign_score = resign_score
+        self.resign_move_count = resign_move_count
+        self.draw_score = draw_score
+        self.draw_move_number = draw_move_number
+        self.draw_move_count = draw_move_count
+        self.tablebase_path = tablebase_path
+        self.tablebase_pieces = tablebase_pieces
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+class _ScoreAdjudicator:
+    """
+    Tracks the evaluations of the last moves of a game for the resign and draw rules.
+    Scores are in centipawns from White's point of view.
+    """
+    def __init__(self, rules: AdjudicationRules):
+        self.rules = rules
+        self.resign_streaks = {chess.WHITE: 0, chess.BLACK: 0} # Consecutive moves each engine saw White winning (+) or losing (-)
+        self.draw_streak = 0 # Consecutive engine moves with a drawish evaluation
+
+    def update(self, board: chess.Board, mover: chess.Color, white_score: int):
+        """Records the evaluation of the engine that just moved; returns (winner, reason) or None."""
+        rules = self.rules
+        if rules.resign_score is not None:
+            streak = self.resign_streaks[mover]
+            if white_score >= rules.resign_score:
+                self.resign_streaks[mover] = streak + 1 if streak > 0 else 1
+            elif white_score <= -rules.resign_score:
+                self.resign_streaks[mover] = streak - 1 if streak < 0 else -1
+            else:
+                self.resign_streaks[mover] = 0
+            white_streak, black_streak = self.resign_streaks[chess.WHITE], self.resign_streaks[chess.BLACK]
+            if min(white_streak, black_streak) >= rules.resign_move_count:
+                return 'white', 'resignation (adjudicated)'
+            if max(white_streak, black_streak) <= -rules.resign_move_count:
+                return 'black', 'resignation (adjudicated)'
+
+        if rules.draw_score is not None:
+            if board.fullmove_number >= rules.draw_move_number and abs(white_score) <= rules.draw_score:
+                self.draw_streak += 1
+            else:
+                self.draw_streak = 0
+            if self.draw_streak >= 2 * rules.draw_move_count:
+                return 'draw', 'draw (adjudicated)'
+        return None
+
+    def reset(self):
+        """Restarts the counts, after a move the engine gave no evaluation for."""
+        self.resign_streaks = {chess.WHITE: 0, chess.BLACK: 0}
+        self.draw_streak = 0
+
+
+def _tablebase_result(tablebase, board: chess.Board, max_pieces: int):
+    """(winner, reason) from a Syzygy WDL probe, or None if the position has too many pieces or no table."""
+    if chess.popcount(board.occupied) > max_pieces:
+        return None
+    try:
+        wdl = tablebase.probe_wdl(board)
+    except KeyError: # Table missing, or castling rights left
+        return None
+    if abs(wdl) < 2: # Draws, and wins spoiled by the fifty-move rule
+        return 'draw', 'tablebase draw (adjudicated)'
+    side_to_move_wins = wdl > 0
+    white_wins = side_to_move_wins == (board.turn == chess.WHITE)
+    return ('white' if white_wins else 'black'), 'tablebase win (adjudicated)'
+
+
+class GameRecord:
+    """
+    Outcome of one engine-vs-engine game as returned by run_game().
+    winner is 'white', 'black' or 'draw'; result the matching PGN result string.
+    move_times (seconds) and move_nodes (None when the engine does not report
+    nodes) have one entry per engine move, opening moves excluded.
+    time_control is the game's time control as text (see game.chess_clock), or None.
+    """
+    __slots__ = ("white_name", "black_name", "start_fen", "opening_plies", "winner", "reason", "result",
+                 "moves_blob", "pgn", "move_times", "move_nodes", "start_time", "end_time", "time_control")
+
+    def __init__(self, white_name, black_name, start_fen=None, opening_plies=0):
+        self.white_name = white_name
+        self.black_name = black_name
+        self.start_fen = start_fen # None for the standard initial position
+        self.opening_plies = opening_plies
+        self.winner = None
+        self.reason = None
+        self.result = "*"
+        self.moves_blob = b"" # All moves, opening included (see game.move_codec)
+        self.pgn = ""
+        self.move_times = []
+        self.move_nodes = []
+        self.start_time = None
+        self.end_time = None
+        self.time_control = None
+
+    @property
+    def plies(self):
+        """Number of moves played by the engines."""
+        return len(self.move_times)
+
+    def to_game_data(self, tournament_id=None):
+        """Returns the game_data dictionary DBManager.save_game() expects (engine IDs are looked up by name)."""
+        return {
+            'start_time': self.start_time.isoformat(),
+            'end_time': self.end_time.isoformat(),
+            'winner': self.winner,
+            'reason': self.reason,
+            'pgn': self.pgn,
+            'moves_blob': self.moves_blob,
+            'start_fen': self.start_fen,
+            'white_player_type': 'engine',
+            'black_player_type': 'engine',
+            'white_player_name': self.white_name,
+            'black_player_name': self.black_name,
+            'tournament_id': tournament_id,
+            'time_control': self.time_control,
+            'move_times': [round(seconds * 1000) for seconds in self.move_times] # Milliseconds
+        }
+
+    def to_dict(self):
+        """Returns the record as JSON-serializable data (moves blob as hex, times in ISO format)."""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["moves_blob"] = self.moves_blob.hex()
+        data["start_time"] = self.start_time.isoformat() if self.start_time else None
+        data["end_time"] = self.end_time.isoformat() if self.end_time else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuilds a record from to_dict() output."""
+        record = cls(data["white_name"], data["black_name"])
+        for name in cls.__slots__:
+            setattr(record, name, data[name])
+        record.moves_blob = bytes.fromhex(data["moves_blob"])
+        record.start_time = datetime.fromisoformat(data["start_time"]) if data["start_time"] else None
+        record.end_time = datetime.fromisoformat(data["end_time"]) if data["end_time"] else None
+        return record
+
+    def __repr__(self):
+        return (f"GameRecord({self.white_name} vs {self.black_name}: {self.result} by {self.reason}, "
+                f"{self.plies} plies)")
+
+
+def run_game(white_engine, black_engine, start_fen=None, opening_moves=(), adjudication=None, pgn_headers=None,
+             time_control=None) -> GameRecord:
+    """
+    Plays one game between two engines and returns its GameRecord. Does no
+    printing or database access, so it can be called from tournaments,
+    benchmarks, tests or worker processes alike.
+
+    Args:
+        white_engine, black_engine: BaseChessEngine instances.
+        start_fen: Optional FEN of the start position (standard position if None).
+        opening_moves: Moves (chess.Move or UCI strings) forced before the engines take over.
+        adjudication: AdjudicationRules (defaults apply if None).
+        pgn_headers: Optional extra PGN tags (Event, Round, ...) for the record's PGN.
+        time_control: Optional game.chess_clock.TimeControl. Engines then get the clock state
+                      in time_limits before each move, and an engine that oversteps its time
+                      loses ('time forfeit'), or draws if its opponent cannot mate.
+    """
+    adjudication = adjudication or AdjudicationRules()
+    game_manager = ChessGameManager()
+    game_manager.reset_game(start_fen)
+    for move in opening_moves:
+        uci = move.uci() if isinstance(move, chess.Move) else move
+        if not game_manager.make_move(uci):
+            raise ValueError(f"Illegal opening move: {uci}")
+
+    record = GameRecord(white_engine.name, black_engine.name, start_fen, len(game_manager.moves_history))
+    record.start_time = datetime.now()
+    record.time_control = str(time_control) if time_control else None
+    clock = ChessClock(time_control) if time_control else None
+    winner = reason = None
+    score_adjudicator = _ScoreAdjudicator(adjudication)
+    tablebase = chess.syzygy.open_tablebase(adjudication.tablebase_path) if adjudication.tablebase_path else None
+
+    while not game_manager.is_game_over():
+        if record.plies >= adjudication.max_plies:
+            winner, reason = 'draw', 'max moves reached'
+            break
+        board = game_manager.get_board_object()
+        engine_to_move = white_engine if board.turn == chess.WHITE else black_engine
+        opponent = 'black' if board.turn == chess.WHITE else 'white'
+
+        # Sync engine's internal board before asking for move
+        engine_to_move.set_board(board)
+        engine_to_move.last_nodes = None
+        engine_to_move.last_score = None
+        if clock is not None:
+            engine_to_move.time_limits = clock.engine_limits(board.turn)
+            clock.start_move(board.turn)
+            move = engine_to_move.make_move()
+            record.move_times.append(clock.stop_move())
+        else:
+            move_start = time.perf_counter_ns()
+            move = engine_to_move.make_move()
+            record.move_times.append((time.perf_counter_ns() - move_start) / 1e9)
+        record.move_nodes.append(engine_to_move.last_nodes)
+
+        if clock is not None and clock.flagged is not None:
+            if board.has_insufficient_material(not board.turn):
+                winner, reason = 'draw', 'time forfeit (insufficient material)'
+            else:
+                winner, reason = opponent, 'time forfeit'
+            break
+
+        if move is None:
+            winner, reason = 'draw', 'unknown termination' # Engine failed to move, scored as a draw
+            break
+        if not game_manager.make_move(move.uci()):
+            winner, reason = opponent, 'illegal move'
+            break
+        if engine_to_move.ponder:
+            # Let the engine think on its opponent's time
+            engine_to_move.set_board(game_manager.get_board_object())
+            engine_to_move.start_ponder()
+        if game_manager.is_game_over():
+            break
+        board = game_manager.get_board_object()
+        if adjudication.mate_search_nodes and find_mate(board, adjudication.mate_search_nodes, checks_only=True):
+            winner = 'white' if board.turn == chess.WHITE else 'black'
+            reason = 'forced mate (adjudicated)'
+            break
+        if tablebase is not None:
+            adjudicated = _tablebase_result(tablebase, board, adjudication.tablebase_pieces)
+            if adjudicated:
+                winner, reason = adjudicated
+                break
+        mover = not board.turn
+        score = engine_to_move.last_score
+        if score is None:
+            score_adjudicator.reset() # The rules need both engines' evaluations
+            continue
+        white_score = score if mover == chess.WHITE else -score
+        adjudicated = score_adjudicator.update(board, mover, white_score)
+        if adjudicated:
+            winner, reason = adjudicated
+            break
+
+    record.end_time = datetime.now()
+    white_engine.stop_ponder()
+    black_engine.stop_ponder()
+    white_engine.time_limits = black_engine.time_limits = None
+    if tablebase is not None:
+        tablebase.close()
+
+    if winner is None:
+        winner, reason = game_manager.get_game_result()
+    record.winner = winner
+    record.reason = reason
+    record.result = RESULT_STRINGS[winner]
+
+    # The manager only knows over-the-board results, not adjudications or the move cap
+    game_manager.pgn_headers["White"] = white_engine.name
+    game_manager.pgn_headers["Black"] = black_engine.name
+    if time_control:
+        game_manager.pgn_headers["TimeControl"] = time_control.pgn_tag()
+    game_manager.pgn_headers.update(pgn_headers or {})
+    game_manager.pgn_headers["Result"] = record.result
+    record.pgn = game_manager.get_pgn()
+    record.moves_blob = game_manager.get_encoded_moves()
+    return record
+
+
+def run_game_from_data(white_data: dict, black_data: dict, **kwargs) -> GameRecord:
+    """
+    Same as run_game(), but builds the engines from their DB records (see
+    engine.engine_factory) and quits them afterwards. Only plain data goes
+    in and out, so this is the function worker processes run.
+    """
+    engines = [create_engine(white_data), create_engine(black_data)]
+    try:
+        for engine, data in zip(engines, (white_data, black_data)):
+            if engine is None:
+                raise ValueError(f"Could not create engine {data['name']}")
+        return run_game(engines[0], engines[1], **kwargs)
+    finally:
+        for engine in engines:
+            if engine is not None and hasattr(engine, 'quit'):
+                engine.quit()
+
+
+if __name__ == '__main__':
+    # Example Usage / Simple Test:
+    from engine.RandomMover import RandomMover
+    from engine.CapturePreferringEngine import CapturePreferringEngine
+
+    record = run_game(CapturePreferringEngine("Capture"), RandomMover("Random"), opening_moves=["e2e4", "e7e5"])
+    print(record)
+    print(f"Average move time: {sum(record.move_times) / max(1, record.plies) * 1000:.2f} ms")
+    print(record.pgn)
@@ -0,0 +1,280 @@
+# tournament/ml_ratings.py
+import math
+import numpy as np
+from database.db_manager import DBManager
+
+# Maximum-likelihood ratings over all stored games (in the spirit of BayesElo/Ordo), as
+# opposed to the sequential K-factor updates of elo_calculator, which depend on game order.
+#
+# Model, with d = rating_white - rating_black + white_advantage (Elo points) and f(x) = 1 / (1 + 10^(-x/400)):
+#   P(white wins) = f(d - draw_elo), P(black wins) = f(-d - draw_elo), P(draw) = the rest.
+# Each engine also gets `prior_games` virtual games scoring 50% against a 0-rated opponent, which
+# keeps engines with all wins or all losses finite and makes the problem well-posed.
+#
+# Games are aggregated into one (white, black, wins, draws, losses) row per ordered pair, so the
+# cost of an iteration depends on the number of pairs that met, not on the number of games. Ratings
+# the white advantage and draw_elo are fitted together by Newton's method (the log-likelihood is
+# concave), each step solved with conjugate gradients using Hessian-vector products over the pair arrays.
+
+ELO_SCALE = math.log(10) / 400 # Natural logistic units per Elo point
+DEFAULT_PRIOR_GAMES = 2.0
+DEFAULT_RATING_OFFSET = 1200 # Average rating of the reported ratings
+DEFAULT_CONFIDENCE_Z = 1.96 # Error bars are 95% intervals
+MAX_COVARIANCE_ENGINES = 3000 # Above this, error bars use the Hessian diagonal instead of its inverse
+MAX_NEWTON_ITERATIONS = 50
+MAX_CG_ITERATIONS = 500
+NEWTON_TOLERANCE = 1e-7 # Natural units, about 0.00004 Elo points
+TOLERANCE = 1e-9
+
+class RatingFit:
+    """
+    Result of fit_ratings(). ratings and errors (half-width of the confidence
+    interval) are NumPy arrays in Elo points, indexed like the players passed in;
+    white_advantage and draw_elo are in Elo points too.
+    """
+    __slots__ = ("ratings", "errors", "white_advantage", "draw_elo", "iterations", "log_likelihood")
+
+    def __init__(self, ratings, errors, white_advantage, draw_elo, iterations, log_likelihood):
+        self.ratings = ratings
+        self.errors = errors
+        self.white_advantage = white_advantage
+        self.draw_elo = draw_elo
+        self.iterations = iterations
+        self.log_likelihood = log_likelihood
+
+    def __repr__(self):
+        return (f"RatingFit({len(self.ratings)} players, advantage {self.white_advantage:.1f}, "
+                f"draw_elo {self.draw_elo:.1f}, {self.iterations} iterations)")
+
+
+def _sigmoid(x):
+    return 0.5 * (1.0 + np.tanh(0.5 * x)) # Overflow-free logistic function
+
+
+def _pair_terms(params, white, black, wins, draws, losses, num_players):
+    """
+    Per-pair quantities of the model in natural units, from the parameters
+    [ratings..., white advantage, draw]: the log-likelihood gradient with respect to
+    the pair's rating difference x and to draw, and the negated second derivatives
+    (curvature in x, cross term in x and draw, curvature in draw).
+    """
+    x = params[white] - params[black] + params[num_players]
+    draw = params[num_players + 1]
+    s_win = _sigmoid(x - draw)  # P(white wins)
+    s_no_loss = _sigmoid(x + draw) # P(white wins or draws)
+    a = s_win * (1 - s_win)
+    b = s_no_loss * (1 - s_no_loss)
+    p_draw = np.maximum(s_no_loss - s_win, 1e-300)
+    draw_ratio = (a + b) / p_draw
+
+    x_gradient = wins * (1 - s_win) - losses * s_no_loss + draws * (1 - s_win - s_no_loss)
+    draw_gradient = -wins * (1 - s_win) - losses * s_no_loss + draws * draw_ratio
+    x_curvature = (wins + draws) * a + (losses + draws) * b
+    cross = (losses + draws) * b - (wins + draws) * a
+    draw_curvature = wins * a + losses * b - draws * ((-(1 - 2 * s_win) * a + (1 - 2 * s_no_loss) * b) / p_draw
+                                                      - draw_ratio ** 2)
+    log_likelihood = np.sum(wins * np.log(np.maximum(s_win, 1e-300)) + losses * np.log(np.maximum(1 - s_no_loss, 1e-300))
+                            + draws * np.log(p_draw))
+    return x_gradient, draw_gradient, x_curvature, cross, draw_curvature, log_likelihood
+
+
+class _Curvature:
+    """Negated Hessian of the log-likelihood (positive definite) at one point, as pair arrays."""
+    def __init__(self, white, black, x_curvature, cross, draw_curvature, prior_curvature, num_players):
+        self.white = white
+        self.black = black
+        self.x_curvature = x_curvature
+        self.cross = cross
+        self.draw_curvature = draw_curvature.sum() + TOLERANCE # Tiny ridges in case there are no draws or no games
+        self.prior_curvature = prior_curvature
+        self.num_players = num_players
+
+    def product(self, vector):
+        n = self.num_players
+        u = vector[self.white] - vector[self.black] + vector[n]
+        t = self.x_curvature * u + self.cross * vector[n + 1]
+        result = np.empty(n + 2)
+        result[:n] = np.bincount(self.white, t, n) - np.bincount(self.black, t, n) + self.prior_curvature * vector[:n]
+        result[n] = t.sum() + TOLERANCE * vector[n]
+        result[n + 1] = self.cross @ u + self.draw_curvature * vector[n + 1]
+        return result
+
+    def diagonal(self):
+        n = self.num_players
+        diagonal = np.empty(n + 2)
+        diagonal[:n] = (np.bincount(self.white, self.x_curvature, n) + np.bincount(self.black, self.x_curvature, n)
+                        + self.prior_curvature)
+        diagonal[n] = self.x_curvature.sum() + TOLERANCE
+        diagonal[n + 1] = self.draw_curvature
+        return diagonal
+
+    def dense(self):
+        n = self.num_players
+        white, black, h, c = self.white, self.black, self.x_curvature, self.cross
+        hessian = np.zeros((n + 2, n + 2))
+        np.add.at(hessian, (white, white), h)
+        np.add.at(hessian, (black, black), h)
+        np.add.at(hessian, (white, black), -h)
+        np.add.at(hessian, (black, white), -h)
+        hessian[:n, n] = np.bincount(white, h, n) - np.bincount(black, h, n) # Ratings x advantage
+        hessian[:n, n + 1] = np.bincount(white, c, n) - np.bincount(black, c, n) # Ratings x draw
+        hessian[n, :n] = hessian[:n, n]
+        hessian[n + 1, :n] = hessian[:n, n + 1]
+        hessian[n, n] += h.sum() + TOLERANCE
+        hessian[n, n + 1] += c.sum()
+        hessian[n + 1, n] += c.sum()
+        hessian[n + 1, n + 1] += self.draw_curvature
+        hessian[np.arange(n), np.arange(n)] += self.prior_curvature
+        return hessian
+
+
+def _evaluate(params, white, black, wins, draws, losses, num_players, prior_games):
+    """Gradient over all parameters, the curvature at params and the log-likelihood (prior included)."""
+    n = num_players
+    x_gradient, draw_gradient, x_curvature, cross, draw_curvature, log_likelihood = _pair_terms(
+        params, white, black, wins, draws, losses, n)
+    gradient = np.empty(n + 2)
+    gradient[:n] = np.bincount(white, x_gradient, n) - np.bincount(black, x_gradient, n)
+    gradient[n] = x_gradient.sum()
+    gradient[n + 1] = draw_gradient.sum()
+
+    prior_win = _sigmoid(params[:n])
+    gradient[:n] += prior_games * (0.5 - prior_win)
+    prior_curvature = prior_games * prior_win * (1 - prior_win)
+    log_likelihood += np.sum(prior_games / 2 * (np.log(prior_win) + np.log(1 - prior_win)))
+    curvature = _Curvature(white, black, x_curvature, cross, draw_curvature, prior_curvature, n)
+    return gradient, curvature, log_likelihood
+
+
+def _conjugate_gradient(apply, rhs, diagonal):
+    """Solves apply(x) = rhs for a positive definite operator, with a Jacobi preconditioner."""
+    x = np.zeros_like(rhs)
+    residual = rhs.copy()
+    z = residual / diagonal
+    direction = z.copy()
+    rz = residual @ z
+    rhs_norm = np.linalg.norm(rhs)
+    for _ in range(MAX_CG_ITERATIONS):
+        if np.linalg.norm(residual) <= TOLERANCE * max(rhs_norm, 1.0):
+            break
+        product = apply(direction)
+        step = rz / (direction @ product)
+        x += step * direction
+        residual -= step * product
+        z = residual / diagonal
+        rz_next = residual @ z
+        direction = z + (rz_next / rz) * direction
+        rz = rz_next
+    return x
+
+
+def fit_ratings(white, black, wins, draws, losses, num_players: int, prior_games: float = DEFAULT_PRIOR_GAMES,
+                offset: float = DEFAULT_RATING_OFFSET, confidence_z: float = DEFAULT_CONFIDENCE_Z) -> RatingFit:
+    """
+    Fits ratings to aggregated results.
+
+    Args:
+        white, black: Player indexes (0 .. num_players - 1) of each pair.
+        wins, draws, losses: Game counts of each pair, from white's point of view.
+        num_players: Number of players.
+        prior_games: Virtual 50% games per player against a 0-rated opponent.
+        offset: Average of the returned ratings.
+        confidence_z: Error bars are confidence_z standard errors (1.96 for 95%).
+    """
+    white = np.asarray(white, dtype=np.int64)
+    black = np.asarray(black, dtype=np.int64)
+    wins, draws, losses = (np.asarray(counts, dtype=float) for counts in (wins, draws, losses))
+    n = num_players
+
+    params = np.zeros(n + 2) # Ratings, white advantage and draw parameter, in natural units
+    total_draws, total_games = draws.sum(), wins.sum() + draws.sum() + losses.sum()
+    draw_rate = min(max(total_draws / total_games if total_games else 0.0, 0.01), 0.99)
+    params[n + 1] = math.log((1 + draw_rate) / (1 - draw_rate)) # Exact for two equal players without white advantage
+
+    iterations = 0
+    for iterations in range(1, MAX_NEWTON_ITERATIONS + 1):
+        gradient, curvature, _ = _evaluate(params, white, black, wins, draws, losses, n, prior_games)
+        step = _conjugate_gradient(curvature.product, gradient, curvature.diagonal())
+        draw = params[n + 1]
+        params += step
+        params[n + 1] = max(params[n + 1], draw / 2) # The draw parameter stays positive
+        if np.max(np.abs(step)) < NEWTON_TOLERANCE:
+            break
+
+    _, curvature, log_likelihood = _evaluate(params, white, black, wins, draws, losses, n, prior_games)
+    ratings = params[:n]
+    mean = ratings.mean() if n else 0.0
+    if n <= MAX_COVARIANCE_ENGINES:
+        covariance = np.linalg.inv(curvature.dense())[:n, :n]
+        # Variance of each rating relative to the average rating
+        variances = (np.diag(covariance) - 2 * covariance.mean(axis=1) + covariance.mean()) if n else np.zeros(0)
+    else:
+        variances = 1.0 / curvature.diagonal()[:n]
+    errors = confidence_z * np.sqrt(np.maximum(variances, 0.0)) / ELO_SCALE
+
+    return RatingFit((ratings - mean) / ELO_SCALE + offset, errors, params[n] / ELO_SCALE, params[n + 1] / ELO_SCALE,
+                     iterations, log_likelihood)
+
+
+def compute_ratings(db_manager: DBManager, tournament_id=None, prior_games: float = DEFAULT_PRIOR_GAMES,
+                    offset: float = DEFAULT_RATING_OFFSET):
+    """
+    Fits ratings to all engine-vs-engine games in the database (or one tournament's).
+    Returns (table, fit): one dict per engine that played (name, rating, error,
+    games, points), best first, and the RatingFit ([] and None without games).
+    """
+    rows = db_manager.get_pairwise_results(tournament_id)
+    if not rows:
+        return [], None
+    results = np.array(rows, dtype=np.int64)
+    engine_ids, indexes = np.unique(results[:, :2], return_inverse=True)
+    indexes = indexes.reshape(-1, 2)
+    white, black = indexes[:, 0], indexes[:, 1]
+    wins, draws, losses = results[:, 2], results[:, 3], results[:, 4]
+    fit = fit_ratings(white, black, wins, draws, losses, len(engine_ids), prior_games, offset)
+
+    n = len(engine_ids)
+    games = np.bincount(white, wins + draws + losses, n) + np.bincount(black, wins + draws + losses, n)
+    points = (np.bincount(white, wins + 0.5 * draws, n) + np.bincount(black, losses + 0.5 * draws, n))
+    names = {engine['engine_id']: engine['name'] for engine in db_manager.get_all_engines()}
+    table = [{
+        'name': names.get(int(engine_id), f"engine {engine_id}"),
+        'rating': float(fit.ratings[i]),
+        'error': float(fit.errors[i]),
+        'games': int(games[i]),
+        'points': float(points[i]),
+    } for i, engine_id in enumerate(engine_ids)]
+    table.sort(key=lambda row: row['rating'], reverse=True)
+    return table, fit
+
+
+if __name__ == '__main__':
+    # Example Usage / Simple Test: 2000 engines, 2 million simulated games
+    import time
+    rng = np.random.default_rng(1)
+    num_players, num_games = 2000, 2_000_000
+    true_ratings = rng.normal(0, 200, num_players)
+    true_advantage, true_draw_elo = 30.0, 150.0
+    white = rng.integers(0, num_players, num_games)
+    black = (white + rng.integers(1, num_players, num_games)) % num_players
+    d = (true_ratings[white] - true_ratings[black] + true_advantage) * ELO_SCALE
+    p_win = 1 / (1 + np.exp(-(d - true_draw_elo * ELO_SCALE)))
+    p_loss = 1 / (1 + np.exp(d + true_draw_elo * ELO_SCALE))
+    u = rng.random(num_games)
+    outcome = np.where(u < p_win, 0, np.where(u < p_win + p_loss, 2, 1)) # 0 win, 1 draw, 2 loss
+
+    start = time.perf_counter()
+    keys = (white * num_players + black) * 3 + outcome
+    counts = np.bincount(keys, minlength=num_players * num_players * 3).reshape(-1, 3)
+    pairs = np.nonzero(counts.sum(axis=1))[0]
+    aggregated = time.perf_counter()
+    fit = fit_ratings(pairs // num_players, pairs % num_players, counts[pairs, 0], counts[pairs, 1], counts[pairs, 2],
+                      num_players, offset=0.0)
+    fitted = time.perf_counter()
+
+    deviation = fit.ratings - (true_ratings - true_ratings.mean())
+    print(f"{fit} on {len(pairs)} pairs: aggregation {aggregated - start:.2f}s, fit {fitted - aggregated:.2f}s")
+    print(f"White advantage {fit.white_advantage:.1f} (true {true_advantage}), "
+          f"draw_elo {fit.draw_elo:.1f} (true {true_draw_elo})")
+    print(f"Rating RMS error {np.sqrt(np.mean(deviation ** 2)):.1f}, mean error bar {fit.errors.mean():.1f}, "
+          f"inside error bars {np.mean(np.abs(deviation) <= fit.errors) * 100:.1f}% (about 95% expected)")
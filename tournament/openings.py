@@ -0,0 +1,90 @@
+# tournament/openings.py
+import chess
+import chess.pgn
+
+class Opening:
+    """Start of a game from an opening suite: a start position (None for the initial position) and forced moves."""
+    __slots__ = ("index", "fen", "moves")
+
+    def __init__(self, index: int, fen: str | None, moves: list):
+        self.index = index
+        self.fen = fen
+        self.moves = moves # UCI strings
+
+    def __repr__(self):
+        return f"Opening({self.index}, fen={self.fen}, moves={self.moves})"
+
+
+class OpeningSuite:
+    """
+    Openings read from an EPD file (one position per line) or a PGN file
+    (the mainline of each game, from its FEN tag if it has one).
+
+    The file is streamed: opening it only records the file offset of every
+    opening, and get() parses the one requested, so suites with millions of
+    positions do not have to fit in memory.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.is_pgn = path.lower().endswith(".pgn")
+        self._handle = open(path, encoding="utf-8-sig", errors="replace")
+        self._offsets = self._scan_pgn() if self.is_pgn else self._scan_epd()
+
+    def _scan_epd(self):
+        offsets = []
+        while True:
+            offset = self._handle.tell()
+            line = self._handle.readline()
+            if not line:
+                return offsets
+            stripped = line.strip()
+            if stripped and not stripped.startswith(("#", ";")):
+                offsets.append(offset)
+
+    def _scan_pgn(self):
+        offsets = []
+        while True:
+            offset = self._handle.tell()
+            if chess.pgn.read_headers(self._handle) is None:
+                return offsets
+            offsets.append(offset)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def get(self, index: int) -> Opening:
+        """Returns opening number `index` (wrapping around at the end of the suite)."""
+        index %= len(self._offsets)
+        self._handle.seek(self._offsets[index])
+        if self.is_pgn:
+            game = chess.pgn.read_game(self._handle)
+            board = game.board()
+            fen = None if board.fen() == chess.STARTING_FEN else board.fen()
+            return Opening(index, fen, [move.uci() for move in game.mainline_moves()])
+        board, _ = chess.Board.from_epd(self._handle.readline().strip())
+        return Opening(index, board.fen(), [])
+
+    def close(self):
+        self._handle.close()
+
+
+if __name__ == '__main__':
+    # Example Usage / Simple Test:
+    import os
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        epd_path = os.path.join(directory, "suite.epd")
+        with open(epd_path, "w") as f:
+            f.write("rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - id \"Open game\";\n")
+            f.write("# comment\n")
+            f.write("rnbqkbnr/pp1ppppp/8/2p5/4P3/8/PPPP1PPP/RNBQKBNR w KQkq c6\n")
+        pgn_path = os.path.join(directory, "suite.pgn")
+        with open(pgn_path, "w") as f:
+            f.write('[Event "A"]\n\n1. d4 d5 2. c4 *\n\n[Event "B"]\n\n1. e4 c5 *\n')
+
+        epd_suite = OpeningSuite(epd_path)
+        print(f"EPD suite: {len(epd_suite)} openings, {epd_suite.get(1)}, wraps to {epd_suite.get(2).index}")
+        pgn_suite = OpeningSuite(pgn_path)
+        print(f"PGN suite: {len(pgn_suite)} openings, {pgn_suite.get(0)}, {pgn_suite.get(1)}")
+        epd_suite.close()
+        pgn_suite.close()
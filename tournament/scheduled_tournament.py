@@ -0,0 +1,69 @@
+# tournament/scheduled_tournament.py
+from tournament.swiss_tournament import SwissTournament
+from tournament.schedulers import round_robin_schedule, gauntlet_schedule, pending_games, assign_openings
+
+class ScheduledTournament(SwissTournament):
+    """
+    Tournament whose complete schedule (a list of ScheduledGame) is known up
+    front, such as a round robin or a gauntlet. All games are handed to the
+    game execution of SwissTournament at once, so with concurrency > 1 or a
+    coordinator every game of the event can be in flight at the same time.
+    Scoring, Elo updates and database writes are those of SwissTournament.
+
+    With an opening suite, openings are assigned along the schedule: the two
+    games of a pairing with reversed colors (games_per_pairing=2) share one.
+
+    Pass the tournament_id of an interrupted tournament (and the same engines
+    and schedule) to resume it: games already stored in tournament_games are
+    skipped and counted in the standings.
+    """
+    def __init__(self, tournament_name: str, engines: list, schedule: list, db_manager, format_name: str = "scheduled",
+                 tournament_id: int | None = None, **kwargs):
+        num_rounds = max((game.round_number for game in schedule), default=0)
+        super().__init__(tournament_name, engines, num_rounds, db_manager, **kwargs)
+        self.schedule = schedule
+        if self.opening_suite is not None:
+            assign_openings(schedule, len(self.opening_suite))
+        self.format_name = format_name
+        self.tournament_id = tournament_id
+
+    @classmethod
+    def round_robin(cls, tournament_name, engines, db_manager, cycles=1, games_per_pairing=1, **kwargs):
+        """Round robin from Berger tables; cycles=2 for a double round robin."""
+        schedule = round_robin_schedule([engine.name for engine in engines], cycles, games_per_pairing)
+        return cls(tournament_name, engines, schedule, db_manager, format_name="round_robin", **kwargs)
+
+    @classmethod
+    def gauntlet(cls, tournament_name, challenger, field, db_manager, games_per_pairing=2, **kwargs):
+        """Challenger against every engine of the field."""
+        schedule = gauntlet_schedule(challenger.name, [engine.name for engine in field], games_per_pairing)
+        return cls(tournament_name, [challenger] + list(field), schedule, db_manager, format_name="gauntlet", **kwargs)
+
+    def _tournament_config(self):
+        config = super()._tournament_config()
+        config["format"] = self.format_name
+        config["games"] = len(self.schedule)
+        return config
+
+    def start_tournament(self):
+        """Starts the tournament, or resumes it if it was created with a tournament_id."""
+        if self.tournament_id is None:
+            super().start_tournament()
+        else:
+            self.resume_tournament(self.tournament_id)
+
+    def _continue_resumed_tournament(self, played):
+        """Plays the rest of the schedule: games already stored in tournament_games are skipped."""
+        return self.run_next_round()
+
+    def run_next_round(self):
+        """Plays every game of the schedule not played yet, then ends the tournament."""
+        if not self.is_tournament_running:
+            print("Tournament is not running.")
+            return False
+        games = pending_games(self.schedule, self.db_manager.get_tournament_games(self.tournament_id))
+        print(f"\n--- Playing {len(games)} of {len(self.schedule)} scheduled games ---")
+        self._play_games(games)
+        self.current_round = self.num_rounds
+        self._end_tournament()
+        return False
@@ -0,0 +1,126 @@
+# tournament/schedulers.py
+from collections import Counter
+
+class ScheduledGame:
+    """
+    One game of a tournament schedule: who plays white and black in which round
+    (engines by name), and optionally the index of its opening in an opening suite.
+    """
+    __slots__ = ("round_number", "white", "black", "opening_index")
+
+    def __init__(self, round_number: int, white: str, black: str, opening_index: int | None = None):
+        self.round_number = round_number
+        self.white = white
+        self.black = black
+        self.opening_index = opening_index
+
+    def key(self):
+        return (self.round_number, self.white, self.black)
+
+    def __repr__(self):
+        return f"ScheduledGame(round {self.round_number}: {self.white} - {self.black})"
+
+
+def berger_rounds(num_players: int) -> list:
+    """
+    Berger tables for a single round robin, as lists of (white, black) player
+    indexes (0-based) per round. With an odd number of players a dummy player
+    is added and pairings against it (byes) are left out.
+
+    Round 1 pairs 1-n, 2-(n-1), ...; each following round adds n/2 (mod n-1)
+    to every player number except n, whose color alternates every round.
+    """
+    n = num_players + (num_players % 2)
+    if n < 2:
+        return []
+    half = n // 2
+    pairs = [(i, n + 1 - i) for i in range(1, half + 1)] # 1-based player numbers
+    rounds = []
+    for round_index in range(n - 1):
+        if round_index > 0:
+            pairs = [tuple(player if player == n else (player - 1 + half) % (n - 1) + 1 for player in pair)
+                     for pair in pairs]
+            pairs[0] = (pairs[0][1], pairs[0][0]) # Player n changes color
+        rounds.append([(white - 1, black - 1) for white, black in pairs
+                       if white <= num_players and black <= num_players])
+    return rounds
+
+
+def round_robin_schedule(names: list, cycles: int = 1, games_per_pairing: int = 1) -> list:
+    """
+    Full round-robin schedule from Berger tables. Each cycle repeats the table
+    with colors reversed (cycles=2 is a double round robin). Each pairing is
+    played games_per_pairing times per round, alternating colors.
+    """
+    schedule = []
+    rounds = berger_rounds(len(names))
+    for cycle in range(cycles):
+        for round_index, pairs in enumerate(rounds):
+            round_number = cycle * len(rounds) + round_index + 1
+            for white, black in pairs:
+                if cycle % 2:
+                    white, black = black, white
+                schedule.extend(_games_for_pairing(round_number, names[white], names[black], games_per_pairing))
+    return schedule
+
+
+def gauntlet_schedule(challenger: str, field: list, games_per_pairing: int = 2) -> list:
+    """Challenger against every engine of the field, one opponent per round, alternating colors."""
+    schedule = []
+    for round_index, opponent in enumerate(field):
+        schedule.extend(_games_for_pairing(round_index + 1, challenger, opponent, games_per_pairing))
+    return schedule
+
+
+def _games_for_pairing(round_number, first, second, games_per_pairing):
+    return [ScheduledGame(round_number, first, second) if game % 2 == 0 else ScheduledGame(round_number, second, first)
+            for game in range(games_per_pairing)]
+
+
+def assign_openings(games: list, suite_size: int, first_index: int = 0):
+    """
+    Sets opening_index on scheduled games, deterministically from their order:
+    a game and the following one with the same engines in the same round,
+    colors reversed, share an opening; every other game takes the next opening
+    of the suite (wrapping around).
+    """
+    index = first_index - 1
+    previous = None
+    for game in games:
+        if previous is not None and previous.opening_index is not None and \
+           (game.round_number, game.white, game.black) == (previous.round_number, previous.black, previous.white):
+            game.opening_index = previous.opening_index
+            previous = None # Only two games per opening
+            continue
+        index += 1
+        game.opening_index = index % suite_size
+        previous = game
+
+
+def pending_games(schedule: list, played_games: list) -> list:
+    """
+    Returns the games of a schedule not played yet, in schedule order.
+    played_games are rows as returned by DBManager.get_tournament_games()
+    (round_number, white_engine_name, black_engine_name).
+    """
+    played = Counter((row['round_number'], row['white_engine_name'], row['black_engine_name']) for row in played_games)
+    pending = []
+    for game in schedule:
+        key = game.key()
+        if played[key]:
+            played[key] -= 1
+        else:
+            pending.append(game)
+    return pending
+
+
+if __name__ == '__main__':
+    # Example Usage / Simple Test:
+    for round_number, pairs in enumerate(berger_rounds(6), 1):
+        print(f"Round {round_number}: " + ", ".join(f"{white + 1}-{black + 1}" for white, black in pairs))
+    names = ["A", "B", "C", "D", "E"]
+    schedule = round_robin_schedule(names, cycles=2)
+    print(f"Double round robin of {len(names)} engines: {len(schedule)} games, e.g. {schedule[:3]}")
+    pairs_seen = Counter(frozenset((game.white, game.black)) for game in schedule)
+    print(f"Every pairing played twice: {set(pairs_seen.values()) == {2} and len(pairs_seen) == 10}")
+    print(gauntlet_schedule("New", ["A", "B"], games_per_pairing=2))
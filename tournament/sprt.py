@@ -0,0 +1,165 @@
+# tournament/sprt.py
+import math
+import random
+from datetime import datetime
+import chess
+from database.db_manager import DBManager
+from tournament.match_runner import run_game, AdjudicationRules, DEFAULT_MATE_ADJUDICATION_NODES
+
+PAIR_SCORES = (0.0, 0.25, 0.5, 0.75, 1.0) # Engine A's average score in a game pair, per pentanomial bin
+EMPTY_BIN_COUNT = 1e-3 # Stands in for empty pentanomial bins so likelihoods stay finite
+DEFAULT_MAX_PAIRS = 10000
+DEFAULT_OPENING_PLIES = 8
+
+def elo_to_score(elo: float) -> float:
+    """Expected score for a logistic Elo difference."""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def sprt_bounds(alpha: float, beta: float):
+    """Returns the (lower, upper) LLR bounds: H0 is accepted below lower, H1 above upper."""
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+def pentanomial_llr(counts, elo0: float, elo1: float) -> float:
+    """
+    Log-likelihood ratio of H1 (Elo difference elo1) against H0 (elo0) for
+    pentanomial game-pair counts, using the maximum-likelihood pair-score
+    distributions with the mean score each hypothesis implies.
+    """
+    total = sum(counts)
+    if total == 0:
+        return 0.0
+    regularized = [count if count > 0 else EMPTY_BIN_COUNT for count in counts]
+    norm = sum(regularized)
+    pdf = [count / norm for count in regularized]
+    pdf0 = _mle_distribution(pdf, elo_to_score(elo0))
+    pdf1 = _mle_distribution(pdf, elo_to_score(elo1))
+    return sum(count * math.log(p1 / p0) for count, p0, p1 in zip(counts, pdf0, pdf1) if count)
+
+
+def _mle_distribution(pdf, mean_score):
+    """
+    Closest distribution (in likelihood) to pdf over PAIR_SCORES with the given mean:
+    p_i / (1 + x * (a_i - mean)), where x solves sum p_i (a_i - mean) / (1 + x (a_i - mean)) = 0.
+    The left side decreases in x, so x is found by bisection.
+    """
+    deviations = [score - mean_score for score in PAIR_SCORES]
+    low = -1 / max(deviations) # Keep every 1 + x * deviation positive
+    high = -1 / min(deviations)
+    for _ in range(100):
+        x = (low + high) / 2
+        if sum(p * d / (1 + x * d) for p, d in zip(pdf, deviations)) > 0:
+            low = x
+        else:
+            high = x
+    x = (low + high) / 2
+    return [p / (1 + x * d) for p, d in zip(pdf, deviations)]
+
+
+def random_opening(plies: int, rng=random) -> list:
+    """Returns `plies` random legal moves from the initial position (as UCI strings), avoiding finished games."""
+    board = chess.Board()
+    moves = []
+    while len(moves) < plies:
+        move = rng.choice(list(board.legal_moves))
+        board.push(move)
+        if board.is_game_over():
+            board.pop()
+            continue
+        moves.append(move.uci())
+    return moves
+
+
+class SPRTMatch:
+    """
+    Head-to-head match deciding whether engine A (candidate) is stronger than
+    engine B (baseline) with a sequential probability ratio test.
+
+    Games are played in pairs on the same opening with colors swapped. After
+    each pair the pentanomial counts (A scoring 0, 0.5, 1, 1.5 or 2 points in
+    the pair) give an LLR for H1 (A is elo1 stronger) against H0 (elo0). The
+    match stops when the LLR leaves the bounds set by alpha and beta, or after
+    max_pairs pairs. Games, the LLR trajectory and the outcome are stored in
+    the database.
+    """
+    def __init__(self, name: str, engine_a, engine_b, db_manager: DBManager, elo0: float = 0.0, elo1: float = 5.0,
+                 alpha: float = 0.05, beta: float = 0.05, max_pairs: int = DEFAULT_MAX_PAIRS,
+                 opening_plies: int = DEFAULT_OPENING_PLIES,
+                 mate_adjudication_nodes: int = DEFAULT_MATE_ADJUDICATION_NODES, seed=None,
+                 adjudication: AdjudicationRules | None = None, time_control=None):
+        self.name = name
+        self.engine_a = engine_a
+        self.engine_b = engine_b
+        self.db_manager = db_manager
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+        self.max_pairs = max_pairs
+        self.opening_plies = opening_plies
+        self.adjudication = adjudication or AdjudicationRules(mate_search_nodes=mate_adjudication_nodes)
+        self.time_control = time_control # Optional game.chess_clock.TimeControl of every game
+        self.rng = random.Random(seed)
+        self.pentanomial = [0, 0, 0, 0, 0]
+        self.llr = 0.0
+        self.lower_bound, self.upper_bound = sprt_bounds(alpha, beta)
+        self.test_id = None
+        self.status = None
+
+    def run(self):
+        """Plays game pairs until H0 or H1 is accepted. Returns 'H0', 'H1' or 'inconclusive'."""
+        self.test_id = self.db_manager.save_sprt_test({
+            'name': self.name,
+            'engine_a_id': self.db_manager.get_engine_id(self.engine_a.name),
+            'engine_b_id': self.db_manager.get_engine_id(self.engine_b.name),
+            'elo0': self.elo0, 'elo1': self.elo1, 'alpha': self.alpha, 'beta': self.beta,
+            'start_date': datetime.now().isoformat(),
+        })
+        print(f"SPRT '{self.name}': {self.engine_a.name} vs. {self.engine_b.name}, "
+              f"elo0={self.elo0} elo1={self.elo1} alpha={self.alpha} beta={self.beta}, "
+              f"bounds [{self.lower_bound:.2f}, {self.upper_bound:.2f}]")
+
+        self.status = 'running'
+        for pair_number in range(1, self.max_pairs + 1):
+            opening = random_opening(self.opening_plies, self.rng)
+            pair_score = self._play_game(self.engine_a, self.engine_b, opening, 'white')
+            pair_score += self._play_game(self.engine_b, self.engine_a, opening, 'black')
+            self.pentanomial[int(pair_score * 2)] += 1
+            self.llr = pentanomial_llr(self.pentanomial, self.elo0, self.elo1)
+
+            if self.llr >= self.upper_bound:
+                self.status = 'H1'
+            elif self.llr <= self.lower_bound:
+                self.status = 'H0'
+            elif pair_number == self.max_pairs:
+                self.status = 'inconclusive'
+            end_date = datetime.now().isoformat() if self.status != 'running' else None
+            self.db_manager.save_sprt_progress(self.test_id, pair_number, self.llr, self.pentanomial, self.status, end_date)
+            print(f"  Pair {pair_number}: pentanomial {self.pentanomial}, LLR {self.llr:.3f}")
+            if self.status != 'running':
+                break
+
+        verdict = {'H1': f"{self.engine_a.name} is stronger (H1 accepted)",
+                   'H0': f"{self.engine_a.name} is not stronger (H0 accepted)",
+                   'inconclusive': "no decision within the pair limit"}[self.status]
+        print(f"SPRT '{self.name}' finished: {verdict}.")
+        return self.status
+
+    def _play_game(self, white_engine, black_engine, opening, engine_a_color):
+        """Plays and saves one game, returning engine A's score in it."""
+        record = run_game(white_engine, black_engine, opening_moves=opening, adjudication=self.adjudication,
+                          pgn_headers={"Event": self.name}, time_control=self.time_control)
+        self.db_manager.save_game(record.to_game_data())
+        if record.winner == 'draw':
+            return 0.5
+        return 1.0 if record.winner == engine_a_color else 0.0
+
+
+if __name__ == '__main__':
+    # Example Usage / Simple Test:
+    counts = [10, 40, 120, 60, 20] # Candidate scores about 53.5%
+    lower, upper = sprt_bounds(0.05, 0.05)
+    print(f"Bounds: [{lower:.3f}, {upper:.3f}]")
+    print(f"LLR(elo0=0, elo1=5) for {counts}: {pentanomial_llr(counts, 0, 5):.3f}")
+    print(f"LLR(elo0=0, elo1=5) for {counts[::-1]}: {pentanomial_llr(counts[::-1], 0, 5):.3f}")
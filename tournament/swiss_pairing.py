@@ -0,0 +1,194 @@
+# tournament/swiss_pairing.py
+import random
+from tournament.blossom import max_weight_matching
+
+# Pairing costs, from most to least important. A pairing's cost is the sum over its boards;
+# the round's pairing is the minimum-cost perfect matching.
+REPEAT_PAIRING_COST = 1_000_000   # Per earlier game between the two players
+ABSOLUTE_COLOR_COST = 100_000     # Both players must get the same color (imbalance > 1 or same color twice in a row)
+SCORE_DIFFERENCE_COST = 1_000     # Per (half point of score difference) squared, i.e. per floater
+STRONG_COLOR_COST = 100           # Both players have more games with the same color
+MILD_COLOR_COST = 10              # Both players would alternate to the same color
+DISTANCE_COST = 1                 # Per place between the two players in pairing order
+
+PAIRING_BLOCK_SIZE = 32 # Players matched together; pairs are only considered within a block of the pairing order
+
+def pair_round(players: list, block_size: int = PAIRING_BLOCK_SIZE, rng=random):
+    """
+    Computes the pairings of a Swiss round.
+
+    Args:
+        players: One dict per player with keys 'name', 'points', 'rating',
+                 'opponents' (names of past opponents, one entry per game),
+                 'colors' (past colors, 'w' or 'b', oldest first) and 'byes'.
+        block_size: Number of consecutive players in pairing order matched together
+                    (rounded up to an even number); see below.
+        rng: Random source, only used for the colors of the first round.
+
+    Returns:
+        (pairings, bye): pairings is a list of (white_name, black_name), top board
+        first; bye is the name of the player without an opponent, or None.
+
+    Players are ranked by points then rating. With an odd number of players the
+    lowest-ranked player with the fewest byes gets the bye. Each score group is
+    split in a top and a bottom half which are interleaved (S1[0], S2[0], S1[1], ...),
+    so neighbours in this pairing order are the standard Swiss pairings and an odd
+    player floats down next to the top of the next group. The pairing order is cut in
+    blocks of block_size players, and each block gets the minimum-cost perfect matching
+    over all its pairs (Edmonds' blossom algorithm, see tournament/blossom.py): repeat
+    pairings, color clashes and floats are traded off through the costs above. A block
+    whose matching contains a repeat pairing is merged with its neighbour and matched
+    again, widening step by step until no repeat is left or one block holds the field.
+    Fields of up to block_size players are thus matched exactly, and larger fields in
+    time linear in their size.
+    """
+    ranked = sorted(players, key=lambda p: (-p['points'], -p['rating'], p['name']))
+    bye = None
+    if len(ranked) % 2:
+        fewest_byes = min(p['byes'] for p in ranked)
+        bye = next(p for p in reversed(ranked) if p['byes'] == fewest_byes)
+        ranked = [p for p in ranked if p is not bye]
+
+    order = _pairing_order(ranked)
+    matched = _blockwise_matching(order, max(2, block_size + block_size % 2))
+    first_round = all(not p['colors'] for p in order)
+    first_white_on_top = rng.random() < 0.5
+
+    pairings = []
+    for board, (i, j) in enumerate(sorted(matched)):
+        higher, lower = order[i], order[j]
+        if first_round:
+            higher_gets_white = first_white_on_top == (board % 2 == 0)
+        else:
+            higher_gets_white = _higher_ranked_gets_white(higher, lower)
+        white, black = (higher, lower) if higher_gets_white else (lower, higher)
+        pairings.append((white['name'], black['name']))
+    return pairings, bye['name'] if bye else None
+
+
+def _pairing_order(ranked):
+    """Interleaves the top and bottom half of each score group."""
+    order = []
+    index = 0
+    while index < len(ranked):
+        end = index
+        while end < len(ranked) and ranked[end]['points'] == ranked[index]['points']:
+            end += 1
+        group = ranked[index:end]
+        half = len(group) // 2
+        top, bottom = group[:half], group[half:]
+        for pair in zip(top, bottom):
+            order.extend(pair)
+        order.extend(bottom[len(top):]) # Odd player: floats down to the next group
+        index = end
+    return order
+
+
+def _blockwise_matching(order, block_size):
+    """
+    Matches `order` (even count) block by block, block_size (even) players at a time; a
+    block whose matching has a repeat pairing is merged with the next block (the previous
+    one for the last block) and matched again. Returns a list of (i, j) index pairs, i < j.
+    """
+    n = len(order)
+    starts = list(range(0, n, block_size))
+    if len(starts) > 1 and n - starts[-1] < block_size // 2:
+        starts.pop() # A short last block joins the one before it
+    blocks = [[start, end, None] for start, end in zip(starts, starts[1:] + [n])] # start, end, matching
+    preferences = [_color_preference(p['colors']) for p in order]
+    index = 0
+    while index < len(blocks):
+        start, end, matched = blocks[index]
+        if matched is None:
+            matched = blocks[index][2] = _min_cost_matching(order, preferences, start, end)
+        if len(blocks) > 1 and any(order[i]['opponents'].count(order[j]['name']) for i, j in matched):
+            first = index if index + 1 < len(blocks) else index - 1
+            blocks[first:first + 2] = [[blocks[first][0], blocks[first + 1][1], None]]
+            index = first
+            continue
+        index += 1
+    return [pair for _, _, matched in blocks for pair in matched]
+
+
+def _min_cost_matching(order, preferences, start, end):
+    """
+    Minimum-cost perfect matching over all pairs of the players order[start:end] (even count).
+    Returns a list of (i, j) indices into order with i < j.
+    """
+    if start == end:
+        return []
+    costs = [(i, j, round(_pairing_cost(order[i], order[j], j - i, preferences[i], preferences[j])))
+             for i in range(start, end) for j in range(i + 1, end)] # Integers: the matching is then exact
+    # Every perfect matching has the same number of boards, so the heaviest of weights
+    # (max_cost + 1 - cost) has the lowest cost
+    max_cost = max(cost for _, _, cost in costs)
+    mate = max_weight_matching([(i - start, j - start, max_cost + 1 - cost) for i, j, cost in costs],
+                               max_cardinality=True)
+    return [(start + i, start + partner) for i, partner in enumerate(mate) if partner > i]
+
+
+def _color_preference(colors):
+    """
+    Signed color preference: positive for white, negative for black.
+    3 is absolute, 2 strong, 1 mild, 0 none (no games yet).
+    """
+    if not colors:
+        return 0
+    balance = colors.count('b') - colors.count('w')
+    wants = 1 if balance > 0 or (balance == 0 and colors[-1] == 'b') else -1
+    if abs(balance) > 1 or (len(colors) >= 2 and colors[-1] == colors[-2]):
+        return 3 * wants
+    if balance != 0:
+        return 2 * wants
+    return wants
+
+
+def _pairing_cost(a, b, distance, pref_a, pref_b):
+    """Cost of pairing a with b, `distance` places apart in pairing order, given their color preferences."""
+    cost = REPEAT_PAIRING_COST * a['opponents'].count(b['name'])
+    cost += SCORE_DIFFERENCE_COST * (2 * (a['points'] - b['points'])) ** 2
+    cost += DISTANCE_COST * (distance - 1)
+    if pref_a * pref_b > 0: # Both want the same color
+        weaker = min(abs(pref_a), abs(pref_b))
+        cost += {3: ABSOLUTE_COLOR_COST, 2: STRONG_COLOR_COST, 1: MILD_COLOR_COST}[weaker]
+    return cost
+
+
+def _higher_ranked_gets_white(higher, lower):
+    """The stronger color preference wins; on equal strength the higher-ranked player gets theirs."""
+    pref_higher, pref_lower = _color_preference(higher['colors']), _color_preference(lower['colors'])
+    if abs(pref_lower) > abs(pref_higher):
+        return pref_lower < 0
+    if pref_higher != 0:
+        return pref_higher > 0
+    return pref_lower < 0
+
+
+if __name__ == '__main__':
+    # Example Usage / Simple Test: a 9-round event with 1001 players of random strength
+    import time
+    rng = random.Random(1)
+    players = [{'name': f"E{i}", 'points': 0.0, 'rating': rng.randint(1000, 2800), 'opponents': [],
+                'colors': [], 'byes': 0} for i in range(1001)]
+    by_name = {p['name']: p for p in players}
+    for round_number in range(1, 10):
+        start = time.perf_counter()
+        pairings, bye = pair_round(players, rng=rng)
+        elapsed = time.perf_counter() - start
+        repeats = sum(by_name[white]['opponents'].count(black) for white, black in pairings)
+        for white_name, black_name in pairings:
+            white, black = by_name[white_name], by_name[black_name]
+            expected = 1 / (1 + 10 ** ((black['rating'] - white['rating']) / 400))
+            score = 1.0 if rng.random() < expected else 0.0
+            white['points'] += score
+            black['points'] += 1.0 - score
+            white['opponents'].append(black_name)
+            black['opponents'].append(white_name)
+            white['colors'].append('w')
+            black['colors'].append('b')
+        if bye is not None:
+            by_name[bye]['points'] += 1.0
+            by_name[bye]['byes'] += 1
+        max_imbalance = max(abs(p['colors'].count('w') - p['colors'].count('b')) for p in players)
+        print(f"Round {round_number}: {len(pairings)} boards in {elapsed * 1000:.0f} ms, "
+              f"{repeats} repeat pairings, max color imbalance {max_imbalance}, bye {bye}")
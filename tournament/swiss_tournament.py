@@ -1,19 +1,57 @@
 # tournament/swiss_tournament.py
-import chess
-from game.chess_game_manager import ChessGameManager
 from database.db_manager import DBManager
 from tournament.elo_calculator import update_elos, DEFAULT_K_FACTOR # Import Elo functions
+from tournament.glicko2 import rate_period, DEFAULT_RATING, DEFAULT_RD, DEFAULT_VOLATILITY
+from tournament.match_runner import run_game, run_game_from_data, AdjudicationRules, DEFAULT_MATE_ADJUDICATION_NODES
+from tournament.swiss_pairing import pair_round
+from tournament.schedulers import ScheduledGame, assign_openings, pending_games
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import random
+import time
+
+RATING_SYSTEMS = ("elo", "glicko2")
+RESULT_SCORES = {"white_win": 1.0, "black_win": 0.0, "draw": 0.5} # White's score per tournament_games result
+WORKER_GAME_TIMEOUT = 900.0 # Seconds to wait for a remote worker's game before replaying it here
+RESULT_SAVE_ATTEMPTS = 3 # Tries to save a batch of results (e.g. while another process locks the database)
+RESULT_SAVE_RETRY_DELAY = 2.0 # Seconds between those tries
 
 class SwissTournament:
     """
     Manages a Swiss-style chess tournament for AI engines.
     Handles pairings, game execution, and scoring.
     """
-    def __init__(self, tournament_name: str, engines: list, num_rounds: int, db_manager: DBManager):
+    def __init__(self, tournament_name: str, engines: list, num_rounds: int, db_manager: DBManager,
+                 mate_adjudication_nodes: int = DEFAULT_MATE_ADJUDICATION_NODES, concurrency: int = 1, coordinator=None,
+                 opening_suite=None, adjudication: AdjudicationRules | None = None, time_control=None,
+                 rating_system: str = "elo", result_batch_size: int = 1, worker_game_timeout: float = WORKER_GAME_TIMEOUT):
+        if rating_system not in RATING_SYSTEMS:
+            raise ValueError(f"Unknown rating system {rating_system!r}, expected one of {RATING_SYSTEMS}")
         self.tournament_name = tournament_name
+        self.db_manager = db_manager
+        # 'elo': K-factor update after every game; 'glicko2': one batched Glicko-2 update per round (rating period)
+        self.rating_system = rating_system
+        # Optional tournament.openings.OpeningSuite: each pairing then plays one of its openings twice, colors reversed
+        self.opening_suite = opening_suite
+        # Games of a round played at the same time in worker processes (1 plays them one by one here)
+        self.concurrency = concurrency
+        # Optional started tournament.distributed.GameCoordinator: games are then played by remote workers
+        self.coordinator = coordinator
+        # Seconds to wait for each coordinator game; a game not back in time is withdrawn and replayed here
+        self.worker_game_timeout = worker_game_timeout
+        self._executor = None
+        # Node budget of the checks-only mate search run after each move to adjudicate forced wins (0, the default, disables it)
+        self.mate_adjudication_nodes = mate_adjudication_nodes
+        # Resign/draw/tablebase rules of every game; defaults with the mate search budget above if None
+        self.adjudication = adjudication or AdjudicationRules(mate_search_nodes=mate_adjudication_nodes)
+        # Optional game.chess_clock.TimeControl of every game; engines that overstep it lose on time
+        self.time_control = time_control
+        # Game results saved per transaction, together with the checkpoint counting them. 1 saves every game
+        # as soon as it is played; larger batches save commits, and a crash replays the games not saved yet
+        self.result_batch_size = result_batch_size
+        self._results = db_manager.result_batch()
         self.engines = engines # List of engine objects (instances of BaseChessEngine subclasses)
+        self._engines_by_name = {engine.name: engine for engine in engines}
         # Ensure each engine object has an 'id' and 'elo' attribute, fetched from DB or set at registration
         for engine in self.engines:
             if not hasattr(engine, 'id') or not hasattr(engine, 'elo'):
@@ -29,11 +67,12 @@ class SwissTournament:
                     print(f"Warning: Engine {engine.name} missing ID/Elo. Using default Elo 1200.")
 
         self.num_rounds = num_rounds
-        self.db_manager = db_manager
         self.engine_scores = {
             engine.name: {
                 "points": 0.0,
                 "opponents": [], # List of opponent names
+                "colors": [], # Colors played, 'w' or 'b', oldest first
+                "byes": 0,
                 "games_played": 0,
                 "wins": 0,
                 "losses": 0,
@@ -43,18 +82,28 @@ class SwissTournament:
                 "current_elo": engine.elo  # Store current Elo, updated after each game
             } for engine in engines
         }
+        if rating_system == "glicko2":
+            # initial_elo/current_elo then hold Glicko-2 ratings, which pairings and tournament stats use alike
+            for engine in engines:
+                engine_data = self.db_manager.get_engine_by_name(engine.name) or {}
+                scores = self.engine_scores[engine.name]
+                scores["initial_elo"] = scores["current_elo"] = engine_data.get('glicko_rating', DEFAULT_RATING)
+                scores["rd"] = engine_data.get('glicko_rd', DEFAULT_RD)
+                scores["volatility"] = engine_data.get('glicko_volatility', DEFAULT_VOLATILITY)
+        self.unrated_games = [] # (round_number, white_name, black_name, white_score) waiting for their rating period
+        self.rated_round = 0 # Last round whose rating period has been applied (Glicko-2)
         self.tournament_id = None
         self.current_round = 0
         self.games_in_round = [] # Stores (white_engine, black_engine) for current round
+        self.round_games = [] # ScheduledGame list of the current round, kept in checkpoints for resuming
+        self.games_recorded = 0 # Games of this tournament stored in tournament_games
+        self.rng = random.Random() # Colors of the first round
         self.ongoing_game_state = None # To hold the state of an individual game being played if run step-by-step
         self.is_tournament_running = False
 
     def start_tournament(self):
         """Initializes and starts the tournament, saving its details to the database."""
-        tournament_config = {
-            "engines": [e.name for e in self.engines],
-            "rounds": self.num_rounds
-        }
+        tournament_config = self._tournament_config()
         self.tournament_id = self.db_manager.save_tournament({
             'name': self.tournament_name,
             'start_date': datetime.now().isoformat(),
@@ -68,6 +117,19 @@ class SwissTournament:
             print(f"Tournament '{self.tournament_name}' started with ID: {self.tournament_id}")
             self.run_next_round() # Start the first round
 
+    def _tournament_config(self):
+        """Settings stored with the tournament in the database."""
+        return {
+            "format": "swiss",
+            "engines": [e.name for e in self.engines],
+            "rounds": self.num_rounds,
+            "opening_suite": self.opening_suite.path if self.opening_suite is not None else None,
+            "adjudication": self.adjudication.to_dict(),
+            "time_control": str(self.time_control) if self.time_control else None,
+            "rating_system": self.rating_system,
+            "result_batch_size": self.result_batch_size,
+        }
+
     def run_next_round(self):
         """
         Generates pairings for the next round based on Swiss system rules
@@ -82,47 +144,44 @@ class SwissTournament:
         print(f"\n--- Starting Round {self.current_round} ---")
         self.games_in_round = [] # Reset games for the new round
 
-        # Simple pairing: Sort by score, then pair adjacent.
-        # In a real Swiss system, you'd avoid pairing same opponents twice,
-        # balance colors, and handle bye if odd number of players.
-        sorted_engines = sorted(self.engines, key=lambda e: self.engine_scores[e.name]["points"], reverse=True)
-        
-        # Ensure engines play each other as white and black equally over rounds
-        # Simple alternating color assignment for pairings:
-        pairings = []
-        # Create a list of available engines for pairing
-        available_engines = list(sorted_engines)
-        random.shuffle(available_engines) # Randomize within score groups
-
-        while len(available_engines) >= 2:
-            e1 = available_engines.pop(0)
-            e2 = available_engines.pop(0)
-
-            # Basic color balancing: if e1 played white last, e2 plays white this time.
-            # This is a very simplified heuristic.
-            if self.engine_scores[e1.name]["games_played"] <= self.engine_scores[e2.name]["games_played"]:
-                white_engine, black_engine = e1, e2
-            else:
-                white_engine, black_engine = e2, e1
-            
-            pairings.append((white_engine, black_engine))
-
-        if len(available_engines) == 1:
-            # Handle bye (if odd number of engines) - this engine gets a "win" without playing
-            # For simplicity, we'll just ignore it for now or give a half point bye.
-            # A true Swiss system gives a bye to the lowest score available that hasn't had one.
-            print(f"Engine {available_engines[0].name} has a bye this round (odd number of engines).")
-            self.engine_scores[available_engines[0].name]["points"] += 1.0 # Full point bye
-            self.engine_scores[available_engines[0].name]["games_played"] += 1
-
-
-        for white_engine, black_engine in pairings:
-            print(f"Pairing: {white_engine.name} (White) vs. {black_engine.name} (Black)")
-            self.games_in_round.append((white_engine, black_engine))
-            # In a real UI, you'd run these games one by one or in parallel
-            self._play_single_game(white_engine, black_engine)
-        
-        # After all games in the round are played (or simulated)
+        # Swiss pairing: score groups with floaters, no repeat pairings, color balance and bye rotation
+        players = [{
+            'name': engine.name,
+            'points': self.engine_scores[engine.name]["points"],
+            'rating': self.engine_scores[engine.name]["current_elo"],
+            'opponents': self.engine_scores[engine.name]["opponents"],
+            'colors': self.engine_scores[engine.name]["colors"],
+            'byes': self.engine_scores[engine.name]["byes"],
+        } for engine in self.engines]
+        name_pairings, bye_name = pair_round(players, rng=self.rng)
+
+        if bye_name is not None:
+            # The bye goes to the lowest-ranked engine that has had the fewest byes; it scores a full point
+            print(f"Engine {bye_name} has a bye this round (odd number of engines).")
+            self.engine_scores[bye_name]["points"] += 1.0 # Full point bye
+            self.engine_scores[bye_name]["games_played"] += 1
+            self.engine_scores[bye_name]["byes"] += 1
+
+        games = []
+        for white, black in name_pairings:
+            games.append(ScheduledGame(self.current_round, white, black))
+            if self.opening_suite is not None:
+                games.append(ScheduledGame(self.current_round, black, white)) # Same opening, colors reversed
+        if self.opening_suite is not None:
+            # Each round starts at its own block of the suite, so the choice only depends on round and board
+            assign_openings(games, len(self.opening_suite), (self.current_round - 1) * (len(self.engines) // 2))
+        for game in games:
+            print(f"Pairing: {game.white} (White) vs. {game.black} (Black)")
+            self.games_in_round.append((self._engines_by_name[game.white], self._engines_by_name[game.black]))
+        self.round_games = games
+        self._save_checkpoint()
+        self._play_games(games)
+        return self._finish_round()
+
+    def _finish_round(self):
+        """Wraps up a round whose games are all played; returns True if more rounds are to be played."""
+        self._flush_results()
+        self._rate_periods()
         self.db_manager.update_tournament_status(self.tournament_id, "ongoing")
         self.get_standings() # Print standings after each round
 
@@ -131,56 +190,264 @@ class SwissTournament:
             return False # Tournament completed
         return True # More rounds to play
 
+    def _save_checkpoint(self):
+        """
+        Stores everything needed to resume the tournament after a crash (see resume_tournament()),
+        in the same transaction as the game results not saved yet.
 
-    def _play_single_game(self, white_engine, black_engine):
-        """Plays a single game between two engines."""
-        game_manager = ChessGameManager()
-        game_manager.reset_game() # Ensure fresh board for each game
-        
-        white_engine.set_board(game_manager.get_board_object())
-        black_engine.set_board(game_manager.get_board_object())
+        If the results cannot be saved after RESULT_SAVE_ATTEMPTS tries, the tournament is stopped
+        with a RuntimeError rather than played on with scores the database does not have. The
+        results stay buffered; resume_tournament() replays the games the last checkpoint lacks.
+        """
+        state = self._checkpoint_state()
+        if not len(self._results):
+            self.db_manager.save_tournament_checkpoint(self.tournament_id, self.current_round, state)
+            return
+        self._results.set_checkpoint(self.tournament_id, self.current_round, state)
+        for attempt in range(1, RESULT_SAVE_ATTEMPTS + 1):
+            if self._results.flush() is not None:
+                return
+            if attempt < RESULT_SAVE_ATTEMPTS:
+                print(f"Error: could not save {len(self._results)} game results, retrying in {RESULT_SAVE_RETRY_DELAY}s.")
+                time.sleep(RESULT_SAVE_RETRY_DELAY)
+        self.is_tournament_running = False
+        raise RuntimeError(f"Could not save {len(self._results)} game results of tournament {self.tournament_id}; "
+                           f"tournament stopped, resume it once the database is writable.")
+
+    def _checkpoint_state(self):
+        """The tournament state stored in checkpoints (see _save_checkpoint())."""
+        version, internal_state, gauss_next = self.rng.getstate()
+        return {
+            "current_round": self.current_round,
+            "engine_scores": self.engine_scores,
+            "round_games": [[game.round_number, game.white, game.black, game.opening_index] for game in self.round_games],
+            "games_recorded": self.games_recorded,
+            "rated_round": self.rated_round,
+            "rng_state": [version, list(internal_state), gauss_next],
+        }
 
-        start_time = datetime.now()
-        game_result = "unknown" # For internal tracking before saving
+    def _flush_results(self):
+        """Saves the buffered game results (see result_batch_size) with a checkpoint counting them."""
+        if len(self._results):
+            self._save_checkpoint()
 
-        print(f"  Game: {white_engine.name} (W) vs. {black_engine.name} (B)")
-        move_count = 0
-        max_moves = 200 # Prevent infinite games for simple AIs
-        
-        while not game_manager.is_game_over() and move_count < max_moves:
-            current_turn = game_manager.get_board_object().turn
-            if current_turn == chess.WHITE:
-                engine_to_move = white_engine
-            else:
-                engine_to_move = black_engine
-            
-            # Sync engine's internal board before asking for move
-            engine_to_move.set_board(game_manager.get_board_object())
-            move = engine_to_move.make_move()
-
-            if move:
-                if game_manager.make_move(move.uci()):
-                    move_count += 1
+    def resume_tournament(self, tournament_id):
+        """
+        Continues an interrupted tournament, e.g. after a crash. Create the
+        SwissTournament with the same engines and settings first.
+
+        The last checkpoint restores scores, opponent and color history, byes,
+        the current round's pairings and the pairing RNG. Games stored in
+        tournament_games after the checkpoint was written are counted on top,
+        and current Elos are read back from the engines table. The unplayed
+        games of the interrupted round are then played.
+        Returns True if more rounds are to be played (see run_next_round()).
+        """
+        tournament = self.db_manager.get_tournament(tournament_id)
+        if tournament is None:
+            print(f"Tournament {tournament_id} not found, cannot resume it.")
+            return False
+        if tournament['status'] == 'completed':
+            print(f"Tournament {tournament_id} is already completed.")
+            return False
+        self.tournament_id = tournament_id
+        self.num_rounds = tournament['rounds'] or self.num_rounds
+        played = self.db_manager.get_tournament_games(tournament_id)
+        self._restore_state(played)
+        self.is_tournament_running = True
+        print(f"Tournament '{self.tournament_name}' (ID {tournament_id}) resumed: {len(played)} games already played.")
+        return self._continue_resumed_tournament(played)
+
+    def _restore_state(self, played):
+        """Rebuilds engine_scores, the current round and the pairing RNG from the checkpoint and the played games."""
+        checkpoint = self.db_manager.get_tournament_checkpoint(self.tournament_id)
+        new_games = played
+        if checkpoint is not None:
+            state = checkpoint['state']
+            for name, scores in state["engine_scores"].items():
+                if name in self.engine_scores:
+                    scores["id"] = self.engine_scores[name]["id"]
+                    self.engine_scores[name].update(scores)
                 else:
-                    print(f"  Error: {engine_to_move.name} made illegal move {move.uci()}")
-                    # Forfeit or error handling
-                    if engine_to_move == white_engine: game_result = "black_win"
-                    else: game_result = "white_win"
-                    break
+                    print(f"Warning: engine {name} of the checkpoint is not part of the tournament, ignoring it.")
+            self.current_round = state["current_round"]
+            self.round_games = [ScheduledGame(*game) for game in state["round_games"]]
+            version, internal_state, gauss_next = state["rng_state"]
+            self.rng.setstate((version, tuple(internal_state), gauss_next))
+            new_games = played[state["games_recorded"]:] # Saved after the last checkpoint
+            self.rated_round = state.get("rated_round", 0)
+        else:
+            self.current_round = max((row['round_number'] for row in played), default=0)
+        for row in new_games:
+            self._restore_game_result(row)
+        self.games_recorded = len(played)
+        if self.rating_system == "glicko2":
+            self.unrated_games = [(row['round_number'], row['white_engine_name'], row['black_engine_name'],
+                                   RESULT_SCORES[row['result']])
+                                  for row in played if row['round_number'] > self.rated_round]
+
+        # Elos are saved with their game, and Glicko-2 ratings with the checkpoint of their period
+        for name, scores in self.engine_scores.items():
+            engine_data = self.db_manager.get_engine_by_name(name)
+            if engine_data is None:
+                continue
+            if self.rating_system == "glicko2":
+                scores["current_elo"] = engine_data['glicko_rating']
+                scores["rd"] = engine_data['glicko_rd']
+                scores["volatility"] = engine_data['glicko_volatility']
             else:
-                print(f"  {engine_to_move.name} failed to make a move (no legal moves?).")
-                # This might indicate game over, or a bug in engine
-                break
+                scores["current_elo"] = engine_data['elo']
+
+    def _restore_game_result(self, row):
+        """Counts a game stored in tournament_games in the standings (Elos are already in the engines table)."""
+        white, black = self.engine_scores[row['white_engine_name']], self.engine_scores[row['black_engine_name']]
+        if row['result'] == 'white_win':
+            white["points"] += 1.0
+            white["wins"] += 1
+            black["losses"] += 1
+        elif row['result'] == 'black_win':
+            black["points"] += 1.0
+            black["wins"] += 1
+            white["losses"] += 1
+        else:
+            for scores in (white, black):
+                scores["points"] += 0.5
+                scores["draws"] += 1
+        for scores, opponent, color in ((white, row['black_engine_name'], 'w'), (black, row['white_engine_name'], 'b')):
+            scores["games_played"] += 1
+            scores["opponents"].append(opponent)
+            scores["colors"].append(color)
+
+    def _continue_resumed_tournament(self, played):
+        """Plays the games of the interrupted round that are not in tournament_games yet."""
+        if not self.round_games: # No checkpoint: continue with the next round
+            if self.current_round >= self.num_rounds:
+                self._end_tournament()
+                return False
+            return True
+        round_played = [row for row in played if row['round_number'] == self.current_round]
+        games = pending_games(self.round_games, round_played)
+        print(f"\n--- Resuming Round {self.current_round}: {len(games)} of {len(self.round_games)} games left ---")
+        self.games_in_round = [(self._engines_by_name[game.white], self._engines_by_name[game.black])
+                               for game in self.round_games]
+        self._play_games(games)
+        return self._finish_round()
+
+
+    def _play_games(self, games):
+        """Plays a list of ScheduledGame, with the coordinator's workers, a process pool or one by one here."""
+        if self.coordinator is not None:
+            self._play_games_distributed(games)
+        elif self.concurrency > 1 and len(games) > 1:
+            self._play_games_in_parallel(games)
+        else:
+            for game in games:
+                self._play_single_game(game)
+
+    def _game_options(self, game):
+        """Keyword arguments of run_game() for a scheduled game."""
+        options = {
+            "adjudication": self.adjudication,
+            "time_control": self.time_control,
+            "pgn_headers": {"Event": self.tournament_name, "Round": str(game.round_number)},
+        }
+        if game.opening_index is not None:
+            opening = self.opening_suite.get(game.opening_index)
+            options["start_fen"] = opening.fen
+            options["opening_moves"] = opening.moves
+        return options
 
-        end_time = datetime.now()
-        winner, reason = game_manager.get_game_result()
-        score_white = 0.0
-        score_black = 0.0
+    def _play_single_game(self, game):
+        """Plays a single game between two engines."""
+        white_engine, black_engine = self._engines_by_name[game.white], self._engines_by_name[game.black]
+        print(f"  Game: {white_engine.name} (W) vs. {black_engine.name} (B)")
+        record = run_game(white_engine, black_engine, **self._game_options(game))
+        self._record_game(game, record)
 
-        winner, reason = game_manager.get_game_result()
-        score_white = 0.0
-        # score_black is not explicitly needed for Elo update if using score_white, but good for clarity
-        # score_black = 0.0
+    def _engine_records(self):
+        """
+        Returns the DB records of all engines by name, which worker processes and
+        remote workers build their engine instances from, or None if an engine
+        is not registered in the database.
+        """
+        engine_data = {}
+        for engine in self.engines:
+            data = self.db_manager.get_engine_by_name(engine.name)
+            if data is None:
+                print(f"Engine {engine.name} is not in the database, playing the games sequentially.")
+                return None
+            engine_data[engine.name] = data
+        return engine_data
+
+    def _play_games_in_parallel(self, games):
+        """
+        Plays games in worker processes. Each worker builds its own engine
+        instances from the engines' DB records, so engines must be registered
+        in the database; otherwise the games are played sequentially.
+        Results are scored and saved here, in schedule order, as they become available.
+        """
+        engine_data = self._engine_records()
+        if engine_data is None:
+            for game in games:
+                self._play_single_game(game)
+            return
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.concurrency)
+        futures = [self._executor.submit(run_game_from_data, engine_data[game.white], engine_data[game.black],
+                                         **self._game_options(game))
+                   for game in games]
+        self._collect_results(games, [future.result for future in futures])
+
+    def _play_games_distributed(self, games):
+        """
+        Same as _play_games_in_parallel(), with the games handed to the coordinator's remote workers.
+        A game whose result is not back worker_game_timeout seconds after it is waited for is replayed here.
+        """
+        engine_data = self._engine_records()
+        if engine_data is None:
+            for game in games:
+                self._play_single_game(game)
+            return
+
+        job_ids = [self.coordinator.submit(engine_data[game.white], engine_data[game.black], **self._game_options(game))
+                   for game in games]
+        self._collect_results(games, [lambda job_id=job_id: self.coordinator.wait_for_result(job_id,
+                                                                                              self.worker_game_timeout)
+                                      for job_id in job_ids])
+
+    def _collect_results(self, games, result_getters):
+        """
+        Waits for each game's GameRecord (result_getters block until it is available) and records it.
+        A game a worker could not play is replayed here, so every scheduled game gets a result.
+        """
+        for game, get_result in zip(games, result_getters):
+            try:
+                record = get_result()
+            except Exception as e:
+                print(f"  Error: game {game.white} vs. {game.black} could not be played by a worker ({e}), replaying it here.")
+                self._play_single_game(game)
+                continue
+            print(f"  Game: {game.white} (W) vs. {game.black} (B)")
+            self._record_game(game, record)
+
+    def _record_game(self, game, record):
+        """Scores a finished game, updates Elos and saves it to the database."""
+        white_engine, black_engine = self._engines_by_name[game.white], self._engines_by_name[game.black]
+        winner, reason = record.winner, record.reason
+
+        if reason == 'illegal move':
+            loser = white_engine if winner == 'black' else black_engine
+            print(f"  Error: {loser.name} made an illegal move, forfeiting the game.")
+        elif reason == 'forced mate (adjudicated)':
+            print(f"  Forced mate found for {winner}, adjudicating the game.")
+        elif reason == 'time forfeit':
+            loser = white_engine if winner == 'black' else black_engine
+            print(f"  {loser.name} lost on time.")
+        elif reason == 'max moves reached':
+            print(f"  Game ended due to max moves ({record.plies}). Declaring a draw.")
+        elif reason == 'unknown termination':
+            print(f"  Game ended due to unknown reason (e.g. engine failed move). Declaring a draw for scoring.")
 
         if winner == 'white':
             self.engine_scores[white_engine.name]["points"] += 1.0
@@ -194,31 +461,44 @@ class SwissTournament:
             self.engine_scores[white_engine.name]["losses"] += 1
             game_result = "black_win"
             score_white = 0.0 # White lost
-        elif winner == 'draw': # Explicit draw from game manager
+        else: # Draw, including the move cap and engine failures
             self.engine_scores[white_engine.name]["points"] += 0.5
             self.engine_scores[black_engine.name]["points"] += 0.5
             self.engine_scores[white_engine.name]["draws"] += 1
             self.engine_scores[black_engine.name]["draws"] += 1
             game_result = "draw"
             score_white = 0.5
-        else: # Game ended due to max moves or other non-standard condition
-            if move_count >= max_moves:
-                reason = "max moves reached"
-                print(f"  Game ended due to max moves ({max_moves}). Declaring a draw.")
-            else:
-                reason = "unknown termination" # Or could be based on last player to fail a move if that was the case
-                print(f"  Game ended due to unknown reason (e.g. engine failed move). Declaring a draw for scoring.")
-
-            self.engine_scores[white_engine.name]["points"] += 0.5
-            self.engine_scores[black_engine.name]["points"] += 0.5
-            game_result = "draw" # Treat as draw for tournament scoring
-            score_white = 0.5
-            score_black = 0.5
 
         self.engine_scores[white_engine.name]["games_played"] += 1
         self.engine_scores[black_engine.name]["games_played"] += 1
-
-        # Elo Update
+        self.engine_scores[white_engine.name]["opponents"].append(black_engine.name)
+        self.engine_scores[black_engine.name]["opponents"].append(white_engine.name)
+        self.engine_scores[white_engine.name]["colors"].append('w')
+        self.engine_scores[black_engine.name]["colors"].append('b')
+
+        rating_changes = None
+        if self.rating_system == "glicko2":
+            # Rated with the rest of the round in _rate_periods()
+            self.unrated_games.append((game.round_number, white_engine.name, black_engine.name, score_white))
+            print(f"  Result: {winner if winner else 'Draw'} by {reason if reason else 'N/A'}.")
+        else:
+            rating_changes = self._update_elos(white_engine, black_engine, winner, reason, score_white)
+
+        # Game, Elo changes, rating history, leaderboard, tournament_games row and checkpoint
+        # are saved in one transaction, for result_batch_size games at a time
+        game_data = record.to_game_data(self.tournament_id)
+        game_data['opening_index'] = game.opening_index
+        self._results.add_game(game_data, rating_changes=rating_changes,
+                               tournament_game={'round_number': game.round_number, 'result': game_result})
+        self.games_recorded += 1
+        if len(self._results) >= self.result_batch_size:
+            self._save_checkpoint()
+
+    def _update_elos(self, white_engine, black_engine, winner, reason, score_white):
+        """
+        K-factor Elo update after a single game. Returns the changes as
+        (engine_id, 'elo', before, after) for DBManager.save_game() to store with the game.
+        """
         white_id = self.engine_scores[white_engine.name]["id"]
         black_id = self.engine_scores[black_engine.name]["id"]
 
@@ -228,44 +508,52 @@ class SwissTournament:
 
         new_elo_w, new_elo_b = update_elos(elo_w, elo_b, score_white) # score_white is 1.0, 0.5, or 0.0
 
-        self.db_manager.update_engine_elo(white_id, new_elo_w)
-        self.db_manager.update_engine_elo(black_id, new_elo_b)
-
         self.engine_scores[white_engine.name]["current_elo"] = new_elo_w
         self.engine_scores[black_engine.name]["current_elo"] = new_elo_b
 
         print(f"  Result: {winner if winner else 'Draw'} by {reason if reason else 'N/A'}. Elos: {white_engine.name} ({elo_w}->{new_elo_w}), {black_engine.name} ({elo_b}->{new_elo_b})")
+        return [(white_id, 'elo', elo_w, new_elo_w), (black_id, 'elo', elo_b, new_elo_b)]
 
-        # Save game to main games table
-        game_data = {
-            'start_time': start_time.isoformat(),
-            'end_time': end_time.isoformat(),
-            'winner': winner if winner else 'draw',
-            'reason': reason if reason else 'max moves reached',
-            'pgn': game_manager.get_pgn(),
-            'white_player_type': 'engine',
-            'black_player_type': 'engine',
-            'white_player_name': white_engine.name,
-            'black_player_name': black_engine.name,
-            'engine_white_id': self.db_manager.get_engine_id(white_engine.name),
-            'engine_black_id': self.db_manager.get_engine_id(black_engine.name),
-            'tournament_id': self.tournament_id
-        }
-        game_id = self.db_manager.save_game(game_data)
-        
-        # Save game to tournament_games table
-        if game_id:
-            self.db_manager.save_tournament_game_result(
-                self.tournament_id,
-                game_id,
-                self.current_round,
-                self.db_manager.get_engine_id(white_engine.name),
-                self.db_manager.get_engine_id(black_engine.name),
-                game_result
-            )
+    def _rate_periods(self):
+        """
+        Glicko-2: applies the rating period of every round with unrated games, in round
+        order, to all engines at once, and stores the new ratings in one transaction with
+        the checkpoint that marks the rounds as rated. If that transaction fails the
+        tournament is stopped with a RuntimeError; resume_tournament() rates the rounds again.
+        """
+        if self.rating_system != "glicko2" or not self.unrated_games:
+            return
+        names = [engine.name for engine in self.engines]
+        index = {name: i for i, name in enumerate(names)}
+        ratings = [self.engine_scores[name]["current_elo"] for name in names]
+        rds = [self.engine_scores[name]["rd"] for name in names]
+        volatilities = [self.engine_scores[name]["volatility"] for name in names]
+        for round_number in sorted({game[0] for game in self.unrated_games}):
+            period = [game for game in self.unrated_games if game[0] == round_number]
+            ratings, rds, volatilities = rate_period(ratings, rds, volatilities,
+                                                     [index[white] for _, white, _, _ in period],
+                                                     [index[black] for _, _, black, _ in period],
+                                                     [score for _, _, _, score in period])
+            self.rated_round = max(self.rated_round, round_number)
+
+        updates = []
+        for i, name in enumerate(names):
+            scores = self.engine_scores[name]
+            print(f"  Glicko-2: {name} {scores['current_elo']:.0f} (RD {scores['rd']:.0f}) -> "
+                  f"{ratings[i]:.0f} (RD {rds[i]:.0f})")
+            scores["current_elo"], scores["rd"], scores["volatility"] = float(ratings[i]), float(rds[i]), float(volatilities[i])
+            updates.append((scores["id"], scores["current_elo"], scores["rd"], scores["volatility"]))
+        self.unrated_games = []
+        checkpoint = (self.tournament_id, self.current_round, self._checkpoint_state())
+        if not self.db_manager.update_glicko_ratings(updates, self.tournament_id, checkpoint):
+            self.is_tournament_running = False
+            raise RuntimeError(f"Could not save the Glicko-2 ratings of tournament {self.tournament_id}; "
+                               f"tournament stopped, resume it once the database is writable.")
 
     def _end_tournament(self):
         """Finalizes the tournament, updates status in DB, and prints final standings."""
+        self._flush_results()
+        self._rate_periods() # Tournaments that play their whole schedule at once rate it here
         self.is_tournament_running = False
         self.db_manager.update_tournament_status(self.tournament_id, "completed", datetime.now().isoformat())
 
@@ -277,8 +565,8 @@ class SwissTournament:
             self.db_manager.save_tournament_engine_stats(
                 tournament_id=self.tournament_id,
                 engine_id=data["id"],
-                initial_elo=data["initial_elo"],
-                final_elo=data["current_elo"], # This is the Elo after all games
+                initial_elo=round(data["initial_elo"]),
+                final_elo=round(data["current_elo"]), # This is the Elo (or Glicko-2 rating) after all games
                 wins=data["wins"],
                 losses=data["losses"],
                 draws=data["draws"],
@@ -286,6 +574,10 @@ class SwissTournament:
             )
         print("Tournament results and engine performance statistics saved to database.")
         
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
         # Clean up engines if they manage processes
         for engine in self.engines:
             if hasattr(engine, 'quit') and callable(engine.quit):
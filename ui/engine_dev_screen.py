@@ -3,14 +3,14 @@ import pygame
 from ui.base_screen import BaseScreen
 from database.db_manager import DBManager
 from engine.stockfish_engine import StockfishEngine
-from engine.simple_ai_engine import SimpleAIEngine
-from engine.RandomMover import RandomMover
-from engine.CapturePreferringEngine import CapturePreferringEngine # Import CapturePreferringEngine
+from engine.engine_factory import create_engine
 from tournament.swiss_tournament import SwissTournament
+from game.chess_clock import TimeControl
 from config import (BACKGROUND_COLOR, BUTTON_COLOR, BUTTON_HOVER_COLOR, TEXT_COLOR, TEXT_ON_LIGHT_BG_COLOR,
                     FONT_NAME, FONT_SIZE_XLARGE, FONT_SIZE_LARGE, FONT_SIZE_MEDIUM, FONT_SIZE_SMALL,
                     PADDING_SMALL, PADDING_MEDIUM, PADDING_LARGE, BUTTON_HEIGHT_STD, INPUT_HEIGHT_STD,
-                    BORDER_RADIUS_STD, MESSAGE_BOX_BG_COLOR, MESSAGE_BOX_BORDER_COLOR)
+                    BORDER_RADIUS_STD, MESSAGE_BOX_BG_COLOR, MESSAGE_BOX_BORDER_COLOR, TOURNAMENT_CONCURRENCY,
+                    TOURNAMENT_TIME_CONTROL, TOURNAMENT_RATING_SYSTEM, TOURNAMENT_RESULT_BATCH_SIZE)
 import os
 import importlib
 import inspect
@@ -362,33 +362,11 @@ class EngineDevScreen(BaseScreen):
         # Create actual engine instances from DB data
         active_engines_for_tournament = []
         for eng_data in self.engines_in_db:
-            engine_instance = None
-            engine_type = eng_data.get('type', 'external') # Default to external if not specified
-            engine_class_name = eng_data.get('class') # For internal engines
-
-            if engine_type == 'internal':
-                if engine_class_name == 'SimpleAIEngine':
-                    engine_instance = SimpleAIEngine(name=eng_data['name'], version=eng_data['version'])
-                elif engine_class_name == 'RandomMover':
-                    engine_instance = RandomMover(name=eng_data['name'], version=eng_data['version'])
-                elif engine_class_name == 'CapturePreferringEngine':
-                    engine_instance = CapturePreferringEngine(name=eng_data['name'], version=eng_data['version'])
-                else:
-                    print(f"Unknown internal engine class: {engine_class_name} for {eng_data['name']}. Skipping.")
-            elif eng_data.get('path') and os.path.exists(eng_data['path']): # External UCI
-                try:
-                    stockfish_instance = StockfishEngine(eng_data['path'], name=eng_data['name'], version=eng_data['version'])
-                    if stockfish_instance.engine: # Check if connection was successful
-                        engine_instance = stockfish_instance
-                    else:
-                        print(f"Failed to connect to external engine {eng_data['name']} at {eng_data['path']}. Skipping.")
-                except Exception as e:
-                    print(f"Error initializing Stockfish engine {eng_data['name']}: {e}")
-            else:
-                print(f"Engine {eng_data['name']} has no valid path for external type or unrecognized internal type. Skipping.")
-
+            engine_instance = create_engine(eng_data)
             if engine_instance:
                 active_engines_for_tournament.append(engine_instance)
+            else:
+                print(f"Skipping engine {eng_data['name']}.")
 
         if len(active_engines_for_tournament) < 2:
             self.tournament_message = "Not enough *working* engines (min 2) to start a tournament. Check paths or add internal engines."
@@ -397,7 +375,11 @@ class EngineDevScreen(BaseScreen):
                 if hasattr(eng, 'quit'): eng.quit()
             return
             
-        self.tournament = SwissTournament(tournament_name, active_engines_for_tournament, num_rounds, self.db_manager)
+        self.tournament = SwissTournament(tournament_name, active_engines_for_tournament, num_rounds, self.db_manager,
+                                          concurrency=TOURNAMENT_CONCURRENCY,
+                                          time_control=TimeControl.parse(TOURNAMENT_TIME_CONTROL) if TOURNAMENT_TIME_CONTROL else None,
+                                          rating_system=TOURNAMENT_RATING_SYSTEM,
+                                          result_batch_size=TOURNAMENT_RESULT_BATCH_SIZE)
         self.tournament.start_tournament()
         self.tournament_running = True
         self.tournament_message = "" # Clear previous messages
@@ -8,6 +8,7 @@ from engine.stockfish_engine import StockfishEngine
 from engine.simple_ai_engine import SimpleAIEngine
 from engine.RandomMover import RandomMover
 from engine.CapturePreferringEngine import CapturePreferringEngine # Import CapturePreferringEngine
+from engine.MaterialEvaluator import MaterialSearchEngine
 from config import (LIGHT_COLOR, DARK_COLOR, HIGHLIGHT_COLOR, LEGAL_MOVE_HIGHLIGHT_COLOR, SQUARE_SIZE,
                     TEXT_COLOR, TEXT_ON_LIGHT_BG_COLOR, BACKGROUND_COLOR, FONT_NAME,
                     FONT_SIZE_XLARGE, FONT_SIZE_LARGE, FONT_SIZE_MEDIUM, FONT_SIZE_SMALL,
@@ -105,6 +106,7 @@ class HumanVsEngineScreen(BaseScreen):
         self.message = ""
         self.waiting_for_engine = False
         if self.engine:
+            self.engine.stop_ponder() # Discard any search on the previous game's position
             self.engine.set_board(self.game_manager.get_board_object()) # Sync engine's board
         
         # If engine plays white, make its first move
@@ -216,6 +218,34 @@ class HumanVsEngineScreen(BaseScreen):
         ) # Different action if needed
         surface.blit(button_surface, game_back_button_rect)
 
+        # "Take Back" button below it
+        button_surface, _, _ = self.create_button(
+            "Take Back", self._take_back_button_rect(), BUTTON_COLOR, BUTTON_HOVER_COLOR, "TAKE_BACK",
+            text_color=TEXT_ON_LIGHT_BG_COLOR
+        )
+        surface.blit(button_surface, self._take_back_button_rect())
+
+    def _take_back_button_rect(self):
+        back_button_width = 180
+        return pygame.Rect(self.screen_width - back_button_width - PADDING_MEDIUM, PADDING_MEDIUM * 2 + BUTTON_HEIGHT_STD,
+                           back_button_width, BUTTON_HEIGHT_STD)
+
+    def _take_back(self):
+        """
+        Takes back the human's last move and the engine's reply, if any, so the
+        human is to move again. Moves are undone in place by the game manager,
+        without replaying the game.
+        """
+        first_human_ply = 0 if self.human_color == chess.WHITE else 1
+        if len(self.game_manager.moves_history) <= first_human_ply:
+            return False # The human has not moved yet
+        self.engine.stop_ponder() # The pondered position is no longer reachable
+        self.game_manager.undo_move()
+        while self.game_manager.get_current_turn_color() != self.human_color:
+            self.game_manager.undo_move()
+        self.engine.set_board(self.game_manager.get_board_object())
+        self.selected_square = None
+        return True
 
     def handle_event(self, event):
         """Handles events for the human vs engine game."""
@@ -270,6 +300,8 @@ class HumanVsEngineScreen(BaseScreen):
                                     self.engine = RandomMover(name=engine_name)
                                 elif engine_class_name == 'CapturePreferringEngine':
                                     self.engine = CapturePreferringEngine(name=engine_name)
+                                elif engine_class_name == 'MaterialSearchEngine':
+                                    self.engine = MaterialSearchEngine(name=engine_name, ponder=True)
                                 else:
                                     # Fallback for older "Simple AI" entries that might not have 'class'
                                     # or if class name is missing from DB for some reason.
@@ -279,13 +311,15 @@ class HumanVsEngineScreen(BaseScreen):
                                         self.engine = RandomMover(name=engine_name)
                                     elif "CapturePreferringEngine" in engine_name:
                                          self.engine = CapturePreferringEngine(name=engine_name)
+                                    elif "MaterialSearchEngine" in engine_name:
+                                        self.engine = MaterialSearchEngine(name=engine_name, ponder=True)
                                     else:
                                         self.setup_message = f"Unknown or misconfigured internal engine: {engine_name} (Class: {engine_class_name})"
                                         self.engine = None
                                         return True
                             elif engine_path and os.path.exists(engine_path): # External UCI engine
                                 try:
-                                    self.engine = StockfishEngine(engine_path, name=engine_name)
+                                    self.engine = StockfishEngine(engine_path, name=engine_name, ponder=True)
                                     if not self.engine.engine: # If stockfish process failed to start
                                         self.setup_message = f"Failed to start Stockfish: {engine_name}"
                                         self.engine = None
@@ -325,6 +359,9 @@ class HumanVsEngineScreen(BaseScreen):
             if self.game_over or self.waiting_for_engine: # No board interaction if game over or engine thinking
                 return False
 
+            if self._take_back_button_rect().collidepoint(event.pos):
+                return self._take_back()
+
             # Board interaction
             board_area_size = 8 * SQUARE_SIZE
             board_offset_x = (self.screen_width - board_area_size) // 2
@@ -359,7 +396,7 @@ class HumanVsEngineScreen(BaseScreen):
 
                 move = chess.Move(from_square, to_square, promotion=promotion_piece)
 
-                if move in board.legal_moves:
+                if self.game_manager.is_legal_move(move):
                     if self.game_manager.make_move(move.uci()):
                         self.selected_square = None
                         # Human made a move, now it's engine's turn
@@ -382,6 +419,9 @@ class HumanVsEngineScreen(BaseScreen):
                 if engine_move:
                     print(f"Engine made move: {engine_move.uci()}")
                     self.game_manager.make_move(engine_move.uci())
+                    # Think on the human's time; the next make_move() reuses this on a ponder hit
+                    self.engine.set_board(self.game_manager.get_board_object())
+                    self.engine.start_ponder()
                 else:
                     print("Engine failed to make a move.") # Should not happen with robust engine
                 self.waiting_for_engine = False
@@ -393,6 +433,7 @@ class HumanVsEngineScreen(BaseScreen):
         """Updates game state, checks for game over."""
         if self.setup_complete and not self.game_over and self.game_manager.is_game_over():
             self.game_over = True
+            self.engine.stop_ponder()
             self.end_time = datetime.now()
             winner, reason = self.game_manager.get_game_result()
             if winner:
@@ -424,6 +465,8 @@ class HumanVsEngineScreen(BaseScreen):
             'winner': winner,
             'reason': reason,
             'pgn': self.game_manager.get_pgn(),
+            'moves_blob': self.game_manager.get_encoded_moves(),
+            'start_fen': self.game_manager.start_fen,
             'white_player_type': white_player_type,
             'black_player_type': black_player_type,
             'white_player_name': white_player_name,
@@ -122,7 +122,7 @@ class HumanVsHumanScreen(BaseScreen):
 
                 move = chess.Move(from_square, to_square, promotion=promotion_piece)
 
-                if move in board.legal_moves:
+                if self.game_manager.is_legal_move(move):
                     # Make the move
                     self.game_manager.make_move(move.uci())
                     self.selected_square = None # Deselect
@@ -159,6 +159,8 @@ class HumanVsHumanScreen(BaseScreen):
             'winner': winner,
             'reason': reason,
             'pgn': self.game_manager.get_pgn(),
+            'moves_blob': self.game_manager.get_encoded_moves(),
+            'start_fen': self.game_manager.start_fen,
             'white_player_type': 'human',
             'black_player_type': 'human',
             'white_player_name': 'Player 1', # You might want to let users input names
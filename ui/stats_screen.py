@@ -10,13 +10,13 @@ from datetime import datetime # For parsing dates if needed, though already done
 class StatsScreen(BaseScreen):
     """
     Screen for viewing game statistics, history, and tournament results.
-    Supports multiple views: General Game History, Tournament List, Tournament Details.
+    Supports multiple views: General Game History, Tournament List, Tournament Details, Leaderboard.
     """
     def __init__(self, app_state_manager, db_manager):
         super().__init__(app_state_manager)
         self.db_manager = db_manager
 
-        self.current_view = "TOURNAMENT_LIST" # "GAME_HISTORY", "TOURNAMENT_LIST", "TOURNAMENT_DETAILS"
+        self.current_view = "TOURNAMENT_LIST" # "GAME_HISTORY", "TOURNAMENT_LIST", "TOURNAMENT_DETAILS", "LEADERBOARD"
 
         # Game History specific
         self.game_history = []
@@ -38,6 +38,10 @@ class StatsScreen(BaseScreen):
         self.current_td_games_page = 0
         self.total_td_games_pages = 0
 
+        # Leaderboard specific (precomputed rows, see DBManager.get_leaderboard())
+        self.leaderboard = []
+        self.leaderboard_size = 20
+
         self._load_data_for_current_view()
         self._setup_buttons() # Buttons might change based on view
 
@@ -62,6 +66,8 @@ class StatsScreen(BaseScreen):
             self.tournament_games = self.db_manager.get_tournament_games(self.selected_tournament_id) # Assuming games_per_page for this too
             self.total_td_games_pages = (len(self.tournament_games) + self.games_per_page - 1) // self.games_per_page
             self.current_td_games_page = 0
+        elif self.current_view == "LEADERBOARD":
+            self.leaderboard = self.db_manager.get_leaderboard(limit=self.leaderboard_size)
         # Reset pages for other views if necessary
         if self.current_view != "GAME_HISTORY": self.current_gh_page = 0
         if self.current_view != "TOURNAMENT_LIST": self.current_tl_page = 0
@@ -110,6 +116,10 @@ class StatsScreen(BaseScreen):
         )
         self.buttons.append({"text": "Next", "rect": next_page_rect, "action": "NEXT_PAGE"})
 
+        # Leaderboard button (Bottom Left)
+        leaderboard_rect = pygame.Rect(PADDING_MEDIUM, self.y_bottom_buttons, back_button_width, BUTTON_HEIGHT_STD)
+        self.buttons.append({"text": "Leaderboard", "rect": leaderboard_rect, "action": "VIEW_LEADERBOARD"})
+
         # Y position for page info text, above pagination buttons
         self.page_info_y = self.y_bottom_buttons - FONT_SIZE_MEDIUM - PADDING_SMALL
 
@@ -120,6 +130,7 @@ class StatsScreen(BaseScreen):
         if self.current_view == "GAME_HISTORY": title_text = "Game History"
         elif self.current_view == "TOURNAMENT_LIST": title_text = "Tournament List"
         elif self.current_view == "TOURNAMENT_DETAILS": title_text = f"Details: {self.selected_tournament_name}"
+        elif self.current_view == "LEADERBOARD": title_text = "Engine Leaderboard"
 
 
         # Title
@@ -131,7 +142,8 @@ class StatsScreen(BaseScreen):
         for btn_data in self.buttons:
             # Highlight active view toggle button
             is_active_toggle = (btn_data["action"] == "VIEW_GAME_HISTORY" and self.current_view == "GAME_HISTORY") or \
-                               (btn_data["action"] == "VIEW_TOURNAMENT_LIST" and (self.current_view == "TOURNAMENT_LIST" or self.current_view == "TOURNAMENT_DETAILS"))
+                               (btn_data["action"] == "VIEW_TOURNAMENT_LIST" and (self.current_view == "TOURNAMENT_LIST" or self.current_view == "TOURNAMENT_DETAILS")) or \
+                               (btn_data["action"] == "VIEW_LEADERBOARD" and self.current_view == "LEADERBOARD")
 
             current_button_color = BUTTON_HOVER_COLOR if is_active_toggle else BUTTON_COLOR
             current_hover_color = BUTTON_HOVER_COLOR # Keep hover consistent or make it brighter
@@ -154,6 +166,8 @@ class StatsScreen(BaseScreen):
             # Pagination for tournament games list can be added if needed, similar to game history
             # For now, assuming all games of a tournament and all engine stats fit on one screen or scrollable area (not implemented yet)
             # self._draw_pagination_info(surface, self.current_td_games_page, self.total_td_games_pages, for_tournament_games=True)
+        elif self.current_view == "LEADERBOARD":
+            self._display_leaderboard(surface)
 
 
     def _draw_pagination_info(self, surface, current_page, total_pages, for_tournament_games=False):
@@ -373,6 +387,50 @@ class StatsScreen(BaseScreen):
         # self._display_tournament_game_list(surface, y_offset + PADDING_LARGE)
 
 
+    def _display_leaderboard(self, surface):
+        """Displays the top engines by Elo from the leaderboard table."""
+        list_top_y = PADDING_LARGE * 2 + FONT_SIZE_XLARGE + PADDING_LARGE # Below title
+        list_bottom_y = self.y_bottom_buttons - PADDING_LARGE
+        y_offset = list_top_y
+        line_height = FONT_SIZE_SMALL + PADDING_SMALL
+
+        if not self.leaderboard:
+            no_items_surface = self.render_text("No engines rated yet!", color=TEXT_COLOR, size=FONT_SIZE_MEDIUM)
+            no_items_rect = no_items_surface.get_rect(center=(self.screen_width // 2, y_offset + (list_bottom_y - list_top_y) // 2))
+            surface.blit(no_items_surface, no_items_rect)
+            return
+
+        col_widths = {"rank": 70, "name": 300, "elo": 120, "glicko": 120, "games": 100, "wld": 160, "pts": 100}
+        columns = [("rank", "Rank"), ("name", "Engine"), ("elo", "Elo"), ("glicko", "Glicko-2"),
+                   ("games", "Games"), ("wld", "W-L-D"), ("pts", "Points")]
+        current_x = PADDING_LARGE
+        pygame.draw.line(surface, TEXT_COLOR, (current_x, y_offset + line_height - PADDING_SMALL // 2),
+                         (self.screen_width - PADDING_LARGE, y_offset + line_height - PADDING_SMALL // 2), 1)
+        for key, text in columns:
+            header_surface = self.render_text(text, color=(210,210,210), size=FONT_SIZE_SMALL, bold=True)
+            surface.blit(header_surface, (current_x, y_offset))
+            current_x += col_widths[key]
+        y_offset += line_height + PADDING_SMALL
+
+        for rank, row in enumerate(self.leaderboard):
+            if y_offset + line_height > list_bottom_y:
+                break
+            details = {
+                "rank": str(rank + 1),
+                "name": row['name'][:25],
+                "elo": str(row['elo']) if row['elo'] is not None else "-",
+                "glicko": f"{row['glicko_rating']:.0f}" if row['glicko_rating'] is not None else "-",
+                "games": str(row['games']),
+                "wld": f"{row['wins']}-{row['losses']}-{row['draws']}",
+                "pts": f"{row['points']:.1f}"
+            }
+            current_x = PADDING_LARGE
+            for key, _ in columns:
+                detail_surface = self.render_text(details[key], color=TEXT_COLOR, size=FONT_SIZE_SMALL)
+                surface.blit(detail_surface, (current_x, y_offset))
+                current_x += col_widths[key]
+            y_offset += line_height
+
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             mouse_pos = event.pos
@@ -395,6 +453,8 @@ class StatsScreen(BaseScreen):
                         self._switch_view("GAME_HISTORY")
                     elif action == "VIEW_TOURNAMENT_LIST":
                         self._switch_view("TOURNAMENT_LIST")
+                    elif action == "VIEW_LEADERBOARD":
+                        self._switch_view("LEADERBOARD")
                     elif action == "PREV_PAGE":
                         if self.current_view == "GAME_HISTORY" and self.current_gh_page > 0:
                             self.current_gh_page -= 1